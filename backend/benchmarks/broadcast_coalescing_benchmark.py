@@ -0,0 +1,87 @@
+"""Benchmark broadcast coalescing under bursty comment traffic.
+
+Replays Poisson comment arrivals spread over a handful of busy notes and
+reports, per coalescing window, how many POSTs reach the broadcast endpoint
+(each one is a Lambda invocation plus subscriber lookups), the
+events-per-POST ratio, and the latency the window adds to delivery.
+
+Usage (from backend/):
+    uv run python benchmarks/broadcast_coalescing_benchmark.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from app.application.services.broadcast_coalescer import (
+    BATCH_MESSAGE_TYPE,
+    BroadcastCoalescer,
+)
+
+
+DURATION_SECONDS = 2.0
+NOTES = 5
+
+
+async def run(rate_per_second: float, window_ms: float, seed: int = 11) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    posts = 0
+    latencies: List[float] = []
+
+    async def sink(message: Dict[str, Any]) -> bool:
+        nonlocal posts
+        posts += 1
+        now = time.perf_counter()
+        batch = message["messages"] if message.get("type") == BATCH_MESSAGE_TYPE else [message]
+        latencies.extend(now - m["submittedAt"] for m in batch)
+        return True
+
+    coalescer = BroadcastCoalescer(sink, window_seconds=window_ms / 1000) if window_ms else None
+    events = 0
+    deadline = time.perf_counter() + DURATION_SECONDS
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(rng.expovariate(rate_per_second))
+        message = {
+            "type": "comment.created",
+            "data": {"noteId": f"note-{rng.randrange(NOTES)}", "comment": {"content": "hi"}},
+            "submittedAt": time.perf_counter(),
+        }
+        events += 1
+        if coalescer is not None:
+            await coalescer.submit(message)
+        else:
+            await sink(message)
+    if coalescer is not None:
+        await coalescer.flush()
+
+    ordered = sorted(latencies)
+    return {
+        "events": events,
+        "posts": posts,
+        "ratio": events / posts if posts else 0.0,
+        "p50": statistics.median(ordered) * 1000,
+        "max": ordered[-1] * 1000,
+    }
+
+
+async def main() -> None:
+    print(f"{'rate/s':>8}{'window ms':>11}{'events':>9}{'POSTs':>8}{'ev/POST':>9}{'p50 ms':>9}{'max ms':>9}")
+    for rate in (20, 100, 500):
+        for window_ms in (0, 20, 50):
+            r = await run(rate, window_ms)
+            print(
+                f"{rate:>8}{window_ms:>11}{r['events']:>9}{r['posts']:>8}"
+                f"{r['ratio']:>9.2f}{r['p50']:>9.2f}{r['max']:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
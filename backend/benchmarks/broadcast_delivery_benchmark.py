@@ -0,0 +1,138 @@
+"""Benchmark end-to-end comment broadcast delivery for each delivery mode.
+
+Creates comments through `CommentApplicationService` (in-memory repositories)
+from concurrent writers, with the broadcast endpoint replaced by the local
+`StubBroadcastEndpoint` over `httpx.ASGITransport`. The stub simulates the
+Lambda's invocation latency, per-subscriber fan-out and a share of 503s.
+
+Reports, per mode: comments/sec on the write path, p50/p99 time from the
+start of the create call until the stub finished fanning the comment out,
+POSTs made, and comments not delivered by the end of the run (dropped
+by the queue, or still waiting in the outbox).
+
+Usage (from backend/):
+    uv run python benchmarks/broadcast_delivery_benchmark.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Settings are read at import time; point broadcasts at the stub's host
+os.environ["APP_SERVERLESS_WEBSOCKET_ENDPOINT"] = "http://broadcast.stub"
+
+import httpx
+
+from app.application.services.comment_service import CommentApplicationService
+from app.application.services.outbox_drainer import OutboxDrainer
+from app.application.services.websocket_service import WebSocketService, broadcast_timeout
+from app.infra.repositories.in_memory_comment_repository import InMemoryCommentRepository
+from app.infra.repositories.in_memory_notes_repository import InMemoryNotesRepository
+from app.infra.repositories.in_memory_outbox_repository import InMemoryOutboxRepository
+from app.infra.websocket.broadcast_endpoint_stub import StubBroadcastEndpoint
+
+
+MODES = ("inline", "queue", "coalesce", "outbox")
+WRITERS = 20
+# Rest of the request (auth, note lookup, DB write) per comment, so writers
+# behave like concurrent requests instead of a tight loop
+REQUEST_MS = 10.0
+DURATION_SECONDS = 3.0
+LATENCY_MS = 25.0
+ERROR_RATE = 0.02
+CONNECTIONS = 50
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return float("nan")
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(mode: str) -> Dict[str, Any]:
+    endpoint = StubBroadcastEndpoint(
+        latency_ms=LATENCY_MS, error_rate=ERROR_RATE, connections=CONNECTIONS, seed=7
+    )
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=endpoint), timeout=broadcast_timeout())
+    websocket_service = WebSocketService(client=client, mode=mode)
+    websocket_service.start()
+
+    notes = InMemoryNotesRepository()
+    public_notes, _ = await notes.list_public_notes(1, 10)
+    note_ids = [note["id"] for note in public_notes]
+
+    outbox = InMemoryOutboxRepository()
+    drainer = None
+    if mode == "outbox":
+        drainer = OutboxDrainer(outbox, websocket_service.deliver, poll_interval=0.05, retry_base_seconds=0.05)
+        drainer.start()
+    service = CommentApplicationService(
+        InMemoryCommentRepository(outbox=outbox, notes=notes), notes, websocket_service, drainer
+    )
+
+    started_at: Dict[str, float] = {}
+    deadline = time.perf_counter() + DURATION_SECONDS
+
+    async def writer(index: int) -> None:
+        i = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await asyncio.sleep(REQUEST_MS / 1000)
+            comment = await service.create_comment_on_public_note(
+                note_ids[(index + i) % len(note_ids)], f"comment {i}", f"user-{index}", "Bench", None
+            )
+            started_at[comment["id"]] = start
+            i += 1
+
+    begin = time.perf_counter()
+    await asyncio.gather(*(writer(index) for index in range(WRITERS)))
+    elapsed = time.perf_counter() - begin
+
+    # Let background delivery finish before measuring
+    if drainer is not None:
+        await drainer.stop()
+    await websocket_service.close()
+    await client.aclose()
+
+    latencies = sorted(
+        finished - started_at[item["data"]["comment"]["id"]]
+        for item, finished in endpoint.delivered
+        if item["data"]["comment"]["id"] in started_at
+    )
+    delivered_ids = {item["data"]["comment"]["id"] for item, _ in endpoint.delivered}
+    return {
+        "comments": len(started_at),
+        "rate": len(started_at) / elapsed,
+        "p50": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p99": percentile(latencies, 0.99) * 1000,
+        "posts": endpoint.requests,
+        "undelivered": len(set(started_at) - delivered_ids),
+    }
+
+
+async def main() -> None:
+    logging.disable(logging.ERROR)  # per-broadcast info logs and 503 errors
+    print(
+        f"{WRITERS} writers for {DURATION_SECONDS:.0f}s; stub: {LATENCY_MS:.0f} ms latency, "
+        f"{ERROR_RATE:.0%} 503s, {CONNECTIONS} subscribers per note"
+    )
+    print(f"{'mode':>10}{'comments':>10}{'per sec':>10}{'p50 ms':>10}{'p99 ms':>10}{'POSTs':>8}{'undelivered':>13}")
+    for mode in MODES:
+        r = await run(mode)
+        print(
+            f"{mode:>10}{r['comments']:>10}{r['rate']:>10.0f}{r['p50']:>10.1f}"
+            f"{r['p99']:>10.1f}{r['posts']:>8}{r['undelivered']:>13}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""Benchmark comment listing with the note check before vs. alongside the comment query.
+
+Runs `CommentApplicationService.list_comments_for_*` from concurrent clients
+over the in-memory repositories, wrapped so every repository call behaves
+like a DynamoDB round trip: a blocking call of `RTT_MS` (plus jitter) run in
+a worker thread, as the DynamoDB repositories do with `asyncio.to_thread`.
+The note visibility cache is left out, so every request reads the note.
+The thread pool is sized so that it is not the bottleneck; with the
+default pool (min(32, CPUs + 4) workers) the extra concurrent read per
+request queues for a thread instead of overlapping.
+
+Reports, per mode and case: requests/sec, p50/p99 latency, and comment
+queries whose result was thrown away because the check failed.
+
+Usage (from backend/):
+    uv run python benchmarks/comment_list_benchmark.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from app.application.services.comment_service import CommentApplicationService
+from app.application.services.websocket_service import WebSocketService
+from app.domain.entities.note_access import NoteNotAccessibleError
+from app.infra.repositories.in_memory_comment_repository import InMemoryCommentRepository
+from app.infra.repositories.in_memory_notes_repository import InMemoryNotesRepository
+
+
+CLIENTS = 20
+REQUESTS_PER_CLIENT = 50
+RTT_MS = 8.0
+JITTER_MS = 2.0
+
+
+class RoundTrip:
+    """Delegates to a repository, paying a simulated DynamoDB round trip per call."""
+
+    def __init__(self, inner: Any, rng: random.Random) -> None:
+        self._inner = inner
+        self._rng = rng
+        self.calls: Dict[str, int] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self._inner, name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            delay = max(0.0, RTT_MS + self._rng.uniform(-JITTER_MS, JITTER_MS)) / 1000
+            await asyncio.to_thread(time.sleep, delay)
+            return await method(*args, **kwargs)
+
+        return call
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(speculative: bool, authorized: bool) -> Dict[str, Any]:
+    rng = random.Random(7)
+    notes = InMemoryNotesRepository()
+    public_notes, _ = await notes.list_public_notes(1, 10)
+    note_ids = [note["id"] for note in public_notes]
+    inner_comments = InMemoryCommentRepository(notes=notes)
+    comments = RoundTrip(inner_comments, rng)
+    service = CommentApplicationService(
+        comments, RoundTrip(notes, rng), WebSocketService(mode="inline"), speculative_list=speculative
+    )
+
+    latencies: List[float] = []
+    rejected = 0
+
+    async def client(index: int) -> None:
+        nonlocal rejected
+        for i in range(REQUESTS_PER_CLIENT):
+            note_id = note_ids[(index + i) % len(note_ids)]
+            start = time.perf_counter()
+            try:
+                if authorized:
+                    await service.list_comments_for_public_note(note_id, 1, 20)
+                else:
+                    # Not the owner: the check fails
+                    await service.list_comments_for_private_note(note_id, "someone-else", 1, 20)
+            except NoteNotAccessibleError:
+                rejected += 1
+            latencies.append(time.perf_counter() - start)
+
+    begin = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(CLIENTS)))
+    elapsed = time.perf_counter() - begin
+
+    latencies.sort()
+    return {
+        "rate": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+        "wasted": comments.calls.get("list_comments_by_note", 0) if rejected else 0,
+    }
+
+
+async def main() -> None:
+    asyncio.get_running_loop().set_default_executor(
+        concurrent.futures.ThreadPoolExecutor(max_workers=CLIENTS * 2)
+    )
+    print(
+        f"{CLIENTS} clients x {REQUESTS_PER_CLIENT} requests; "
+        f"{RTT_MS:.0f} ms (+/-{JITTER_MS:.0f}) per repository call"
+    )
+    print(f"{'mode':>12}{'case':>14}{'per sec':>10}{'p50 ms':>10}{'p99 ms':>10}{'wasted queries':>16}")
+    for authorized in (True, False):
+        for speculative in (False, True):
+            r = await run(speculative, authorized)
+            mode = "speculative" if speculative else "serial"
+            case = "authorized" if authorized else "unauthorized"
+            print(f"{mode:>12}{case:>14}{r['rate']:>10.0f}{r['p50']:>10.1f}{r['p99']:>10.1f}{r['wasted']:>16}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""Benchmark response compression for typical public feed pages.
+
+Reports bytes on the wire and CPU time per request for each encoding, both
+cold (compressor runs every request) and warm (memoised compressed body).
+
+Usage (from backend/):
+    uv run --extra compression python benchmarks/compression_benchmark.py
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from app.shared.compression import CompressionMiddleware, Compressor
+
+
+WORDS = (
+    "note idea meeting draft plan todo remember weekend project release review "
+    "design api notebook comment share public private write read travel recipe "
+    "coffee morning evening summary detail follow up question answer list"
+).split()
+
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def build_feed_page(limit: int, content_words: int, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    notes = []
+    for i in range(limit):
+        ts = (base + timedelta(minutes=i)).isoformat().replace("+00:00", "Z")
+        content = "\n\n".join(_paragraph(rng, content_words // 4) for _ in range(4))
+        notes.append(
+            {
+                "id": f"550e8400-e29b-41d4-a716-{i:012d}",
+                "title": _paragraph(rng, 6)[:120],
+                "content": content,
+                "author": {
+                    "id": f"user_{i % 17:06d}",
+                    "displayName": f"User {i % 17}",
+                    "avatarUrl": f"https://example.com/avatars/{i % 17}.png",
+                },
+                "createdAt": ts,
+                "updatedAt": ts,
+                "publishedAt": ts,
+            }
+        )
+    pagination = {"page": 1, "limit": limit, "total": limit * 10, "hasNext": True, "hasPrev": False}
+    return json.dumps({"status": "success", "data": {"notes": notes, "pagination": pagination}}).encode()
+
+
+def cpu_per_call(fn, repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - start) / repeat
+
+
+def main() -> None:
+    compressor = Compressor()
+    middleware = CompressionMiddleware(app=None)  # type: ignore[arg-type]
+    print(f"available encodings: {', '.join(compressor.encodings)}")
+    print(f"{'page':<22}{'encoding':<10}{'bytes':>10}{'ratio':>8}{'cold ms':>10}{'warm ms':>10}")
+    for limit, words in ((20, 120), (20, 600), (100, 600)):
+        body = build_feed_page(limit, words)
+        label = f"limit={limit} ~{words}w"
+        print(f"{label:<22}{'identity':<10}{len(body):>10}{1.0:>8.2f}{'-':>10}{'-':>10}")
+        repeat = 20 if len(body) > 200_000 else 100
+        for encoding in compressor.encodings:
+            compressed = compressor.compress(encoding, body)
+            cold = cpu_per_call(lambda e=encoding, b=body: compressor.compress(e, b), repeat)
+            middleware.compress_cached(encoding, body)
+            warm = cpu_per_call(lambda e=encoding, b=body: middleware.compress_cached(e, b), repeat)
+            ratio = len(body) / len(compressed)
+            print(f"{'':<22}{encoding:<10}{len(compressed):>10}{ratio:>8.2f}{cold * 1000:>10.3f}{warm * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Benchmark the self-hosted WebSocket hub with 10k simulated subscribers.
+
+Subscribers are fake sockets (an async ``send_text`` that counts frames), so
+the numbers are the hub's own cost: routing, encoding and queueing. Reports
+
+- publish time per message (the part the broadcast worker waits for) and the
+  time until every writer has handed its frame to the socket, for one hot note
+  watched by everyone and for subscribers spread over many notes;
+- encode-once fan-out against encoding the message per subscriber;
+- slow-consumer eviction: a share of subscribers never finish a send, and
+  the healthy ones must still get every message.
+
+Usage (from backend/):
+    uv run python benchmarks/websocket_hub_benchmark.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from app.infra.websocket.fanout_hub import WebSocketHub
+
+
+SUBSCRIBERS = 10_000
+MESSAGES = 20
+
+
+class FakeSocket:
+    # Frames handed to any healthy socket (cheap to poll, unlike summing 10k sockets)
+    total = 0
+
+    def __init__(self, stalled: bool = False) -> None:
+        self.frames = 0
+        self.stalled = stalled
+        self.closed_with: int | None = None
+
+    async def send_text(self, frame: str) -> None:
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.frames += 1
+        FakeSocket.total += 1
+
+    async def close(self, code: int, reason: str) -> None:
+        self.closed_with = code
+
+
+def comment_message(note_id: str, i: int) -> Dict[str, Any]:
+    return {
+        "topic": note_id,
+        "type": "comment.created",
+        "data": {
+            "noteId": note_id,
+            "comment": {"id": f"c{i}", "content": "x" * 200, "username": "someone"},
+            "isPrivateNote": False,
+        },
+        "timestamp": "2026-01-01T00:00:00Z",
+    }
+
+
+async def wait_delivered(expected: int, timeout: float = 30.0) -> float:
+    """Wait until FakeSocket.total reaches `expected`; returns the seconds waited."""
+    start = time.perf_counter()
+    while FakeSocket.total < expected:
+        if time.perf_counter() - start > timeout:
+            break
+        await asyncio.sleep(0.001)
+    return time.perf_counter() - start
+
+
+async def fanout(notes: int) -> Dict[str, Any]:
+    hub = WebSocketHub(queue_size=MESSAGES * 2)
+    sockets = [FakeSocket() for _ in range(SUBSCRIBERS)]
+    for i, sock in enumerate(sockets):
+        conn = hub.register(sock.send_text, sock.close)
+        hub.subscribe(conn, [f"note-{i % notes}"])
+
+    publish_times: List[float] = []
+    drain_times: List[float] = []
+    delivered = FakeSocket.total
+    for i in range(MESSAGES):
+        note = f"note-{i % notes}"
+        expected = delivered + SUBSCRIBERS // notes
+        start = time.perf_counter()
+        await hub.publish(comment_message(note, i))
+        publish_times.append(time.perf_counter() - start)
+        drain_times.append(await wait_delivered(expected) + publish_times[-1])
+        delivered = expected
+    await hub.close()
+    return {
+        "perMessage": SUBSCRIBERS // notes,
+        "publish_ms": statistics.median(publish_times) * 1000,
+        "delivered_ms": statistics.median(drain_times) * 1000,
+        "frames": sum(s.frames for s in sockets),
+    }
+
+
+def encode_cost() -> Dict[str, float]:
+    message = {k: v for k, v in comment_message("note-0", 0).items() if k != "topic"}
+    start = time.perf_counter()
+    frame = json.dumps(message)
+    frames = [frame] * SUBSCRIBERS
+    once = time.perf_counter() - start
+    start = time.perf_counter()
+    frames = [json.dumps(message) for _ in range(SUBSCRIBERS)]
+    each = time.perf_counter() - start
+    assert len(frames) == SUBSCRIBERS
+    return {"once_ms": once * 1000, "each_ms": each * 1000}
+
+
+async def slow_consumers(share: float) -> Dict[str, Any]:
+    hub = WebSocketHub(queue_size=8, send_timeout=0.2)
+    sockets = [FakeSocket(stalled=i < SUBSCRIBERS * share) for i in range(SUBSCRIBERS)]
+    for sock in sockets:
+        conn = hub.register(sock.send_text, sock.close)
+        hub.subscribe(conn, ["note-0"])
+    healthy = [s for s in sockets if not s.stalled]
+    expected = FakeSocket.total + len(healthy) * MESSAGES
+
+    start = time.perf_counter()
+    for i in range(MESSAGES):
+        await hub.publish(comment_message("note-0", i))
+        await asyncio.sleep(0.01)
+    await wait_delivered(expected)
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.3)  # let send timeouts fire
+    evicted = hub.evicted
+    await hub.close()
+    return {
+        "stalled": sum(1 for s in sockets if s.stalled),
+        "evicted": evicted,
+        "healthyComplete": all(s.frames == MESSAGES for s in healthy),
+        "elapsed_ms": elapsed * 1000,
+    }
+
+
+async def main() -> None:
+    logging.getLogger("app.websocket.hub").setLevel(logging.ERROR)  # one warning per eviction
+    print(f"{SUBSCRIBERS} subscribers, {MESSAGES} messages")
+    print(f"{'notes':>8}{'subs/msg':>10}{'publish ms':>12}{'delivered ms':>14}{'frames':>9}")
+    for notes in (1, 100, 1000):
+        r = await fanout(notes)
+        print(f"{notes:>8}{r['perMessage']:>10}{r['publish_ms']:>12.2f}{r['delivered_ms']:>14.2f}{r['frames']:>9}")
+
+    e = encode_cost()
+    print(f"\nencode once: {e['once_ms']:.2f} ms   encode per subscriber: {e['each_ms']:.2f} ms")
+
+    print(f"\n{'stalled':>8}{'evicted':>9}{'healthy ok':>12}{'elapsed ms':>12}")
+    for share in (0.0, 0.01, 0.1):
+        r = await slow_consumers(share)
+        print(f"{r['stalled']:>8}{r['evicted']:>9}{str(r['healthyComplete']):>12}{r['elapsed_ms']:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
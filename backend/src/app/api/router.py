@@ -4,6 +4,7 @@ from .routes.me_notes import router as me_notes_router
 from .routes.me import router as me_router
 from .routes.auth import router as auth_router
 from .routes.comments import router as comments_router
+from .routes.websocket import router as websocket_router
 
 
 api_router = APIRouter()
@@ -14,3 +15,4 @@ api_router.include_router(comments_router)
 api_router.include_router(me_notes_router)
 api_router.include_router(me_router)
 api_router.include_router(auth_router)
+api_router.include_router(websocket_router)
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from typing import Optional
 
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from app.application.services.ownership_transfer_service import OwnershipTransferService
 from app.application.services.user_service import UserApplicationService
-from app.shared.auth import get_authenticated_user, require_regular_user, UserContext
-from app.shared.dependencies import get_user_application_service
+from app.domain.entities.note import Author
+from app.domain.entities.ownership_transfer import TransferInProgressError
+from app.shared.auth import authenticate_token, get_authenticated_user, require_regular_user, UserContext
+from app.shared.dependencies import get_ownership_transfer_service, get_user_application_service
 from app.shared.logger import get_logger
 
 from app.generated.src.generated_fastapi_server.models.auth_result_response import AuthResultResponse
@@ -19,27 +25,18 @@ _log = get_logger("app.api.auth")
 async def login_regular_user(
     user: UserContext = Depends(require_regular_user),
     users: UserApplicationService = Depends(get_user_application_service),
+    transfers: OwnershipTransferService = Depends(get_ownership_transfer_service),
 ):
-    # Ensure user exists or create
-    profile = await users.get_profile(user.uid)
-    created = False
-    if not profile:
-        # Create initial regular profile
-        profile = await users.update_profile(user.uid, {
-            "displayName": user.display_name or "User",
-            "email": user.email,
-            "isAnonymous": False,
-        })
-        created = True
-    else:
-        # Harden login: if profile exists but isAnonymous or email missing/outdated, patch it
-        patch: dict = {}
-        if profile.get("isAnonymous"):
-            patch["isAnonymous"] = False
-        if user.email and profile.get("email") != user.email:
-            patch["email"] = user.email
-        if patch:
-            profile = await users.update_profile(user.uid, patch)
+    # Ensure user exists, and harden it (regular, verified email) in the same write
+    patch: dict = {"isAnonymous": False}
+    if user.email:
+        patch["email"] = user.email
+    profile, outcome = await users.ensure_profile(
+        user.uid, patch, defaults={"displayName": user.display_name or "User"}
+    )
+    created = outcome == "created"
+    # Pick up a transfer from an earlier promotion that did not finish
+    await transfers.resume(user.uid)
     response_data = {
         "status": "success",
         "data": {"user": profile, "isAnonymous": False, "created": created, "wasPromoted": False}
@@ -54,16 +51,18 @@ async def authenticate_anonymous(
 ):
     # Treat any authenticated context as valid; if regular, still return isAnonymous accordingly
     _log.info("anonymous_login: start", extra={"uid": user.uid, "isAnonymous": user.is_anonymous})
-    profile = await users.get_profile(user.uid)
-    created = False
-    if not profile:
-        _log.info("anonymous_login: creating_profile", extra={"uid": user.uid})
-        profile = await users.update_profile(user.uid, {
+    # Create the profile only if it does not exist yet
+    profile, outcome = await users.ensure_profile(
+        user.uid,
+        {},
+        defaults={
             "displayName": user.display_name or ("Guest" if user.is_anonymous else "User"),
             "email": user.email,
             "isAnonymous": user.is_anonymous,
-        })
-        created = True
+        },
+        when="missing",
+    )
+    created = outcome == "created"
     _log.info("anonymous_login: done", extra={"uid": user.uid, "wasCreated": created})
     response_data = {
         "status": "success",
@@ -77,39 +76,49 @@ async def promote_anonymous_user(
     payload: AnonymousPromoteRequest,
     user: UserContext = Depends(require_regular_user),
     users: UserApplicationService = Depends(get_user_application_service),
+    transfers: OwnershipTransferService = Depends(get_ownership_transfer_service),
+    x_anonymous_id_token: Optional[str] = Header(default=None, alias="X-Anonymous-Id-Token"),
 ):
-    # Validate the promotion request - the anonymous_firebase_uuid should match our records
-    # In a real implementation, you might want to verify the anonymous user exists
-    # and has the necessary permissions for promotion
     _log.info("promote_anonymous: start", extra={
         "uid": user.uid, 
         "anonymous_firebase_uuid": payload.anonymous_firebase_uuid
     })
     
-    # For now, we'll proceed with the promotion logic
-    # In production, you might want to validate that the anonymous_firebase_uuid
-    # corresponds to a user that should be promoted
+    # Content only moves when the caller proves they own the anonymous account:
+    # the request body alone would let anyone claim someone else's notebook.
+    # (With linkWithCredential the uid is unchanged and there is nothing to move.)
+    transfer_from: Optional[str] = None
+    if payload.anonymous_firebase_uuid != user.uid and x_anonymous_id_token:
+        anonymous = await run_in_threadpool(authenticate_token, x_anonymous_id_token)
+        if not anonymous.is_anonymous or anonymous.uid != payload.anonymous_firebase_uuid:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Anonymous account proof does not match")
+        transfer_from = anonymous.uid
     
-    profile = await users.get_profile(user.uid)
-    was_promoted = False
-    if not profile:
-        profile = await users.update_profile(user.uid, {
-            "displayName": user.display_name or "User",
-            "email": user.email,
-            "isAnonymous": False,
-        })
-        was_promoted = True
-    elif profile.get("isAnonymous"):
+    # Create the profile, or flip it to regular if it is still anonymous; profiles
+    # that are already regular are left untouched
+    patch = {"isAnonymous": False}
+    if user.email:
         # On promotion, also persist verified email from auth context
-        patch = {"isAnonymous": False}
-        if user.email and profile.get("email") != user.email:
-            patch["email"] = user.email
-        profile = await users.update_profile(user.uid, patch)
-        was_promoted = True
+        patch["email"] = user.email
+    profile, outcome = await users.ensure_profile(
+        user.uid, patch, defaults={"displayName": user.display_name or "User"}, when="anonymous"
+    )
+    was_promoted = outcome != "unchanged"
+    
+    if transfer_from is not None:
+        # Runs in the background; progress is reported by GET /me/ownership-transfer
+        try:
+            await transfers.start_transfer(
+                transfer_from,
+                Author(id=user.uid, displayName=profile.get("displayName") or "User", avatarUrl=profile.get("avatarUrl")),
+            )
+        except TransferInProgressError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     
     _log.info("promote_anonymous: done", extra={
         "uid": user.uid, 
         "wasPromoted": was_promoted,
+        "transferStarted": transfer_from is not None,
         "anonymous_firebase_uuid": payload.anonymous_firebase_uuid
     })
     response_data = {
@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from typing import Dict, Any
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, Any, Optional
 
 from app.application.services.comment_service import CommentApplicationService
-from app.shared.dependencies import get_comment_application_service
+from app.domain.entities.comment import CommentCursorError
+from app.infra.websocket.comment_stream import CommentStream
+from app.infra.websocket.fanout_hub import WebSocketHub
+from app.shared.config import get_settings
+from app.shared.dependencies import get_comment_application_service, get_websocket_hub
 from app.shared.validators import validate_uuid
 from app.shared.auth import get_authenticated_user, UserContext
 from app.generated.src.generated_fastapi_server.models.comments_list_response import CommentsListResponse
@@ -18,11 +25,19 @@ async def get_public_note_comments(
     note_id: str = Depends(validate_uuid),
     page: int = Query(1, ge=1, description="Page number for pagination"),
     limit: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    since: Optional[str] = Query(
+        None, description="Only comments newer than this comment id or ISO-8601 timestamp (e.g. a previous highWaterMark)"
+    ),
     service: CommentApplicationService = Depends(get_comment_application_service),
 ):
     """Get comments for a public note."""
     try:
-        comments, pagination = await service.list_comments_for_public_note(note_id, page, limit)
+        if since is not None:
+            comments, pagination = await service.list_comments_since_for_public_note(note_id, since, limit)
+        else:
+            comments, pagination = await service.list_comments_for_public_note(note_id, page, limit)
+    except CommentCursorError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     
@@ -47,9 +62,64 @@ async def get_public_note_comments(
             "postId": note_id
         }
     }
+    if since is not None:
+        # Delta responses carry the next cursor, which the generated model doesn't know;
+        # count is the number of comments returned
+        response_data["data"].update(count=len(transformed_comments), **pagination)
+        return JSONResponse(response_data)
     return CommentsListResponse.from_dict(response_data)
 
 
+@router.get("/{note_id}/comments/stream")
+async def stream_public_note_comments(
+    note_id: str = Depends(validate_uuid),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    service: CommentApplicationService = Depends(get_comment_application_service),
+    hub: WebSocketHub = Depends(get_websocket_hub),
+):
+    """Stream a public note's new comments as Server-Sent Events (WebSocket fallback).
+
+    Events are `comment.created` messages, as on /ws, with the comment's
+    createdAt as the event id; a `Last-Event-ID` resume replays what was missed.
+    """
+    if not await service.is_public_note(note_id):
+        raise HTTPException(status_code=404, detail=f"Public note {note_id} not found")
+
+    settings = get_settings()
+    # When broadcasts leave through API Gateway, comments posted on other
+    # instances only reach this stream through storage
+    poll = None
+    if service.websocket_service.local_sink is None:
+
+        def poll(cursor: str):
+            return service.comments_missed_by_stream(note_id, cursor, settings.comment_stream_max_replay)
+
+    stream = CommentStream(
+        hub,
+        note_id,
+        lambda: service.is_public_note(note_id),
+        heartbeat_seconds=settings.comment_stream_heartbeat_seconds,
+        max_buffer_bytes=settings.comment_stream_max_buffer_bytes,
+        poll=poll,
+        poll_seconds=settings.comment_stream_poll_seconds,
+        max_seconds=settings.comment_stream_max_seconds,
+    )
+    opened_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    try:
+        replay, complete = await service.comments_missed_by_stream(
+            note_id, last_event_id, settings.comment_stream_max_replay
+        )
+    except Exception:
+        stream.unsubscribe()
+        raise
+    return StreamingResponse(
+        stream.events(replay, complete, cursor=opened_at),
+        media_type="text/event-stream",
+        # No caching, and no buffering in front of the app (nginx)
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/{note_id}/comments", status_code=status.HTTP_201_CREATED, response_model=CommentResponse)
 async def create_public_note_comment(
     note_id: str = Depends(validate_uuid),
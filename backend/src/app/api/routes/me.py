@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 
+from app.application.services.ownership_transfer_service import OwnershipTransferService
 from app.application.services.user_service import UserApplicationService
 from app.shared.auth import require_regular_user, UserContext
-from app.shared.dependencies import get_user_application_service
+from app.shared.dependencies import get_ownership_transfer_service, get_user_application_service
 
 from app.generated.src.generated_fastapi_server.models.user_profile_response import UserProfileResponse
 from app.generated.src.generated_fastapi_server.models.update_user_profile_request import UpdateUserProfileRequest
@@ -21,8 +22,12 @@ async def get_user_profile(
     profile = await service.get_profile(user.uid)
     if not profile:
         # Create default regular profile if missing (first-time login)
-        # Rely on service's repository via update() semantics
-        profile = await service.update_profile(user.uid, {"displayName": user.display_name or "User", "isAnonymous": False})
+        profile, _ = await service.ensure_profile(
+            user.uid,
+            {},
+            defaults={"displayName": user.display_name or "User", "isAnonymous": False},
+            when="missing",
+        )
     response_data = {
         "status": "success",
         "data": profile
@@ -44,3 +49,18 @@ async def update_user_profile(
         "data": updated
     }
     return UserProfileResponse.from_dict(response_data)
+
+
+@router.get("/ownership-transfer")
+async def get_ownership_transfer(
+    user: UserContext = Depends(require_regular_user),
+    transfers: OwnershipTransferService = Depends(get_ownership_transfer_service),
+):
+    """Progress of moving a promoted anonymous account's notes into this account.
+
+    Polling also resumes a transfer whose run stopped (e.g. on another instance).
+    """
+    transfer = await transfers.resume(user.uid)
+    if transfer is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No ownership transfer found")
+    return {"status": "success", "data": transfer.to_dict()}
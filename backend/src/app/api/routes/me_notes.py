@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.application.services.notes_service import NotesApplicationService
 from app.application.services.comment_service import CommentApplicationService
+from app.domain.entities.comment import CommentCursorError
 from app.shared.auth import get_authenticated_user, UserContext
 from app.shared.dependencies import get_notes_application_service, get_comment_application_service
-from app.shared.validators import validate_uuid
+from app.shared.validators import private_note_fields, validate_uuid
 
 from app.generated.src.generated_fastapi_server.models.private_notes_list_response import PrivateNotesListResponse
 from app.generated.src.generated_fastapi_server.models.private_note_response import PrivateNoteResponse
@@ -27,10 +29,12 @@ router = APIRouter(prefix="/me/notes", tags=["Personal Notebook"])
 async def list_my_notes(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    view: Literal["full", "summary"] = Query("full", description="full notes, or summaries with excerpt and contentLength"),
+    fields: Optional[List[str]] = Depends(private_note_fields),
     user: UserContext = Depends(get_authenticated_user),
     service: NotesApplicationService = Depends(get_notes_application_service),
 ):
-    notes, pagination = await service.list_my_notes(user.uid, page, limit)
+    notes, pagination = await service.list_my_notes(user.uid, page, limit, view, fields)
     
     # Build response as raw data - let the response model handle all conversions
     response_data = {
@@ -40,6 +44,9 @@ async def list_my_notes(
             "pagination": pagination
         }
     }
+    if view == "summary" or fields:
+        # Summaries and sparse fieldsets don't match the full-note response model
+        return JSONResponse(response_data)
     
     # Return proper response
     return PrivateNotesListResponse.from_dict(response_data)
@@ -65,13 +72,33 @@ async def create_my_note(
     return PrivateNoteResponse.from_dict(response_data)
 
 
+# Must be registered before "/{note_id}" so "export" is not parsed as a note id
+@router.get("/export")
+async def export_my_notes(
+    format: Literal["ndjson", "zip"] = Query("ndjson", description="ndjson, or ndjson inside a zip archive"),
+    user: UserContext = Depends(get_authenticated_user),
+    service: NotesApplicationService = Depends(get_notes_application_service),
+):
+    """Stream the whole notebook as NDJSON without materializing it in memory."""
+    if format == "zip":
+        media_type, filename = "application/zip", "notes.zip"
+    else:
+        media_type, filename = "application/x-ndjson", "notes.ndjson"
+    return StreamingResponse(
+        service.export_my_notes(user.uid, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/{note_id}", response_model=PrivateNoteResponse)
 async def get_my_note(
     note_id: str = Depends(validate_uuid),
+    fields: Optional[List[str]] = Depends(private_note_fields),
     user: UserContext = Depends(get_authenticated_user),
     service: NotesApplicationService = Depends(get_notes_application_service),
 ):
-    note = await service.get_my_note(user.uid, note_id)
+    note = await service.get_my_note(user.uid, note_id, fields)
     if note is None:
         raise HTTPException(status_code=404, detail="Not found")
     
@@ -80,6 +107,9 @@ async def get_my_note(
         "status": "success",
         "data": note
     }
+    if fields:
+        # Sparse fieldsets don't match the full-note response model
+        return JSONResponse(response_data)
     return PrivateNoteResponse.from_dict(response_data)
 
 
@@ -164,12 +194,20 @@ async def get_private_note_comments(
     note_id: str = Depends(validate_uuid),
     page: int = Query(1, ge=1, description="Page number for pagination"),
     limit: int = Query(20, ge=1, le=100, description="Number of items per page"),
+    since: Optional[str] = Query(
+        None, description="Only comments newer than this comment id or ISO-8601 timestamp (e.g. a previous highWaterMark)"
+    ),
     user: UserContext = Depends(get_authenticated_user),
     service: CommentApplicationService = Depends(get_comment_application_service),
 ):
     """Get comments for my private note."""
     try:
-        comments, pagination = await service.list_comments_for_private_note(note_id, user.uid, page, limit)
+        if since is not None:
+            comments, pagination = await service.list_comments_since_for_private_note(note_id, user.uid, since, limit)
+        else:
+            comments, pagination = await service.list_comments_for_private_note(note_id, user.uid, page, limit)
+    except CommentCursorError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     
@@ -194,6 +232,11 @@ async def get_private_note_comments(
             "postId": note_id
         }
     }
+    if since is not None:
+        # Delta responses carry the next cursor, which the generated model doesn't know;
+        # count is the number of comments returned
+        response_data["data"].update(count=len(transformed_comments), **pagination)
+        return JSONResponse(response_data)
     return CommentsListResponse.from_dict(response_data)
 
 
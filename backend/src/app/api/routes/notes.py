@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
+from typing import List, Literal, Optional
 
 from app.application.services.notes_service import NotesApplicationService
 from app.shared.dependencies import get_notes_application_service
-from app.shared.validators import validate_uuid
+from app.shared.http_cache import FEED_SURROGATE_KEY, apply_public_cache_headers, note_surrogate_key
+from app.shared.validators import public_note_fields, validate_uuid
 from app.generated.src.generated_fastapi_server.models.public_notes_list_response import PublicNotesListResponse
 from app.generated.src.generated_fastapi_server.models.public_note_response import PublicNoteResponse
 
@@ -13,32 +15,49 @@ router = APIRouter(prefix="/notes", tags=["Public Notes"])
 
 @router.get("", response_model=PublicNotesListResponse)
 async def list_latest_public_notes(
+    response: Response,
     page: int = Query(1, ge=1, description="Page number for pagination"),
     limit: int = Query(20, ge=1, le=100, description="Number of items per page"),
     sort: Literal["latest"] = Query("latest", description="Sort order (latest only)"),
+    view: Literal["full", "summary"] = Query("full", description="full notes, or summaries with excerpt and contentLength"),
+    fields: Optional[List[str]] = Depends(public_note_fields),
     service: NotesApplicationService = Depends(get_notes_application_service),
 ):
-    notes, pagination = await service.list_public_notes(page, limit, sort)
-        
+    notes, pagination = await service.list_public_notes(page, limit, sort, view, fields)
+
     response_data = {
         "status": "success",
         "data": {"notes": notes, "pagination": pagination}
     }
+    if view == "summary" or fields:
+        # Summaries and sparse fieldsets don't match the full-note response model
+        response = JSONResponse(response_data)
+        apply_public_cache_headers(response, [FEED_SURROGATE_KEY])
+        return response
+    apply_public_cache_headers(response, [FEED_SURROGATE_KEY])
     return PublicNotesListResponse.from_dict(response_data)
 
 
 @router.get("/{note_id}", response_model=PublicNoteResponse)
 async def get_public_note(
+    response: Response,
     note_id: str = Depends(validate_uuid),
+    fields: Optional[List[str]] = Depends(public_note_fields),
     service: NotesApplicationService = Depends(get_notes_application_service),
 ):
-    note = await service.get_public_note(note_id)
+    note = await service.get_public_note(note_id, fields)
         
     if note is None:
         raise HTTPException(status_code=404, detail="Not found")
-        
+
     response_data = {
         "status": "success",
         "data": note
     }
+    if fields:
+        # Sparse fieldsets don't match the full-note response model
+        response = JSONResponse(response_data)
+        apply_public_cache_headers(response, [note_surrogate_key(note_id)])
+        return response
+    apply_public_cache_headers(response, [note_surrogate_key(note_id)])
     return PublicNoteResponse.from_dict(response_data)
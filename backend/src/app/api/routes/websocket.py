@@ -0,0 +1,36 @@
+import json
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+
+from app.infra.websocket.fanout_hub import WebSocketHub
+from app.shared.dependencies import get_websocket_hub
+
+
+router = APIRouter(tags=["WebSocket"])
+
+
+@router.websocket("/ws")
+async def websocket_endpoint(
+    websocket: WebSocket,
+    hub: WebSocketHub = Depends(get_websocket_hub),
+):
+    """Self-hosted real-time channel (same message protocol as the API Gateway WebSocket).
+
+    Clients send {"action": "subscribe" | "unsubscribe", "noteIds": [...]} and
+    receive the broadcasts of the notes they are subscribed to.
+    """
+    await websocket.accept()
+    connection = hub.register(websocket.send_text, websocket.close)
+    try:
+        while True:
+            raw = await websocket.receive_text()
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                hub.send(connection, {"type": "error", "data": {"message": "Invalid JSON"}})
+                continue
+            hub.send(connection, hub.handle_client_message(connection, message))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.unregister(connection)
@@ -0,0 +1,88 @@
+"""Micro-batching of broadcast messages.
+
+Every POST to the broadcast endpoint costs a Lambda invocation plus a
+subscriber lookup per note, so during busy threads it is much cheaper to send
+one POST per short window than one per comment. The coalescer buffers messages for at
+most ``window_seconds`` after the first one arrives (or until ``max_batch``
+messages are buffered) and then emits a single batch message::
+
+    {"type": "batch", "messages": [<message>, ...]}
+
+A flush holding a single message emits that message unchanged, so quiet
+periods look exactly like uncoalesced delivery. Messages keep their arrival
+order, so comments on the same note are delivered in creation order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.shared.logger import get_logger
+
+
+BATCH_MESSAGE_TYPE = "batch"
+
+Sink = Callable[[Dict[str, Any]], Awaitable[bool]]
+
+
+def batch_message(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if len(messages) == 1:
+        return messages[0]
+    return {"type": BATCH_MESSAGE_TYPE, "messages": messages}
+
+
+class BroadcastCoalescer:
+    def __init__(self, sink: Sink, window_seconds: float = 0.03, max_batch: int = 100) -> None:
+        self._sink = sink
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self._buffer: List[Dict[str, Any]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._log = get_logger("app.broadcast_coalescer")
+        # Metrics
+        self.events = 0
+        self.flushes = 0
+        self.largest_batch = 0
+
+    async def submit(self, message: Dict[str, Any]) -> bool:
+        """Buffer a message; it is sent no later than `window_seconds` from now."""
+        self.events += 1
+        self._buffer.append(message)
+        if len(self._buffer) >= self.max_batch:
+            return await self.flush()
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_window())
+        return True
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window_seconds)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> bool:
+        """Send whatever is buffered as one message."""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+            self._timer = None
+        messages, self._buffer = self._buffer, []
+        if not messages:
+            return True
+        self.flushes += 1
+        self.largest_batch = max(self.largest_batch, len(messages))
+        try:
+            return await self._sink(batch_message(messages))
+        except Exception as e:
+            self._log.error("coalesced flush failed", extra={"messages": len(messages), "error": str(e)})
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "windowMs": self.window_seconds * 1000,
+            "maxBatch": self.max_batch,
+            "buffered": len(self._buffer),
+            "events": self.events,
+            "flushes": self.flushes,
+            "largestBatch": self.largest_batch,
+            "eventsPerFlush": (self.events - len(self._buffer)) / self.flushes if self.flushes else 0.0,
+        }
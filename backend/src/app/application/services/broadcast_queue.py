@@ -0,0 +1,141 @@
+"""Bounded in-process queue that decouples WebSocket fan-out from request latency.
+
+Producers (comment creation) only enqueue; a few worker tasks drain the queue
+and call the actual sender. When the queue is full the configured drop policy
+applies:
+
+- ``drop_newest``: reject the incoming message
+- ``drop_oldest``: evict the oldest queued message to make room
+- ``block``: wait up to ``put_timeout`` seconds for room (backpressure), then
+  reject the incoming message
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional
+
+from app.shared.logger import get_logger
+
+
+DropPolicy = Literal["drop_newest", "drop_oldest", "block"]
+Sender = Callable[[Dict[str, Any]], Awaitable[bool]]
+
+
+class BroadcastQueue:
+    def __init__(
+        self,
+        sender: Sender,
+        max_size: int = 1000,
+        workers: int = 4,
+        drop_policy: DropPolicy = "drop_oldest",
+        put_timeout: float = 0.05,
+    ) -> None:
+        self._sender = sender
+        self.max_size = max_size
+        self.worker_count = workers
+        self.drop_policy = drop_policy
+        self.put_timeout = put_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._closing = False
+        self._log = get_logger("app.broadcast_queue")
+        # Metrics
+        self.enqueued = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dropped: Dict[str, int] = {"full": 0, "evicted": 0, "closed": 0}
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Create the queue and worker tasks on the running loop (idempotent)."""
+        if self._workers:
+            return
+        self._closing = False
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"broadcast-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+
+    async def submit(self, message: Dict[str, Any]) -> bool:
+        """Enqueue a message; returns False if it was dropped."""
+        if self._closing:
+            self.dropped["closed"] += 1
+            return False
+        if not self._workers:
+            self.start()
+        queue = self._queue
+        assert queue is not None
+        if queue.full():
+            if self.drop_policy == "drop_oldest":
+                try:
+                    queue.get_nowait()
+                    queue.task_done()
+                    self.dropped["evicted"] += 1
+                except asyncio.QueueEmpty:  # pragma: no cover - drained concurrently
+                    pass
+            elif self.drop_policy == "block":
+                try:
+                    await asyncio.wait_for(queue.put(message), timeout=self.put_timeout)
+                    self._accepted(queue)
+                    return True
+                except asyncio.TimeoutError:
+                    pass
+            if queue.full():
+                self.dropped["full"] += 1
+                self._log.warning("broadcast dropped: queue full", extra={"depth": queue.qsize()})
+                return False
+        queue.put_nowait(message)
+        self._accepted(queue)
+        return True
+
+    def _accepted(self, queue: asyncio.Queue) -> None:
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, queue.qsize())
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        while True:
+            message = await queue.get()
+            try:
+                if await self._sender(message):
+                    self.delivered += 1
+                else:
+                    self.failed += 1
+            except Exception as e:
+                self.failed += 1
+                self._log.error("broadcast worker error", extra={"error": str(e)})
+            finally:
+                queue.task_done()
+
+    async def drain(self, timeout: float = 10.0) -> None:
+        """Stop accepting messages, deliver what is queued (up to `timeout`), then stop workers."""
+        self._closing = True
+        if self._queue is not None and self._workers:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                self._log.warning("broadcast drain timed out", extra={"remaining": self._queue.qsize()})
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "maxSize": self.max_size,
+            "maxDepth": self.max_depth,
+            "workers": len(self._workers),
+            "dropPolicy": self.drop_policy,
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": dict(self.dropped),
+        }
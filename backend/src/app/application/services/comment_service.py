@@ -1,13 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 import uuid
-from datetime import datetime, timezone
-from typing import Optional, Dict, Any, Tuple, List
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional, Dict, Any, Tuple, List, TypeVar
 
-from app.domain.entities.comment import Comment
+from app.domain.entities.comment import Comment, CommentCursorError
+from app.domain.entities.note_access import NoteAccess, NoteNotAccessibleError
+from app.domain.entities.outbox_event import OutboxEvent
+from app.domain.ports.cache_purger import CachePurger
 from app.domain.ports.comment_repository import CommentRepository
 from app.domain.ports.notes_repository import NotesRepository
+from app.application.services.outbox_drainer import OutboxDrainer
 from app.application.services.websocket_service import WebSocketService
+from app.shared.http_cache import note_surrogate_key
+from app.shared.logger import get_logger
+
+
+T = TypeVar("T")
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp ("Z" allowed); naive values are taken as UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
 
 
 class CommentApplicationService:
@@ -16,28 +34,143 @@ class CommentApplicationService:
         comment_repository: CommentRepository,
         notes_repository: NotesRepository,
         websocket_service: WebSocketService,
+        outbox_drainer: Optional[OutboxDrainer] = None,
+        speculative_list: bool = False,
+        delta_settle_seconds: float = 5.0,
+        cache_purger: Optional[CachePurger] = None,
     ):
         self.comment_repository = comment_repository
         self.notes_repository = notes_repository
         self.websocket_service = websocket_service
+        # When set, comment events go through the transactional outbox
+        self.outbox_drainer = outbox_drainer
+        # When set, comment listings query comments while the note is checked
+        self.speculative_list = speculative_list
+        # How far behind now a delta fetch's high-water mark stays
+        self.delta_settle_seconds = delta_settle_seconds
+        # Public note responses carry commentCount; each comment purges its note's entry
+        self.cache_purger = cache_purger
+        self._log = get_logger("app.comment_service")
 
     async def list_comments_for_public_note(self, note_id: str, page: int, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """List comments for a public note with pagination."""
-        # First verify the note exists and is public
-        note = await self.notes_repository.get_public_note(note_id)
-        if not note:
-            raise ValueError(f"Public note {note_id} not found")
-        
-        return await self.comment_repository.list_comments_by_note(note_id, page, limit)
+        # The note must exist and be public (key attributes only)
+        return await self._read_authorized(
+            NoteAccess(note_id),
+            lambda: self.comment_repository.list_comments_by_note(note_id, page, limit),
+        )
     
     async def list_comments_for_private_note(self, note_id: str, owner_uid: str, page: int, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """List comments for a private note owned by the user with pagination."""
-        # First verify the note exists and is owned by the user
-        note = await self.notes_repository.get_note_by_owner(note_id, owner_uid)
-        if not note:
-            raise ValueError(f"Private note {note_id} not found for owner {owner_uid}")
-        
-        return await self.comment_repository.list_comments_by_note(note_id, page, limit)
+        # The note must exist and be owned by the user (key attributes only)
+        return await self._read_authorized(
+            NoteAccess(note_id, owner_uid=owner_uid),
+            lambda: self.comment_repository.list_comments_by_note(note_id, page, limit),
+        )
+
+    async def is_public_note(self, note_id: str) -> bool:
+        """Whether the note exists and is public (key attributes only, usually cached)."""
+        return await self.notes_repository.check_note_access(NoteAccess(note_id))
+
+    async def list_comments_since_for_public_note(self, note_id: str, since: str, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """List a public note's comments newer than `since` (see `_list_comments_since`)."""
+        return await self._read_authorized(
+            NoteAccess(note_id), lambda: self._list_comments_since(note_id, since, limit)
+        )
+
+    async def list_comments_since_for_private_note(self, note_id: str, owner_uid: str, since: str, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """List comments newer than `since` on a private note owned by the user."""
+        return await self._read_authorized(
+            NoteAccess(note_id, owner_uid=owner_uid), lambda: self._list_comments_since(note_id, since, limit)
+        )
+
+    async def _list_comments_since(self, note_id: str, since: str, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Return comments created after the `since` cursor and the cursor to use next time.
+
+        `since` is a comment id of this note or an ISO-8601 timestamp (such as
+        a previous `highWaterMark`). When every new comment fit in `limit`, the
+        mark stays `delta_settle_seconds` behind now: comments appear in the
+        time index shortly after their `createdAt`, so the next fetch repeats
+        that window rather than skipping a late one (clients dedupe by id).
+        """
+        after = await self._resolve_cursor(note_id, since)
+        comments, has_more = await self.comment_repository.list_comments_since(note_id, after, limit)
+        if has_more:
+            mark = _parse_timestamp(comments[-1]["createdAt"])
+        else:
+            mark = max(after, datetime.now(timezone.utc) - timedelta(seconds=self.delta_settle_seconds))
+        high_water_mark = mark.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+        return comments, {"highWaterMark": high_water_mark, "hasMore": has_more}
+
+    async def comments_missed_by_stream(self, note_id: str, last_event_id: Optional[str], max_comments: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Comments a resuming comment stream missed, and whether that is all of them.
+
+        `last_event_id` is the `createdAt` of the last comment the stream sent.
+        The replay starts `delta_settle_seconds` earlier so late-indexed comments
+        are not skipped. Returns ([], False) for an unusable id, and stops at
+        `max_comments`; either way the client should re-fetch the list instead.
+        """
+        if not last_event_id:
+            return [], True
+        try:
+            after = _parse_timestamp(last_event_id) - timedelta(seconds=self.delta_settle_seconds)
+        except ValueError:
+            return [], False
+        missed: List[Dict[str, Any]] = []
+        while len(missed) < max_comments:
+            page, has_more = await self.comment_repository.list_comments_since(
+                note_id, after, min(100, max_comments - len(missed))
+            )
+            missed.extend(page)
+            if not has_more:
+                return missed, True
+            after = _parse_timestamp(page[-1]["createdAt"])
+        return missed, False
+
+    async def _resolve_cursor(self, note_id: str, since: str) -> datetime:
+        try:
+            uuid.UUID(since)
+        except ValueError:
+            try:
+                return _parse_timestamp(since)
+            except ValueError:
+                raise CommentCursorError(since) from None
+        # A comment id costs one extra read; the timestamp form does not
+        comment = await self.comment_repository.get_comment(since)
+        if comment is None or comment["noteId"] != note_id:
+            raise CommentCursorError(since)
+        return _parse_timestamp(comment["createdAt"])
+
+    async def _read_authorized(self, access: NoteAccess, read: Callable[[], Awaitable[T]]) -> T:
+        """Check `access`, then run `read`.
+
+        In speculative mode both run concurrently, so the request pays one
+        round trip instead of two; if the check fails the read is cancelled
+        and its result (or error, e.g. a bad cursor) discarded, so nothing
+        leaks and the caller sees the same 404 as on the serial path.
+        """
+        if not self.speculative_list:
+            if not await self.notes_repository.check_note_access(access):
+                raise NoteNotAccessibleError(access)
+            return await read()
+
+        # A plain task rather than a TaskGroup: a failing read must not
+        # cancel the check, whose verdict decides what the caller sees
+        result = asyncio.create_task(read())
+
+        async def discard() -> None:
+            result.cancel()
+            await asyncio.gather(result, return_exceptions=True)
+
+        try:
+            allowed = await self.notes_repository.check_note_access(access)
+        except BaseException:
+            await discard()
+            raise
+        if not allowed:
+            await discard()
+            raise NoteNotAccessibleError(access)
+        return await result
 
     async def create_comment_on_public_note(
         self, 
@@ -47,12 +180,11 @@ class CommentApplicationService:
         author_display_name: str, 
         author_avatar_url: Optional[str]
     ) -> Dict[str, Any]:
-        """Create a comment on a public note and broadcast via WebSocket."""
-        # First verify the note exists and is public
-        note = await self.notes_repository.get_public_note(note_id)
-        if not note:
-            raise ValueError(f"Public note {note_id} not found")
-        
+        """Create a comment on a public note and broadcast via WebSocket.
+
+        The note must exist and be public; the repository checks this as part of
+        the comment write and raises `NoteNotAccessibleError` (a ValueError) if not.
+        """
         # Create comment
         now = datetime.now(timezone.utc)
         comment = Comment(
@@ -66,23 +198,7 @@ class CommentApplicationService:
             updated_at=now,
         )
         
-        # Save comment
-        comment_dict = await self.comment_repository.create_comment(comment)
-        
-        # Broadcast via WebSocket (fire and forget - don't block on failure)
-        try:
-            await self.websocket_service.broadcast_comment_created(
-                note_id=note_id,
-                comment=comment_dict,
-                is_private_note=False,
-            )
-        except Exception as e:
-            # Log error but don't fail the request
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Failed to broadcast comment creation: {e}")
-        
-        return comment_dict
+        return await self._save_and_publish(comment, NoteAccess(note_id), is_private_note=False)
     
     async def create_comment_on_private_note(
         self, 
@@ -93,12 +209,10 @@ class CommentApplicationService:
         author_display_name: str, 
         author_avatar_url: Optional[str]
     ) -> Dict[str, Any]:
-        """Create a comment on a private note owned by the user and broadcast via WebSocket."""
-        # First verify the note exists and is owned by the user
-        note = await self.notes_repository.get_note_by_owner(note_id, owner_uid)
-        if not note:
-            raise ValueError(f"Private note {note_id} not found for owner {owner_uid}")
-        
+        """Create a comment on a private note owned by the user and broadcast via WebSocket.
+
+        Ownership is checked as part of the comment write (see the public variant).
+        """
         # Create comment
         now = datetime.now(timezone.utc)
         comment = Comment(
@@ -112,15 +226,58 @@ class CommentApplicationService:
             updated_at=now,
         )
         
-        # Save comment
-        comment_dict = await self.comment_repository.create_comment(comment)
+        return await self._save_and_publish(comment, NoteAccess(note_id, owner_uid=owner_uid), is_private_note=True)
+
+    async def _purge_note(self, note_id: str) -> None:
+        """Purge the note's CDN-cached response, whose commentCount just changed (best effort).
+
+        Only the note's own key: purging the feed on every comment would defeat
+        its caching, so the feed's counts may trail by up to its s-maxage. A
+        private note has nothing cached under its key, so no visibility read is
+        spent to skip the purge.
+        """
+        if self.cache_purger is None:
+            return
+        try:
+            await self.cache_purger.purge([note_surrogate_key(note_id)])
+        except Exception as e:
+            self._log.error("cdn purge failed", extra={"noteId": note_id, "error": str(e)})
+
+    async def _save_and_publish(self, comment: Comment, access: NoteAccess, is_private_note: bool) -> Dict[str, Any]:
+        """Save the comment and publish its comment.created event.
+
+        With an outbox drainer the event is written in the same transaction as
+        the comment and delivered in the background (at-least-once); otherwise
+        it is broadcast best-effort after the write.
+        """
+        if self.outbox_drainer is not None:
+            message = self.websocket_service.comment_created_message(
+                comment.note_id, comment.to_dict(), is_private_note
+            )
+            event = OutboxEvent(
+                id=str(uuid.uuid4()),
+                event_type=message["type"],
+                topic=comment.note_id,
+                payload=message["data"],
+                created_at=comment.created_at,
+            )
+            comment_dict = await self.comment_repository.create_comment(
+                comment, outbox_event=event, note_access=access
+            )
+            self.outbox_drainer.notify()
+            await self._purge_note(comment.note_id)
+            return comment_dict
+
+        # Save comment (only if the note is still accessible)
+        comment_dict = await self.comment_repository.create_comment(comment, note_access=access)
+        await self._purge_note(comment.note_id)
         
         # Broadcast via WebSocket (fire and forget - don't block on failure)
         try:
             await self.websocket_service.broadcast_comment_created(
-                note_id=note_id,
+                note_id=comment.note_id,
                 comment=comment_dict,
-                is_private_note=True,
+                is_private_note=is_private_note,
             )
         except Exception as e:
             # Log error but don't fail the request
@@ -128,4 +285,4 @@ class CommentApplicationService:
             logger = logging.getLogger(__name__)
             logger.error(f"Failed to broadcast comment creation: {e}")
         
-        return comment_dict
\ No newline at end of file
+        return comment_dict
@@ -2,32 +2,54 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, Tuple, List, Literal
+from typing import Optional, Dict, Any, Tuple, List, Literal, Sequence, AsyncIterator
 
-from app.domain.entities.note import Note, Author
+from app.domain.entities.note import Note, Author, NoteView
+from app.domain.ports.cache_purger import CachePurger
 from app.domain.ports.notes_repository import NotesRepository
 from app.shared.auth import UserContext
+from app.shared.export_stream import ndjson_pages, zip_stream
+from app.shared.http_cache import note_surrogate_keys
+from app.shared.logger import get_logger
 
 
 class NotesApplicationService:
-    def __init__(self, notes_repository: NotesRepository):
+    def __init__(self, notes_repository: NotesRepository, cache_purger: Optional[CachePurger] = None):
         self.notes_repository = notes_repository
+        self.cache_purger = cache_purger
+        self._log = get_logger("app.notes_service")
 
-    async def list_public_notes(self, page: int, limit: int, sort: Literal["latest"]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    async def _purge_note(self, note_id: str) -> None:
+        """Purge CDN-cached responses for a note (best effort, never fails the request)."""
+        if self.cache_purger is None:
+            return
+        try:
+            await self.cache_purger.purge(note_surrogate_keys(note_id))
+        except Exception as e:
+            self._log.error("cdn purge failed", extra={"noteId": note_id, "error": str(e)})
+
+    async def list_public_notes(self, page: int, limit: int, sort: Literal["latest"], view: NoteView = "full", fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """List public notes with pagination."""
-        return await self.notes_repository.list_public_notes(page, limit)
+        return await self.notes_repository.list_public_notes(page, limit, view, fields)
 
-    async def get_public_note(self, note_id: str) -> Optional[Dict[str, Any]]:
+    async def get_public_note(self, note_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
         """Get a single public note by ID."""
-        return await self.notes_repository.get_public_note(note_id)
+        return await self.notes_repository.get_public_note(note_id, fields)
 
-    async def list_my_notes(self, owner_uid: str, page: int, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    async def list_my_notes(self, owner_uid: str, page: int, limit: int, view: NoteView = "full", fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """List user's notes (both public and private) with pagination."""
-        return await self.notes_repository.get_notes_by_owner(owner_uid, page, limit)
+        return await self.notes_repository.get_notes_by_owner(owner_uid, page, limit, view, fields)
+
+    def export_my_notes(self, owner_uid: str, format: Literal["ndjson", "zip"] = "ndjson", page_size: int = 100) -> AsyncIterator[bytes]:
+        """Stream the user's whole notebook as NDJSON (optionally zipped), one page at a time."""
+        stream = ndjson_pages(self.notes_repository.iter_notes_by_owner(owner_uid, page_size))
+        if format == "zip":
+            return zip_stream(stream, filename="notes.ndjson")
+        return stream
 
-    async def get_my_note(self, owner_uid: str, note_id: str) -> Optional[Dict[str, Any]]:
+    async def get_my_note(self, owner_uid: str, note_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
         """Get a single note by ID and owner."""
-        return await self.notes_repository.get_note_by_owner(note_id, owner_uid)
+        return await self.notes_repository.get_note_by_owner(note_id, owner_uid, fields)
 
     async def create_my_note(self, owner_uid: str, title: str, content: str) -> Dict[str, Any]:
         """Create a new private note."""
@@ -83,20 +105,30 @@ class NotesApplicationService:
             publishedAt=datetime.fromisoformat(current_note_dict["publishedAt"].replace("Z", "+00:00")) if current_note_dict.get("publishedAt") else None,
             owner_uid=owner_uid,
             is_public=current_note_dict.get("isPublic", False),
+            comment_count=current_note_dict.get("commentCount", 0),
         )
         
-        await self.notes_repository.update_note(updated_note)
+        try:
+            await self.notes_repository.update_note(updated_note)
+        except ValueError:
+            return None  # deleted since it was read
+        if updated_note.is_public:
+            await self._purge_note(note_id)
         return updated_note.to_private_dict()
 
     async def delete_my_note(self, owner_uid: str, note_id: str) -> bool:
         """Delete a note."""
-        return await self.notes_repository.delete_note(note_id, owner_uid)
+        deleted = await self.notes_repository.delete_note(note_id, owner_uid)
+        if deleted:
+            await self._purge_note(note_id)
+        return deleted
 
     async def publish_note(self, note_id: str, owner_uid: str, user: UserContext) -> Optional[Dict[str, Any]]:
         """Make a note public."""
         success = await self.notes_repository.publish_note(note_id, owner_uid)
         if not success:
             return None
+        await self._purge_note(note_id)
         
         # Return updated note
         return await self.notes_repository.get_note_by_owner(note_id, owner_uid)
@@ -106,6 +138,7 @@ class NotesApplicationService:
         success = await self.notes_repository.unpublish_note(note_id, owner_uid)
         if not success:
             return None
+        await self._purge_note(note_id)
         
         # Return updated note
         return await self.notes_repository.get_note_by_owner(note_id, owner_uid)
\ No newline at end of file
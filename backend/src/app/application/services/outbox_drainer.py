@@ -0,0 +1,154 @@
+"""Background delivery of outbox events.
+
+Comment writes store their broadcast event in the outbox in the same
+transaction, so an event exists if and only if its comment does. The drainer
+claims pending events in batches (with a lease, so a crashed drainer's claims
+come back), sends each batch as one broadcast and deletes the events only
+after the endpoint accepted them. Delivery is therefore at-least-once; every
+message carries the event id so consumers can drop repeats.
+
+A failed batch is retried with jittered backoff; an event that keeps failing
+for `max_attempts` claims is dropped with an error log rather than blocking
+the outbox forever.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.application.services.broadcast_coalescer import batch_message
+from app.domain.entities.outbox_event import OutboxEvent
+from app.domain.ports.outbox_repository import OutboxRepository
+from app.shared.circuit_breaker import jittered_backoff
+from app.shared.logger import get_logger
+
+
+Deliver = Callable[[Dict[str, Any]], Awaitable[bool]]
+
+
+class OutboxDrainer:
+    def __init__(
+        self,
+        outbox: OutboxRepository,
+        deliver: Deliver,
+        batch_size: int = 25,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 30.0,
+        max_attempts: int = 10,
+        retry_base_seconds: float = 1.0,
+        retry_max_seconds: float = 60.0,
+    ) -> None:
+        self.outbox = outbox
+        self._deliver = deliver
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._log = get_logger("app.outbox_drainer")
+        # Metrics
+        self.batches = 0
+        self.delivered = 0
+        self.failed = 0
+        self.abandoned = 0
+        self.redelivered = 0
+
+    def start(self) -> None:
+        """Start the drain loop on the running event loop (idempotent)."""
+        if self._task is not None:
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="outbox-drainer")
+
+    def notify(self) -> None:
+        """Wake the drainer now instead of at the next poll (called after a write)."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        assert self._wake is not None
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                # Keep going while full batches come back
+                while await self.drain_once() >= self.batch_size:
+                    pass
+            except Exception as e:
+                self._log.error("outbox drain failed", extra={"error": str(e)})
+
+    async def drain_once(self) -> int:
+        """Claim and deliver one batch; returns how many events were claimed."""
+        events = await self.outbox.claim_pending(self.batch_size, self.lease_seconds)
+        if not events:
+            return 0
+        self.batches += 1
+        self.redelivered += sum(1 for event in events if event.attempts > 1)
+        try:
+            ok = await self._deliver(batch_message([event.to_message() for event in events]))
+        except Exception as e:
+            self._log.error("outbox delivery error", extra={"error": str(e)})
+            ok = False
+        if ok:
+            await self.outbox.mark_delivered([event.id for event in events])
+            self.delivered += len(events)
+        else:
+            await self._handle_failure(events)
+        return len(events)
+
+    async def _handle_failure(self, events: List[OutboxEvent]) -> None:
+        self.failed += len(events)
+        exhausted = [event for event in events if event.attempts >= self.max_attempts]
+        if exhausted:
+            self.abandoned += len(exhausted)
+            self._log.error(
+                "outbox events abandoned after max attempts",
+                extra={"ids": [event.id for event in exhausted], "attempts": self.max_attempts},
+            )
+            await self.outbox.mark_delivered([event.id for event in exhausted])
+        retry = [event for event in events if event.attempts < self.max_attempts]
+        if retry:
+            attempts = max(event.attempts for event in retry)
+            delay = jittered_backoff(attempts, self.retry_base_seconds, self.retry_max_seconds)
+            await self.outbox.mark_failed([event.id for event in retry], delay)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop the loop after a last drain (up to `timeout`); undelivered events stay in the outbox."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        async def drain_all() -> None:
+            while await self.drain_once() >= self.batch_size:
+                pass
+
+        try:
+            await asyncio.wait_for(drain_all(), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._log.warning("outbox drain on shutdown timed out")
+        except Exception as e:
+            self._log.error("outbox drain on shutdown failed", extra={"error": str(e)})
+
+    async def stats(self) -> Dict[str, Any]:
+        try:
+            pending: Optional[int] = await self.outbox.pending_count()
+        except Exception:
+            pending = None
+        return {
+            "running": self._task is not None,
+            "pending": pending,
+            "batchSize": self.batch_size,
+            "batches": self.batches,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "redelivered": self.redelivered,
+            "abandoned": self.abandoned,
+        }
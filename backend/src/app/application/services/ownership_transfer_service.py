@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from app.domain.entities.note import Author
+from app.domain.entities.ownership_transfer import OwnershipTransfer, TransferInProgressError
+from app.domain.ports.cache_purger import CachePurger
+from app.domain.ports.comment_repository import CommentRepository
+from app.domain.ports.notes_repository import NotesRepository
+from app.domain.ports.ownership_transfer_repository import OwnershipTransferRepository
+from app.shared.http_cache import FEED_SURROGATE_KEY, note_surrogate_key
+from app.shared.logger import get_logger
+
+
+class OwnershipTransferService:
+    """Runs ownership transfers in the background from a persisted record.
+
+    Every note move is conditional on the note still belonging to the anonymous
+    uid, so re-running a transfer (after a crash, or to pick up stragglers) is
+    safe and only moves what is left. Progress is saved after each page under
+    a lease; an instance that froze or was recycled mid-run loses the lease,
+    and the next `resume` (login, or polling the progress) on any instance
+    continues from the saved cursor.
+    """
+
+    def __init__(
+        self,
+        notes_repository: NotesRepository,
+        comment_repository: CommentRepository,
+        transfer_repository: OwnershipTransferRepository,
+        cache_purger: Optional[CachePurger] = None,
+        page_size: int = 100,
+        lease_seconds: float = 60.0,
+    ) -> None:
+        self.notes_repository = notes_repository
+        self.comment_repository = comment_repository
+        self.transfer_repository = transfer_repository
+        self.cache_purger = cache_purger
+        self.page_size = page_size
+        # Also how long a failed transfer waits before a resume retries it
+        self.lease_seconds = lease_seconds
+        self._worker_id = uuid.uuid4().hex
+        # Runs on this instance, by target uid
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._log = get_logger("app.ownership_transfer")
+
+    async def get_transfer(self, to_uid: str) -> Optional[OwnershipTransfer]:
+        return await self.transfer_repository.get(to_uid)
+
+    async def start_transfer(self, from_uid: str, to_author: Author) -> OwnershipTransfer:
+        """Start (or resume) moving `from_uid`'s notes and comments to `to_author`; returns immediately.
+
+        One transfer per target at a time: while another account's transfer
+        into `to_author` is running, it is kicked along and
+        `TransferInProgressError` is raised; the caller retries once it is done.
+        """
+        current = await self.transfer_repository.get(to_author.id)
+        if current is not None and current.status == "running":
+            self._spawn(to_author.id)
+            if current.from_uid == from_uid:
+                return current
+            raise TransferInProgressError(current)
+        transfer = OwnershipTransfer(
+            from_uid=from_uid,
+            to_uid=to_author.id,
+            to_display_name=to_author.displayName,
+            to_avatar_url=to_author.avatarUrl,
+        )
+        if current is not None and current.from_uid == from_uid and current.status == "failed":
+            # Resume where the failed run stopped
+            transfer.cursor = current.cursor
+            transfer.notes_moved = current.notes_moved
+            transfer.notes_skipped = current.notes_skipped
+            transfer.pages_done = current.pages_done
+        if not await self.transfer_repository.put(transfer):
+            # Another request started one in between
+            return await self.start_transfer(from_uid, to_author)
+        # A run of the previous record may still be wrapping up here
+        self._spawn(to_author.id, after_current=True)
+        return transfer
+
+    async def resume(self, to_uid: str) -> Optional[OwnershipTransfer]:
+        """Return the user's transfer, restarting it here if it is unfinished and nobody is running it."""
+        transfer = await self.transfer_repository.get(to_uid)
+        if transfer is not None and transfer.status != "completed":
+            self._spawn(to_uid)
+        return transfer
+
+    def _spawn(self, to_uid: str, after_current: bool = False) -> None:
+        """Run the transfer here unless a run is already going.
+
+        With `after_current`, a run still going (of a record that was just
+        replaced) is not enough: a new one starts once it has exited.
+        """
+        previous = self._tasks.get(to_uid)
+        if previous is not None and previous.done():
+            previous = None
+        if previous is not None and not after_current:
+            return
+        task = asyncio.create_task(self._run(to_uid, after=previous))
+        self._tasks[to_uid] = task
+
+        def forget(_: asyncio.Task) -> None:
+            if self._tasks.get(to_uid) is task:
+                del self._tasks[to_uid]
+
+        task.add_done_callback(forget)
+
+    async def _run(self, to_uid: str, after: Optional[asyncio.Task] = None) -> None:
+        if after is not None:
+            await asyncio.gather(after, return_exceptions=True)
+        retry_failed_before = datetime.now(timezone.utc) - timedelta(seconds=self.lease_seconds)
+        transfer = await self.transfer_repository.acquire(to_uid, self._worker_id, self.lease_seconds, retry_failed_before)
+        if transfer is None:
+            return  # finished, or another instance holds the lease
+        to_author = Author(id=transfer.to_uid, displayName=transfer.to_display_name, avatarUrl=transfer.to_avatar_url)
+        self._log.info("transfer: start", extra={"from": transfer.from_uid, "to": transfer.to_uid, "cursor": transfer.cursor})
+        try:
+            while True:
+                note_ids, next_cursor = await self.notes_repository.list_note_ids_by_owner(
+                    transfer.from_uid, self.page_size, transfer.cursor
+                )
+                if note_ids:
+                    moved = await self.notes_repository.reassign_notes(note_ids, transfer.from_uid, to_author)
+                    transfer.notes_moved += moved
+                    transfer.notes_skipped += len(note_ids) - moved
+                    await self._purge([note_surrogate_key(note_id) for note_id in note_ids])
+                transfer.pages_done += 1
+                transfer.cursor = next_cursor
+                if not await self.transfer_repository.save_progress(transfer, self._worker_id, self.lease_seconds):
+                    self._log.info("transfer: lease lost", extra={"from": transfer.from_uid, "to": transfer.to_uid})
+                    return
+                if next_cursor is None:
+                    break
+            transfer.comments_moved = await self.comment_repository.reassign_author(
+                transfer.from_uid, to_author.id, to_author.displayName
+            )
+            if transfer.notes_moved:
+                await self._purge([FEED_SURROGATE_KEY])
+            transfer.status = "completed"
+        except Exception as e:
+            transfer.status = "failed"
+            transfer.error = str(e)
+            self._log.error("transfer: failed", extra={"from": transfer.from_uid, "to": transfer.to_uid, "error": str(e)})
+        transfer.finished_at = datetime.now(timezone.utc)
+        try:
+            await self.transfer_repository.save_progress(transfer, self._worker_id, None)
+        except Exception as e:
+            # The lease expires and a later resume runs the (idempotent) transfer again
+            self._log.error("transfer: save failed", extra={"to": transfer.to_uid, "error": str(e)})
+        self._log.info("transfer: done", extra=transfer.to_dict())
+
+    async def _purge(self, keys: list) -> None:
+        if self.cache_purger is None or not keys:
+            return
+        try:
+            await self.cache_purger.purge(keys)
+        except Exception as e:
+            self._log.error("cdn purge failed", extra={"keys": keys, "error": str(e)})
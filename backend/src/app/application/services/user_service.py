@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
-from app.domain.ports.user_repository import UserRepository
+from app.domain.ports.user_repository import (
+    ProfileWriteCondition,
+    ProfileWriteOutcome,
+    UserRepository,
+)
 from app.shared.logger import get_logger
 
 
+PROFILE_FIELDS = {"displayName", "email", "avatarUrl", "isAnonymous"}
+
+
 class UserApplicationService:
     def __init__(self, users: UserRepository) -> None:
         self._users = users
@@ -21,23 +28,32 @@ class UserApplicationService:
         """Update an existing profile, or create it if missing.
 
         Allows updating displayName, email, avatarUrl, and isAnonymous.
-        If the profile does not exist yet, performs an upsert to create it.
+        Creation and update happen in a single repository write.
         """
         self._log.info("update_profile: requested", extra={"uid": uid, "patch": patch})
-        allowed = {k: v for k, v in patch.items() if k in {"displayName", "email", "avatarUrl", "isAnonymous"}}
+        allowed = {k: v for k, v in patch.items() if k in PROFILE_FIELDS}
         if not allowed:
             self._log.info("update_profile: no allowed fields", extra={"uid": uid})
             return await self._users.get(uid)
 
-        self._log.info("update_profile: try update", extra={"uid": uid, "allowed": allowed})
-        updated = await self._users.update(uid, allowed)
-        if updated is not None:
-            self._log.info("update_profile: updated existing", extra={"uid": uid})
-            return updated
-
-        # Create new profile via upsert when no existing record
-        profile = {"uid": uid, **allowed}
-        self._log.info("update_profile: upsert create", extra={"uid": uid, "profile": profile})
-        created = await self._users.upsert(profile)
-        self._log.info("update_profile: created", extra={"uid": uid})
-        return created
+        profile, outcome = await self._users.create_or_patch(uid, allowed)
+        self._log.info("update_profile: done", extra={"uid": uid, "outcome": outcome})
+        return profile
+
+    async def ensure_profile(
+        self,
+        uid: str,
+        patch: Dict[str, Any],
+        defaults: Optional[Dict[str, Any]] = None,
+        when: ProfileWriteCondition = "always",
+    ) -> Tuple[Dict[str, Any], ProfileWriteOutcome]:
+        """Create the profile if needed and apply `patch`, in exactly one write.
+
+        `defaults` are only used for fields the stored profile does not have yet;
+        `when` restricts the write (see ProfileWriteCondition).
+        """
+        allowed = {k: v for k, v in patch.items() if k in PROFILE_FIELDS}
+        initial = {k: v for k, v in (defaults or {}).items() if k in PROFILE_FIELDS and v is not None}
+        profile, outcome = await self._users.create_or_patch(uid, allowed, initial, when)
+        self._log.info("ensure_profile: done", extra={"uid": uid, "when": when, "outcome": outcome})
+        return profile, outcome
@@ -2,27 +2,120 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from typing import Any
+from typing import Any, Awaitable, Callable, Optional
 
 import httpx
 
+from app.application.services.broadcast_coalescer import BroadcastCoalescer
+from app.application.services.broadcast_queue import BroadcastQueue
+from app.shared.circuit_breaker import CircuitBreaker, jittered_backoff
 from app.shared.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Endpoint responses worth retrying: throttled, or the gateway could not reach
+# the Lambda. A 504 is not retried since the broadcast may have gone out.
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503})
+
+# Receives a broadcast POST body in-process instead of over HTTP
+LocalSink = Callable[[dict[str, Any]], Awaitable[bool]]
+
+
+def broadcast_url(endpoint_url: str) -> str:
+    """URL of the comments broadcast route for a configured endpoint."""
+    # For development with serverless offline, use the HTTP broadcast endpoint
+    if endpoint_url.startswith("http://localhost") or endpoint_url.startswith("http://serverless"):
+        return f"{endpoint_url}/development/broadcast/comments"
+    # Production AWS API Gateway endpoint
+    return f"{endpoint_url}/broadcast/comments"
+
+
+def broadcast_timeout() -> httpx.Timeout:
+    """Separate budgets: failing to connect is detected fast, while the
+    broadcast Lambda gets longer to fan out before we give up on it."""
+    settings = get_settings()
+    return httpx.Timeout(
+        settings.websocket_broadcast_read_timeout_seconds,
+        connect=settings.websocket_broadcast_connect_timeout_seconds,
+        pool=settings.websocket_broadcast_connect_timeout_seconds,
+    )
+
 
 class WebSocketService:
     """Service for sending messages through WebSocket API Gateway."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        local_sink: Optional[LocalSink] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        mode: Optional[str] = None,
+        local_mirror: Optional[LocalSink] = None,
+    ) -> None:
         self.settings = get_settings()
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # A client passed in is owned (pooled, warmed and closed) by the app
+        # lifespan; otherwise the service owns a private one
+        self._owns_client = client is None
+        self.client = client if client is not None else httpx.AsyncClient(timeout=broadcast_timeout())
+        # Stops paying the timeout on every comment while the endpoint is down
+        self.breaker = CircuitBreaker(
+            "websocket-broadcast",
+            failure_threshold=self.settings.websocket_breaker_failure_threshold,
+            reset_timeout=self.settings.websocket_breaker_reset_seconds,
+        )
+        self.retries = 0
+        # In-process stand-in for the broadcast endpoint (tests, offline development)
+        self.local_sink = local_sink
+        # Also gets every message sent to the broadcast endpoint, so in-process
+        # subscribers (SSE streams on this instance) see this instance's events
+        self.local_mirror = local_mirror
+        # "queue" hands broadcasts to background workers, "coalesce" additionally
+        # batches them per short window; "inline" sends them within the request
+        # (for runtimes that freeze between requests). In "outbox" mode comment
+        # events are written with the comment and sent by the OutboxDrainer
+        # through `deliver`, so nothing is queued here
+        self.mode = mode or self.settings.websocket_broadcast_mode
+        self.queue: Optional[BroadcastQueue] = None
+        self.coalescer: Optional[BroadcastCoalescer] = None
+        if self.mode in ("queue", "coalesce"):
+            self.queue = BroadcastQueue(
+                self._send_broadcast,
+                max_size=self.settings.websocket_broadcast_queue_size,
+                workers=self.settings.websocket_broadcast_workers,
+                drop_policy=self.settings.websocket_broadcast_drop_policy,  # type: ignore[arg-type]
+            )
+        if self.mode == "coalesce" and self.queue is not None:
+            self.coalescer = BroadcastCoalescer(
+                self.queue.submit,
+                window_seconds=self.settings.websocket_broadcast_window_ms / 1000,
+                max_batch=self.settings.websocket_broadcast_max_batch,
+            )
+
+    def start(self) -> None:
+        """Start background delivery (called from the app lifespan)."""
+        if self.queue is not None:
+            self.queue.start()
 
     async def close(self) -> None:
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Drain queued broadcasts, then close the HTTP client if the service owns it."""
+        if self.coalescer is not None:
+            await self.coalescer.flush()
+        if self.queue is not None:
+            await self.queue.drain(self.settings.websocket_broadcast_drain_seconds)
+        if self._owns_client:
+            await self.client.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "target": "local" if self.local_sink is not None else "http",
+            "queue": self.queue.stats() if self.queue is not None else None,
+            "coalescer": self.coalescer.stats() if self.coalescer is not None else None,
+            "breaker": self.breaker.stats() if self.local_sink is None else None,
+            "retries": self.retries,
+        }
 
     async def broadcast_comment_created(
         self,
@@ -30,7 +123,10 @@ class WebSocketService:
         comment: dict[str, Any],
         is_private_note: bool = False,
     ) -> bool:
-        """Broadcast new comment creation to all connected WebSocket clients.
+        """Broadcast new comment creation to the clients subscribed to the note.
+
+        The message carries the note ID as its routing ``topic``; the broadcast
+        endpoint delivers it only to connections subscribed to that note.
         
         Args:
             note_id: The ID of the note the comment was created on
@@ -38,18 +134,32 @@ class WebSocketService:
             is_private_note: Whether this is a private note comment
             
         Returns:
-            True if broadcast was successful, False otherwise
+            True if broadcast was successful (or, in queue mode, accepted), False otherwise
         """
-        message_data = {
+        message_data = self.comment_created_message(note_id, comment, is_private_note)
+
+        if self.coalescer is not None:
+            return await self.coalescer.submit(message_data)
+        if self.queue is not None:
+            return await self.queue.submit(message_data)
+        return await self._send_broadcast(message_data)
+
+    @staticmethod
+    def comment_created_message(note_id: str, comment: dict[str, Any], is_private_note: bool) -> dict[str, Any]:
+        """Build the ``comment.created`` broadcast message for a comment dict."""
+        return {
+            "topic": note_id,
             "type": "comment.created",
             "data": {
                 "noteId": note_id,
                 "comment": comment,
                 "isPrivateNote": is_private_note,
             },
-            "timestamp": comment.get("created_at"),
+            "timestamp": comment.get("createdAt"),
         }
 
+    async def deliver(self, message_data: dict[str, Any]) -> bool:
+        """Send a message (or batch) now, bypassing the queue; used by the outbox drainer."""
         return await self._send_broadcast(message_data)
 
     async def _send_broadcast(self, message_data: dict[str, Any]) -> bool:
@@ -62,38 +172,92 @@ class WebSocketService:
             True if successful, False otherwise
         """
         try:
+            if self.local_sink is not None:
+                return await self.local_sink(message_data)
+            if self.local_mirror is not None:
+                await self.local_mirror(message_data)
+
             # Get the WebSocket broadcast endpoint from settings
             endpoint_url = self.settings.app_serverless_websocket_endpoint
             if not endpoint_url:
                 logger.warning("WebSocket endpoint not configured, skipping broadcast")
                 return False
 
-            # For development with serverless offline, use the HTTP broadcast endpoint
-            if endpoint_url.startswith("http://localhost") or endpoint_url.startswith("http://serverless"):
-                broadcast_url = f"{endpoint_url}/development/broadcast/comments"
-            else:
-                # Production AWS API Gateway endpoint
-                broadcast_url = f"{endpoint_url}/broadcast/comments"
-
-            logger.debug(f"Broadcasting message to: {broadcast_url}")
+            url = broadcast_url(endpoint_url)
+            logger.debug(f"Broadcasting message to: {url}")
             logger.debug(f"Message data: {json.dumps(message_data, indent=2)}")
 
-            response = await self.client.post(
-                broadcast_url,
-                json=message_data,
-                headers={"Content-Type": "application/json"},
-            )
-
-            if response.status_code == 200:
-                logger.info(f"Successfully broadcasted comment message for note {message_data.get('data', {}).get('noteId')}")
+            if await self._post_with_retries(url, message_data):
+                if message_data.get("type") == "batch":
+                    logger.info(f"Successfully broadcasted batch of {len(message_data.get('messages', []))} messages")
+                else:
+                    logger.info(f"Successfully broadcasted comment message for note {message_data.get('data', {}).get('noteId')}")
                 return True
-            else:
-                logger.error(f"Failed to broadcast message. Status: {response.status_code}, Response: {response.text}")
-                return False
-
-        except httpx.TimeoutException:
-            logger.error("WebSocket broadcast request timed out")
             return False
+
         except Exception as e:
             logger.error(f"Failed to broadcast WebSocket message: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    async def _post_with_retries(self, url: str, message_data: dict[str, Any]) -> bool:
+        """POST to the broadcast endpoint through the circuit breaker.
+
+        Connection failures and retryable statuses are retried with jittered
+        exponential backoff, up to `websocket_broadcast_max_attempts` attempts.
+        Read timeouts are not retried (the endpoint may already be fanning out),
+        but they count as failures for the breaker.
+        """
+        max_attempts = max(1, self.settings.websocket_broadcast_max_attempts)
+        for attempt in range(1, max_attempts + 1):
+            if not self.breaker.allow():
+                logger.warning("WebSocket broadcast skipped: circuit open")
+                return False
+            retryable = False
+            try:
+                response = await self.client.post(
+                    url,
+                    json=message_data,
+                    headers={"Content-Type": "application/json"},
+                )
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                self.breaker.record_failure()
+                retryable = True
+                logger.warning(f"WebSocket broadcast connection failed (attempt {attempt}/{max_attempts}): {e!r}")
+            except httpx.TimeoutException:
+                self.breaker.record_failure()
+                logger.error("WebSocket broadcast request timed out")
+                return False
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                logger.error(f"WebSocket broadcast transport error: {e!r}")
+                return False
+            except BaseException:
+                # Cancelled mid-request (queue/drainer shutdown) or the request
+                # could not be built: no verdict, but the probe slot must be freed
+                self.breaker.release()
+                raise
+            else:
+                if response.status_code == 200:
+                    self.breaker.record_success()
+                    return True
+                if response.status_code >= 500 or response.status_code == 429:
+                    self.breaker.record_failure()
+                else:
+                    # The endpoint is up; the request itself was rejected
+                    self.breaker.record_success()
+                retryable = response.status_code in RETRYABLE_STATUS_CODES
+                logger.error(
+                    f"Failed to broadcast message (attempt {attempt}/{max_attempts}). "
+                    f"Status: {response.status_code}, Response: {response.text}"
+                )
+            if not retryable or attempt == max_attempts:
+                return False
+            self.retries += 1
+            await asyncio.sleep(
+                jittered_backoff(
+                    attempt,
+                    self.settings.websocket_broadcast_retry_base_ms / 1000,
+                    self.settings.websocket_broadcast_retry_max_ms / 1000,
+                )
+            )
+        return False
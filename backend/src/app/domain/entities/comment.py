@@ -40,4 +40,12 @@ class Comment:
 
     def to_websocket_dict(self) -> Dict[str, Any]:
         """Convert comment to dictionary for WebSocket broadcasting."""
-        return self.to_dict()
\ No newline at end of file
+        return self.to_dict()
+
+
+class CommentCursorError(ValueError):
+    """A `since` cursor that is neither a timestamp nor a comment of the note."""
+
+    def __init__(self, cursor: str) -> None:
+        super().__init__(f"Invalid comment cursor: {cursor}")
+        self.cursor = cursor
@@ -1,8 +1,36 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Literal, Sequence
+
+
+# List response shape: full notes, or summaries (excerpt + contentLength, no content)
+NoteView = Literal["full", "summary"]
+
+EXCERPT_MAX_LENGTH = 200
+
+# Fields a client may request with a sparse fieldset (`?fields=`)
+PUBLIC_NOTE_FIELDS = (
+    "id", "title", "content", "excerpt", "contentLength", "author", "createdAt", "updatedAt", "publishedAt",
+    "commentCount",
+)
+PRIVATE_NOTE_FIELDS = (
+    "id", "title", "content", "excerpt", "contentLength", "createdAt", "updatedAt", "publishedAt", "isPublic",
+    "commentCount",
+)
+
+
+def make_excerpt(content: str, max_length: int = EXCERPT_MAX_LENGTH) -> str:
+    """Collapse whitespace and cut content at a word boundary for feed cards."""
+    text = " ".join(content.split())
+    if len(text) <= max_length:
+        return text
+    cut = text[:max_length]
+    space = cut.rfind(" ")
+    if space > max_length // 2:
+        cut = cut[:space]
+    return cut.rstrip(" ,.;:") + "…"
 
 
 @dataclass(frozen=True)
@@ -30,6 +58,22 @@ class Note:
     publishedAt: Optional[datetime]
     owner_uid: str
     is_public: bool
+    # Derived from content at write time; filled in automatically when omitted
+    excerpt: Optional[str] = None
+    content_length: Optional[int] = None
+    # Maintained by the storage layer as comments are written
+    comment_count: int = 0
+    # False when read without `content` (summary and sparse projections);
+    # excerpt/content_length are then left as stored, None for older items
+    content_loaded: bool = field(default=True, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.content_loaded:
+            return
+        if self.excerpt is None:
+            object.__setattr__(self, "excerpt", make_excerpt(self.content))
+        if self.content_length is None:
+            object.__setattr__(self, "content_length", len(self.content))
 
     @staticmethod
     def _iso(dt: datetime) -> str:
@@ -46,6 +90,7 @@ class Note:
             "createdAt": self._iso(self.createdAt),
             "updatedAt": self._iso(self.updatedAt),
             "publishedAt": self._iso(self.publishedAt) if self.publishedAt else None,
+            "commentCount": self.comment_count,
         }
     
     def to_private_dict(self) -> Dict[str, Any]:
@@ -57,5 +102,54 @@ class Note:
             "updatedAt": self._iso(self.updatedAt),
             "publishedAt": self._iso(self.publishedAt) if self.publishedAt else None,
             "isPublic": self.is_public,
+            "commentCount": self.comment_count,
+        }
+
+    def to_public_view(self, view: NoteView = "full", fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Serialize for public responses, honouring the list view and a sparse fieldset."""
+        if not fields:
+            return self.to_public_summary_dict() if view == "summary" else self.to_public_dict()
+        data = {**self.to_public_dict(), **self.to_public_summary_dict()}
+        return _select_fields(data, fields, view)
+
+    def to_private_view(self, view: NoteView = "full", fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Serialize for the owner's notebook, honouring the list view and a sparse fieldset."""
+        if not fields:
+            return self.to_private_summary_dict() if view == "summary" else self.to_private_dict()
+        data = {**self.to_private_dict(), **self.to_private_summary_dict()}
+        return _select_fields(data, fields, view)
+
+    def to_public_summary_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "excerpt": self.excerpt,
+            "contentLength": self.content_length,
+            "author": self.author.to_dict(),
+            "createdAt": self._iso(self.createdAt),
+            "updatedAt": self._iso(self.updatedAt),
+            "publishedAt": self._iso(self.publishedAt) if self.publishedAt else None,
+            "commentCount": self.comment_count,
+        }
+
+    def to_private_summary_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "excerpt": self.excerpt,
+            "contentLength": self.content_length,
+            "createdAt": self._iso(self.createdAt),
+            "updatedAt": self._iso(self.updatedAt),
+            "publishedAt": self._iso(self.publishedAt) if self.publishedAt else None,
+            "isPublic": self.is_public,
+            "commentCount": self.comment_count,
         }
 
+
+def _select_fields(data: Dict[str, Any], fields: Sequence[str], view: NoteView) -> Dict[str, Any]:
+    """Keep only the requested keys (summaries never expose `content`)."""
+    return {
+        k: data[k]
+        for k in fields
+        if k in data and not (view == "summary" and k == "content")
+    }
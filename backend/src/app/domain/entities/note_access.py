@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class NoteAccess:
+    """What a note must satisfy for an operation on it to proceed.
+
+    Without `owner_uid` the note must exist and be public; with it, the note
+    must exist and be owned by that user (public or not).
+    """
+
+    note_id: str
+    owner_uid: Optional[str] = None
+
+    def describe(self) -> str:
+        if self.owner_uid is None:
+            return f"Public note {self.note_id} not found"
+        return f"Private note {self.note_id} not found for owner {self.owner_uid}"
+
+
+@dataclass(frozen=True)
+class NoteVisibility:
+    """The attributes of a note that decide who may see it."""
+
+    owner_uid: str
+    is_public: bool
+
+    def allows(self, access: NoteAccess) -> bool:
+        if access.owner_uid is None:
+            return self.is_public
+        return self.owner_uid == access.owner_uid
+
+
+class NoteNotAccessibleError(ValueError):
+    """The note does not exist or does not satisfy the requested `NoteAccess`."""
+
+    def __init__(self, access: NoteAccess) -> None:
+        super().__init__(access.describe())
+        self.access = access
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+
+@dataclass(frozen=True)
+class OutboxEvent:
+    """An event stored together with the write that produced it, delivered later.
+
+    `id` is the dedupe id: it is sent with every delivery attempt, so a
+    consumer that sees the same id twice can drop the repeat.
+    """
+
+    id: str
+    event_type: str
+    topic: str
+    payload: Dict[str, Any]
+    created_at: datetime
+    attempts: int = 0
+
+    @staticmethod
+    def _iso(dt: datetime) -> str:
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+    def to_message(self) -> Dict[str, Any]:
+        """Broadcast message body (routing topic included)."""
+        return {
+            "id": self.id,
+            "topic": self.topic,
+            "type": self.event_type,
+            "data": self.payload,
+            "timestamp": self._iso(self.created_at),
+        }
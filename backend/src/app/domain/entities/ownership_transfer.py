@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Literal, Optional
+
+
+TransferStatus = Literal["running", "completed", "failed"]
+
+
+def _iso(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+@dataclass
+class OwnershipTransfer:
+    """Progress of moving an anonymous user's content to a regular account.
+
+    `cursor` is the position in the source owner's OwnerIndex pages. The
+    record is persisted after every page, so whichever instance resumes an
+    unfinished transfer continues from there. The target author is kept so a
+    resumed run can stamp moved notes without the original request.
+    """
+
+    from_uid: str
+    to_uid: str
+    to_display_name: str = "User"
+    to_avatar_url: Optional[str] = None
+    status: TransferStatus = "running"
+    notes_moved: int = 0
+    notes_skipped: int = 0
+    comments_moved: int = 0
+    pages_done: int = 0
+    cursor: Optional[str] = None
+    error: Optional[str] = None
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fromUid": self.from_uid,
+            "toUid": self.to_uid,
+            "status": self.status,
+            "notesMoved": self.notes_moved,
+            "notesSkipped": self.notes_skipped,
+            "commentsMoved": self.comments_moved,
+            "pagesDone": self.pages_done,
+            "error": self.error,
+            "startedAt": _iso(self.started_at),
+            "finishedAt": _iso(self.finished_at) if self.finished_at else None,
+        }
+
+
+class TransferInProgressError(ValueError):
+    """Another account's transfer into the same target is still running."""
+
+    def __init__(self, transfer: OwnershipTransfer) -> None:
+        super().__init__(
+            f"Ownership transfer from {transfer.from_uid} to {transfer.to_uid} is still running"
+        )
+        self.transfer = transfer
@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from typing import Protocol, List
+
+
+class CachePurger(Protocol):
+    async def purge(self, surrogate_keys: List[str]) -> None:
+        """Invalidate every cached response tagged with any of the given surrogate keys."""
+        ...
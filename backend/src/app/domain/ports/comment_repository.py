@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from typing import Protocol, List, Dict, Any, Optional
+from datetime import datetime
+from typing import Protocol, List, Dict, Any, Optional, Tuple
 from app.domain.entities.comment import Comment
+from app.domain.entities.note_access import NoteAccess
+from app.domain.entities.outbox_event import OutboxEvent
 
 
 class CommentRepository(Protocol):
@@ -9,10 +12,33 @@ class CommentRepository(Protocol):
         """Return list of comment dicts for a note and pagination dict matching OpenAPI schema."""
         ...
     
-    async def create_comment(self, comment: Comment) -> Dict[str, Any]:
-        """Create a new comment and return the comment dict."""
+    async def list_comments_since(self, note_id: str, since: datetime, limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Return up to `limit` comment dicts created strictly after `since` (oldest first),
+        read with a range query on the note's time-ordered sort key, and whether more follow."""
+        ...
+    
+    async def create_comment(
+        self,
+        comment: Comment,
+        outbox_event: Optional[OutboxEvent] = None,
+        note_access: Optional[NoteAccess] = None,
+    ) -> Dict[str, Any]:
+        """Create a new comment and return the comment dict.
+
+        If `outbox_event` is given it is stored atomically with the comment:
+        either both are written or neither is.
+
+        If `note_access` is given the comment is only written while the note
+        satisfies it, checked as part of the same write, and the note's
+        comment count is incremented with it; otherwise
+        `NoteNotAccessibleError` is raised and nothing is stored.
+        """
         ...
     
     async def get_comment(self, comment_id: str) -> Optional[Dict[str, Any]]:
         """Return a single comment dict by id or None."""
-        ...
\ No newline at end of file
+        ...
+    
+    async def reassign_author(self, from_uid: str, to_uid: str, to_display_name: str) -> int:
+        """Attribute every comment by `from_uid` to `to_uid`. Returns how many were changed."""
+        ...
@@ -1,24 +1,54 @@
 from __future__ import annotations
 
-from typing import Protocol, List, Tuple, Dict, Any, Optional
-from app.domain.entities.note import Note
+from typing import Protocol, List, Tuple, Dict, Any, Optional, Sequence, AsyncIterator
+from app.domain.entities.note import Author, Note, NoteView
+from app.domain.entities.note_access import NoteAccess, NoteVisibility
 
 
 class NotesRepository(Protocol):
-    async def list_public_notes(self, page: int, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
-        """Return list of public note dicts and pagination dict matching OpenAPI schema."""
+    async def list_public_notes(self, page: int, limit: int, view: NoteView = "full", fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Return list of public note dicts and pagination dict matching OpenAPI schema.
+
+        With view="summary" the dicts carry `excerpt`/`contentLength` instead of `content`.
+        With `fields` only those keys are returned (and, where possible, read from storage).
+        """
+        ...
+    
+    async def get_public_note(self, note_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        """Return a single public note dict by id or None (restricted to `fields` if given)."""
+        ...
+    
+    async def get_notes_by_owner(self, owner_uid: str, page: int, limit: int, view: NoteView = "full", fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Return list of user's note dicts and pagination dict (summaries with view="summary")."""
+        ...
+    
+    def iter_notes_by_owner(self, owner_uid: str, page_size: int = 100) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of the user's note dicts (newest first) without loading the whole notebook."""
+        ...
+    
+    async def list_note_ids_by_owner(self, owner_uid: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        """Return one page of note ids owned by `owner_uid` and an opaque cursor for the next page (None when done)."""
+        ...
+    
+    async def reassign_notes(self, note_ids: Sequence[str], from_uid: str, to_author: Author) -> int:
+        """Move the given notes from `from_uid` to `to_author`, skipping notes no longer owned by `from_uid`.
+        Returns how many notes were moved."""
+        ...
+    
+    async def get_note_by_owner(self, note_id: str, owner_uid: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        """Return a single note dict by id and owner or None (restricted to `fields` if given)."""
         ...
     
-    async def get_public_note(self, note_id: str) -> Optional[Dict[str, Any]]:
-        """Return a single public note dict by id or None."""
+    async def get_note_visibility(self, note_id: str) -> Optional[NoteVisibility]:
+        """Return the note's owner and public flag (key attributes only), or None if it does not exist."""
         ...
     
-    async def get_notes_by_owner(self, owner_uid: str, page: int, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
-        """Return list of user's note dicts and pagination dict."""
+    async def check_note_access(self, access: NoteAccess) -> bool:
+        """Return whether the note satisfies `access`, reading only its key attributes."""
         ...
     
-    async def get_note_by_owner(self, note_id: str, owner_uid: str) -> Optional[Dict[str, Any]]:
-        """Return a single note dict by id and owner or None."""
+    async def increment_comment_count(self, note_id: str) -> bool:
+        """Atomically add one to the note's comment count. Returns False if the note does not exist."""
         ...
     
     async def create_note(self, note: Note) -> None:
@@ -26,7 +56,7 @@ class NotesRepository(Protocol):
         ...
     
     async def update_note(self, note: Note) -> None:
-        """Update an existing note."""
+        """Update an existing note; raises ValueError if it no longer exists for its owner."""
         ...
     
     async def delete_note(self, note_id: str, owner_uid: str) -> bool:
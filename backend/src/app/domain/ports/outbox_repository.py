@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Protocol, List, Sequence
+
+from app.domain.entities.outbox_event import OutboxEvent
+
+
+class OutboxRepository(Protocol):
+    """Pending events written atomically with their source records (see CommentRepository.create_comment)."""
+
+    async def claim_pending(self, limit: int, lease_seconds: float) -> List[OutboxEvent]:
+        """Lease up to `limit` deliverable events, oldest first.
+
+        A claimed event is hidden from other claims for `lease_seconds`; if it is
+        neither marked delivered nor failed by then (e.g. the process died), it
+        becomes claimable again. Returned events have `attempts` already incremented.
+        """
+        ...
+
+    async def mark_delivered(self, event_ids: Sequence[str]) -> None:
+        """Remove delivered (or abandoned) events."""
+        ...
+
+    async def mark_failed(self, event_ids: Sequence[str], retry_after_seconds: float) -> None:
+        """Make failed events claimable again after `retry_after_seconds`."""
+        ...
+
+    async def pending_count(self) -> int:
+        """Number of undelivered events (for metrics; may be approximate)."""
+        ...
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional, Protocol
+
+from app.domain.entities.ownership_transfer import OwnershipTransfer
+
+
+class OwnershipTransferRepository(Protocol):
+    """Persisted ownership transfers, one per target uid.
+
+    A worker leases a transfer before running it, so one instance at a time
+    moves a given account's content; a lease that is not renewed (the
+    process froze or died) expires and another worker can take over.
+    """
+
+    async def get(self, to_uid: str) -> Optional[OwnershipTransfer]:
+        ...
+
+    async def put(self, transfer: OwnershipTransfer) -> bool:
+        """Create or replace the transfer for `transfer.to_uid` unless one is running.
+
+        Returns False, leaving the running transfer and its lease alone, when
+        there is one; a finished or failed record is replaced.
+        """
+        ...
+
+    async def acquire(
+        self, to_uid: str, worker_id: str, lease_seconds: float, retry_failed_before: datetime
+    ) -> Optional[OwnershipTransfer]:
+        """Lease an unfinished transfer and mark it running.
+
+        Succeeds for a running transfer whose lease is free, expired or already
+        held by `worker_id`, and for a failed one that finished before
+        `retry_failed_before`. Returns None otherwise.
+        """
+        ...
+
+    async def save_progress(self, transfer: OwnershipTransfer, worker_id: str, lease_seconds: Optional[float]) -> bool:
+        """Store progress if `worker_id` still holds the lease.
+
+        The lease is extended by `lease_seconds`, or released when it is None
+        (the run finished). Returns False when the lease was lost.
+        """
+        ...
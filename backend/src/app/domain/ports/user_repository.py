@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from typing import Protocol, Optional, Dict, Any
+from typing import Protocol, Optional, Dict, Any, Literal, Tuple
+
+
+# When create_or_patch may write: always, only if the profile does not exist yet,
+# or only if it is missing or still anonymous
+ProfileWriteCondition = Literal["always", "missing", "anonymous"]
+ProfileWriteOutcome = Literal["created", "updated", "unchanged"]
 
 
 class UserRepository(Protocol):
@@ -13,3 +19,14 @@ class UserRepository(Protocol):
     async def update(self, uid: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         ...
 
+    async def create_or_patch(
+        self,
+        uid: str,
+        patch: Dict[str, Any],
+        defaults: Optional[Dict[str, Any]] = None,
+        when: ProfileWriteCondition = "always",
+    ) -> Tuple[Dict[str, Any], ProfileWriteOutcome]:
+        """Create the profile from `defaults` + `patch`, or apply `patch` to the
+        existing one, in a single conditional write. `defaults` never overwrite
+        existing values. Returns the resulting profile and what happened."""
+        ...
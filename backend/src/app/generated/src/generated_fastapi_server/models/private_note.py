@@ -40,7 +40,8 @@ class PrivateNote(BaseModel):
     updated_at: datetime = Field(alias="updatedAt")
     published_at: Optional[datetime] = Field(default=None, description="When the note was published (if public)", alias="publishedAt")
     is_public: StrictBool = Field(description="Whether the note is public or private", alias="isPublic")
-    __properties: ClassVar[List[str]] = ["id", "title", "content", "createdAt", "updatedAt", "publishedAt", "isPublic"]
+    comment_count: Optional[Annotated[int, Field(strict=True, ge=0)]] = Field(default=None, description="Number of comments on the note", alias="commentCount")
+    __properties: ClassVar[List[str]] = ["id", "title", "content", "createdAt", "updatedAt", "publishedAt", "isPublic", "commentCount"]
 
     model_config = {
         "populate_by_name": True,
@@ -107,7 +108,8 @@ class PrivateNote(BaseModel):
             "createdAt": obj.get("createdAt"),
             "updatedAt": obj.get("updatedAt"),
             "publishedAt": obj.get("publishedAt"),
-            "isPublic": obj.get("isPublic")
+            "isPublic": obj.get("isPublic"),
+            "commentCount": obj.get("commentCount")
         })
         return _obj
 
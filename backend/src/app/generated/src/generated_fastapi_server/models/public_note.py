@@ -22,7 +22,7 @@ import json
 
 from datetime import datetime
 from pydantic import BaseModel, ConfigDict, Field, StrictStr
-from typing import Any, ClassVar, Dict, List
+from typing import Any, ClassVar, Dict, List, Optional
 from typing_extensions import Annotated
 from generated_fastapi_server.models.author import Author
 try:
@@ -41,7 +41,8 @@ class PublicNote(BaseModel):
     created_at: datetime = Field(alias="createdAt")
     updated_at: datetime = Field(alias="updatedAt")
     published_at: datetime = Field(alias="publishedAt")
-    __properties: ClassVar[List[str]] = ["id", "title", "content", "author", "createdAt", "updatedAt", "publishedAt"]
+    comment_count: Optional[Annotated[int, Field(strict=True, ge=0)]] = Field(default=None, description="Number of comments on the note", alias="commentCount")
+    __properties: ClassVar[List[str]] = ["id", "title", "content", "author", "createdAt", "updatedAt", "publishedAt", "commentCount"]
 
     model_config = {
         "populate_by_name": True,
@@ -101,7 +102,8 @@ class PublicNote(BaseModel):
             "author": Author.from_dict(obj.get("author")) if obj.get("author") is not None else None,
             "createdAt": obj.get("createdAt"),
             "updatedAt": obj.get("updatedAt"),
-            "publishedAt": obj.get("publishedAt")
+            "publishedAt": obj.get("publishedAt"),
+            "commentCount": obj.get("commentCount")
         })
         return _obj
 
@@ -0,0 +1,22 @@
+"""Stand-in CDN purger that only logs and records purge requests."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, List
+
+from app.domain.ports.cache_purger import CachePurger
+from app.shared.logger import get_logger
+
+
+class RecordingCachePurger(CachePurger):
+    """CachePurger used when no CDN is configured (local development, tests)."""
+
+    def __init__(self, max_recorded: int = 256) -> None:
+        # Only the latest requests are kept: the app-wide instance lives for the process
+        self.purged: Deque[List[str]] = deque(maxlen=max_recorded)
+        self._log = get_logger("app.cdn.purger")
+
+    async def purge(self, surrogate_keys: List[str]) -> None:
+        self.purged.append(list(surrogate_keys))
+        self._log.info("cdn.purge", extra={"surrogateKeys": surrogate_keys})
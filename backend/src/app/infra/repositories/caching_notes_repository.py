@@ -0,0 +1,113 @@
+"""Note visibility cache in front of any NotesRepository."""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from app.domain.entities.note import Author, Note, NoteView
+from app.domain.entities.note_access import NoteAccess, NoteVisibility
+from app.domain.ports.notes_repository import NotesRepository
+from app.shared.ttl_cache import TTLCache
+
+
+class CachingNotesRepository(NotesRepository):
+    """Serves visibility checks from a bounded TTL/LRU cache of note id -> (owner, is_public).
+
+    Comment listings authorize every request against the parent note; with
+    this cache a polling client costs one projected read per TTL instead of
+    one per request. Everything else is passed through to the wrapped
+    repository.
+
+    Every write through this repository (create, update, delete, publish,
+    unpublish, reassign) drops the note's entry, so this instance never
+    serves a stale answer after its own writes; other instances converge
+    within the TTL. Missing notes are cached too: note ids are generated at
+    creation, so a miss cannot turn into a hit except through `create_note`.
+
+    Entries carry the write version current when they were loaded. A load
+    that overlaps a write is not stored, so a read racing a publish cannot
+    put the old visibility back.
+    """
+
+    def __init__(self, inner: NotesRepository, max_entries: int = 10000, ttl_seconds: float = 30.0) -> None:
+        self._inner = inner
+        self._cache: TTLCache[str, Tuple[Optional[NoteVisibility], int]] = TTLCache(max_entries, ttl_seconds)
+        # Bumped on every local write
+        self._version = 0
+
+    def invalidate(self, note_id: str) -> None:
+        """Drop a cached visibility (e.g. when another instance changed the note)."""
+        self._version += 1
+        self._cache.pop(note_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), "version": self._version}
+
+    async def get_note_visibility(self, note_id: str) -> Optional[NoteVisibility]:
+        cached = self._cache.get(note_id)
+        if cached is not None:
+            return cached[0]
+        version = self._version
+        visibility = await self._inner.get_note_visibility(note_id)
+        if self._version == version:
+            self._cache.set(note_id, (visibility, version))
+        return visibility
+
+    async def check_note_access(self, access: NoteAccess) -> bool:
+        visibility = await self.get_note_visibility(access.note_id)
+        return visibility is not None and visibility.allows(access)
+
+    # Writes: pass through, then invalidate
+
+    async def create_note(self, note: Note) -> None:
+        await self._inner.create_note(note)
+        self.invalidate(note.id)
+
+    async def update_note(self, note: Note) -> None:
+        await self._inner.update_note(note)
+        self.invalidate(note.id)
+
+    async def delete_note(self, note_id: str, owner_uid: str) -> bool:
+        deleted = await self._inner.delete_note(note_id, owner_uid)
+        self.invalidate(note_id)
+        return deleted
+
+    async def publish_note(self, note_id: str, owner_uid: str) -> bool:
+        published = await self._inner.publish_note(note_id, owner_uid)
+        self.invalidate(note_id)
+        return published
+
+    async def unpublish_note(self, note_id: str, owner_uid: str) -> bool:
+        unpublished = await self._inner.unpublish_note(note_id, owner_uid)
+        self.invalidate(note_id)
+        return unpublished
+
+    async def reassign_notes(self, note_ids: Sequence[str], from_uid: str, to_author: Author) -> int:
+        moved = await self._inner.reassign_notes(note_ids, from_uid, to_author)
+        for note_id in note_ids:
+            self.invalidate(note_id)
+        return moved
+
+    async def increment_comment_count(self, note_id: str) -> bool:
+        # The count is not part of the cached visibility
+        return await self._inner.increment_comment_count(note_id)
+
+    # Reads: pass through
+
+    async def list_public_notes(self, page: int, limit: int, view: NoteView = "full", fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        return await self._inner.list_public_notes(page, limit, view=view, fields=fields)
+
+    async def get_public_note(self, note_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        return await self._inner.get_public_note(note_id, fields=fields)
+
+    async def get_notes_by_owner(self, owner_uid: str, page: int, limit: int, view: NoteView = "full", fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        return await self._inner.get_notes_by_owner(owner_uid, page, limit, view=view, fields=fields)
+
+    def iter_notes_by_owner(self, owner_uid: str, page_size: int = 100) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self._inner.iter_notes_by_owner(owner_uid, page_size=page_size)
+
+    async def list_note_ids_by_owner(self, owner_uid: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        return await self._inner.list_note_ids_by_owner(owner_uid, limit, cursor=cursor)
+
+    async def get_note_by_owner(self, note_id: str, owner_uid: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        return await self._inner.get_note_by_owner(note_id, owner_uid, fields=fields)
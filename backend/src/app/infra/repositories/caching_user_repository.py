@@ -0,0 +1,98 @@
+"""Read-through / write-through cache in front of any UserRepository."""
+
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.domain.ports.user_repository import (
+    ProfileWriteCondition,
+    ProfileWriteOutcome,
+    UserRepository,
+)
+from app.shared.logger import get_logger
+from app.shared.ttl_cache import TTLCache
+
+
+# Called with the uid after every local write, e.g. to publish an invalidation
+# message so other instances drop their copy
+InvalidationHook = Callable[[str], Awaitable[None]]
+
+
+class CachingUserRepository(UserRepository):
+    """Serves profile reads from a bounded TTL/LRU cache.
+
+    Writes go to the wrapped repository first and the returned profile replaces
+    the cached entry, so this instance never serves a stale profile after its own
+    writes. Other instances converge through `invalidate()` (driven by the
+    invalidation hooks) or, at the latest, when the TTL runs out.
+    """
+
+    def __init__(
+        self,
+        inner: UserRepository,
+        max_entries: int = 1000,
+        ttl_seconds: float = 60.0,
+        invalidation_hooks: Sequence[InvalidationHook] = (),
+    ) -> None:
+        self._inner = inner
+        self._cache: TTLCache[str, Dict[str, Any]] = TTLCache(max_entries, ttl_seconds)
+        self._hooks: List[InvalidationHook] = list(invalidation_hooks)
+        self._log = get_logger("app.repo.users.cache")
+
+    def add_invalidation_hook(self, hook: InvalidationHook) -> None:
+        self._hooks.append(hook)
+
+    def invalidate(self, uid: str) -> None:
+        """Drop a cached profile (e.g. when another instance changed it)."""
+        self._cache.pop(uid)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+    async def get(self, uid: str) -> Optional[Dict[str, Any]]:
+        cached = self._cache.get(uid)
+        if cached is not None:
+            return dict(cached)
+        profile = await self._inner.get(uid)
+        # Missing profiles are not cached: they are created right after the miss
+        if profile is not None:
+            self._cache.set(uid, dict(profile))
+        return profile
+
+    async def upsert(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        saved = await self._inner.upsert(profile)
+        await self._written(saved["uid"], saved)
+        return saved
+
+    async def update(self, uid: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        updated = await self._inner.update(uid, patch)
+        await self._written(uid, updated)
+        return updated
+
+    async def create_or_patch(
+        self,
+        uid: str,
+        patch: Dict[str, Any],
+        defaults: Optional[Dict[str, Any]] = None,
+        when: ProfileWriteCondition = "always",
+    ) -> Tuple[Dict[str, Any], ProfileWriteOutcome]:
+        profile, outcome = await self._inner.create_or_patch(uid, patch, defaults, when)
+        if outcome == "unchanged":
+            # Nothing was written, but the returned item is current
+            if profile:
+                self._cache.set(uid, dict(profile))
+        else:
+            await self._written(uid, profile)
+        return profile, outcome
+
+    async def _written(self, uid: str, profile: Optional[Dict[str, Any]]) -> None:
+        if profile:
+            self._cache.set(uid, dict(profile))
+        else:
+            self._cache.pop(uid)
+        for hook in self._hooks:
+            try:
+                await hook(uid)
+            except Exception as exc:
+                # Peers fall back to the TTL; never fail the write over this
+                self._log.warning("cache.invalidation_hook_failed", extra={"uid": uid, "error": str(exc)})
@@ -0,0 +1,569 @@
+"""DynamoDB implementation of comment repository."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+from app.domain.entities.comment import Comment
+from app.domain.entities.note_access import NoteAccess, NoteNotAccessibleError
+from app.domain.entities.outbox_event import OutboxEvent
+from app.domain.ports.comment_repository import CommentRepository
+from app.infra.repositories.dynamodb_notes_repository import comment_count_update
+from app.infra.repositories.dynamodb_outbox_repository import outbox_event_to_item
+from app.shared.logger import get_logger
+
+
+# Sort key of a note's index item in the pages table (buckets count from 0)
+PAGE_INDEX = -1
+# Buckets sealed per write at most, so an existing thread is caught up over a few writes
+MAX_SEALS_PER_WRITE = 4
+# A bucket item must stay under DynamoDB's 400 KB item limit. 64 comments of
+# 1000 four-byte characters plus their attributes fit in BUCKET_MAX_BYTES, which
+# leaves room for keys and author names longer than usual
+MAX_PAGE_BUCKET_SIZE = 64
+BUCKET_MAX_BYTES = 350 * 1024
+# How long a note's sealing stays paused after a bucket could not be written
+SEAL_RETRY_SECONDS = 3600
+
+
+def _bucket_bytes(items: List[Dict[str, Any]]) -> int:
+    """Approximate stored size of a bucket's comment copies (names plus string values)."""
+    return sum(len(name) + len(str(value).encode()) + 1 for item in items for name, value in item.items())
+
+
+class DynamoDBCommentRepository(CommentRepository):
+    """Comments table keyed by `id`, with NoteIndex (note_id, created_at) and AuthorIndex (author_uid).
+
+    With a pages table and a bucket size, comment listing reads pre-built
+    pages: every `page_bucket_size` comments of a note are sealed, oldest
+    first, into one bucket item (note_id, bucket) holding copies of them.
+    The note's index item (bucket -1) lists the last `created_at` of each
+    sealed bucket. Comments after the last boundary form the open bucket and
+    are read from NoteIndex as before, so a page of the sealed history costs
+    one or two item reads however long the thread is. A comment write pays
+    no extra round trip: counting it into the open bucket (and sealing) runs
+    in the background. The comments table stays the source of truth.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        outbox_table_name: Optional[str] = None,
+        notes_table_name: Optional[str] = None,
+        pages_table_name: Optional[str] = None,
+        page_bucket_size: int = 0,
+        seal_settle_seconds: float = 5.0,
+        endpoint_url: Optional[str] = None,
+        region_name: str = "ap-northeast-1",
+        aws_access_key_id: Optional[str] = None,
+        aws_secret_access_key: Optional[str] = None,
+    ):
+        """Initialize DynamoDB comment repository."""
+        if pages_table_name and not 0 <= page_bucket_size <= MAX_PAGE_BUCKET_SIZE:
+            raise ValueError(f"page_bucket_size must be between 0 and {MAX_PAGE_BUCKET_SIZE}")
+        self.table_name = table_name
+        self.outbox_table_name = outbox_table_name
+        self.notes_table_name = notes_table_name
+        self.pages_table_name = pages_table_name
+        self.page_bucket_size = page_bucket_size if pages_table_name else 0
+        # A bucket is sealed once its newest comment is this old
+        self.seal_settle_seconds = seal_settle_seconds
+        self._log = get_logger("app.repo.comments.dynamodb")
+        # Comments written per note whose page bookkeeping is still to do, and
+        # the background task doing it (one per note, so bursts share a write)
+        self._unpaged: Dict[str, int] = {}
+        self._paging: Dict[str, asyncio.Task] = {}
+
+        session_kwargs = {"region_name": region_name}
+        if aws_access_key_id and aws_secret_access_key:
+            session_kwargs.update({
+                "aws_access_key_id": aws_access_key_id,
+                "aws_secret_access_key": aws_secret_access_key,
+            })
+        session = boto3.Session(**session_kwargs)
+
+        dynamodb_kwargs = {}
+        if endpoint_url:
+            dynamodb_kwargs["endpoint_url"] = endpoint_url
+
+        self.dynamodb = session.resource("dynamodb", **dynamodb_kwargs)
+        self.table = self.dynamodb.Table(table_name)
+        self.pages_table = self.dynamodb.Table(pages_table_name) if self.page_bucket_size else None
+
+    def _comment_to_item(self, comment: Comment) -> Dict[str, Any]:
+        return {
+            "id": comment.id,
+            "note_id": comment.note_id,
+            "content": comment.content,
+            "author_uid": comment.author_uid,
+            "author_display_name": comment.author_display_name,
+            "author_avatar_url": comment.author_avatar_url or "",
+            "created_at": comment.created_at.isoformat(),
+            "updated_at": comment.updated_at.isoformat(),
+        }
+
+    def _item_to_comment(self, item: Dict[str, Any]) -> Comment:
+        return Comment(
+            id=item["id"],
+            content=item["content"],
+            note_id=item["note_id"],
+            author_uid=item["author_uid"],
+            author_display_name=item["author_display_name"],
+            author_avatar_url=item.get("author_avatar_url") or None,
+            created_at=datetime.fromisoformat(item["created_at"]),
+            updated_at=datetime.fromisoformat(item["updated_at"]),
+        )
+
+    async def list_comments_by_note(self, note_id: str, page: int, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Return list of comment dicts for a note (oldest first) and pagination dict."""
+        if self.page_bucket_size:
+            return await self._list_comments_from_pages(note_id, page, limit)
+        try:
+            items: List[Dict[str, Any]] = []
+            query_kwargs: Dict[str, Any] = {
+                "IndexName": "NoteIndex",
+                "KeyConditionExpression": Key("note_id").eq(note_id),
+                "ScanIndexForward": True,
+            }
+            while True:
+                # Off the event loop, so it can overlap the note access check
+                response = await asyncio.to_thread(self.table.query, **query_kwargs)
+                items.extend(response.get("Items", []))
+                if "LastEvaluatedKey" not in response:
+                    break
+                query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+            total = len(items)
+            start = (page - 1) * limit
+            end = start + limit
+            comments = [self._item_to_comment(item).to_dict() for item in items[start:end]]
+
+            pagination = {
+                "page": page,
+                "limit": limit,
+                "total": total,
+                "hasNext": end < total,
+                "hasPrev": start > 0,
+            }
+            return comments, pagination
+
+        except ClientError as e:
+            raise RuntimeError(f"Failed to list comments: {e}")
+
+    async def _list_comments_from_pages(self, note_id: str, page: int, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """`list_comments_by_note` from sealed buckets plus the open bucket.
+
+        The page's slice of the sealed history is read by key; the open bucket
+        is queried only when the page reaches it, and counted otherwise.
+        """
+        size = self.page_bucket_size
+        start = (page - 1) * limit
+        end = start + limit
+        try:
+            boundaries = (await asyncio.to_thread(self._page_index, note_id)).get("boundaries", [])
+            sealed_total = len(boundaries) * size
+            after = boundaries[-1] if boundaries else None
+            first = start // size
+            numbers = list(range(first, (min(end, sealed_total) - 1) // size + 1)) if start < sealed_total else []
+            if end > sealed_total:
+                buckets, open_items = await asyncio.gather(
+                    asyncio.to_thread(self._get_buckets, note_id, numbers),
+                    asyncio.to_thread(self._open_items, note_id, after),
+                )
+                open_count = len(open_items)
+            else:
+                buckets, open_count = await asyncio.gather(
+                    asyncio.to_thread(self._get_buckets, note_id, numbers),
+                    asyncio.to_thread(self._count_open, note_id, after),
+                )
+                open_items = []
+        except ClientError as e:
+            raise RuntimeError(f"Failed to list comments: {e}")
+
+        sealed = [item for bucket in buckets for item in bucket]
+        offset = first * size
+        items = sealed[start - offset:end - offset] + open_items[max(0, start - sealed_total):max(0, end - sealed_total)]
+        total = sealed_total + open_count
+        pagination = {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "hasNext": end < total,
+            "hasPrev": start > 0,
+        }
+        return [self._item_to_comment(item).to_dict() for item in items], pagination
+
+    def _page_index(self, note_id: str, consistent: bool = False) -> Dict[str, Any]:
+        response = self.pages_table.get_item(Key={"note_id": note_id, "bucket": PAGE_INDEX}, ConsistentRead=consistent)
+        return response.get("Item") or {}
+
+    def _get_buckets(self, note_id: str, numbers: List[int]) -> List[List[Dict[str, Any]]]:
+        """Comment items of the given sealed buckets, in order."""
+        if not numbers:
+            return []
+        found: Dict[int, List[Dict[str, Any]]] = {}
+        request: Dict[str, Any] = {
+            self.pages_table_name: {"Keys": [{"note_id": note_id, "bucket": number} for number in numbers]}
+        }
+        while request:
+            response = self.dynamodb.batch_get_item(RequestItems=request)
+            for item in response.get("Responses", {}).get(self.pages_table_name, []):
+                found[int(item["bucket"])] = item["comments"]
+            request = response.get("UnprocessedKeys") or {}
+        missing = [number for number in numbers if number not in found]
+        if missing:
+            raise RuntimeError(f"Comment page buckets {missing} of note {note_id} are missing")
+        return [found[number] for number in numbers]
+
+    def _open_query(self, note_id: str, after: Optional[str]) -> Dict[str, Any]:
+        key = Key("note_id").eq(note_id)
+        if after is not None:
+            key = key & Key("created_at").gt(after)
+        return {"IndexName": "NoteIndex", "KeyConditionExpression": key, "ScanIndexForward": True}
+
+    def _open_items(self, note_id: str, after: Optional[str], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Comment items after the last sealed boundary `after`, oldest first."""
+        query_kwargs = self._open_query(note_id, after)
+        if limit is not None:
+            query_kwargs["Limit"] = limit
+        items: List[Dict[str, Any]] = []
+        while limit is None or len(items) < limit:
+            response = self.table.query(**query_kwargs)
+            items.extend(response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                break
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        return items if limit is None else items[:limit]
+
+    def _count_open(self, note_id: str, after: Optional[str]) -> int:
+        query_kwargs = {**self._open_query(note_id, after), "Select": "COUNT"}
+        count = 0
+        while True:
+            response = self.table.query(**query_kwargs)
+            count += response.get("Count", 0)
+            if "LastEvaluatedKey" not in response:
+                return count
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def _schedule_paging(self, note_id: str) -> None:
+        """Count a stored comment towards its note's open bucket, off the request path.
+
+        The counter update (and any sealing it triggers) runs in a background
+        task per note; comments arriving meanwhile are added in one update
+        when it comes round again. Counts still pending when the process dies
+        are lost, which only delays sealing (it reads the comments themselves).
+        """
+        self._unpaged[note_id] = self._unpaged.get(note_id, 0) + 1
+        if note_id not in self._paging:
+            self._paging[note_id] = asyncio.create_task(self._update_pages(note_id))
+
+    async def _update_pages(self, note_id: str) -> None:
+        try:
+            while count := self._unpaged.pop(note_id, 0):
+                await asyncio.to_thread(self._note_written, note_id, count)
+        except Exception as e:
+            self._log.warning("comment_pages.update_failed", extra={"note_id": note_id, "error": str(e)})
+        finally:
+            self._paging.pop(note_id, None)
+
+    async def flush_page_updates(self) -> None:
+        """Wait for pending page bookkeeping (app shutdown, tests)."""
+        while self._paging:
+            await asyncio.gather(*list(self._paging.values()))
+
+    def _note_written(self, note_id: str, count: int = 1) -> None:
+        """Count new comments into the note's open bucket and seal it once full.
+
+        Runs after the comments are stored, so a failure here only delays
+        sealing: unsealed comments are still listed from NoteIndex. After a
+        bucket could not be written, the note's sealing pauses until
+        `seal_retry_at` instead of being retried on every write.
+        """
+        try:
+            response = self.pages_table.update_item(
+                Key={"note_id": note_id, "bucket": PAGE_INDEX},
+                UpdateExpression="ADD open_count :count",
+                ExpressionAttributeValues={":count": count},
+                ReturnValues="ALL_NEW",
+            )
+            index = response["Attributes"]
+            if index["open_count"] >= self.page_bucket_size and index.get("seal_retry_at", 0) <= time.time():
+                self._seal_buckets(note_id, index)
+        except ClientError as e:
+            self._log.warning("comment_pages.seal_failed", extra={"note_id": note_id, "error": str(e)})
+
+    def _pause_sealing(self, note_id: str, bucket: int, reason: str) -> None:
+        """Record on the index item that `bucket` could not be sealed, pausing sealing for the note."""
+        self._log.error(
+            "comment_pages.seal_paused",
+            extra={"note_id": note_id, "bucket": bucket, "reason": reason, "retry_seconds": SEAL_RETRY_SECONDS},
+        )
+        self.pages_table.update_item(
+            Key={"note_id": note_id, "bucket": PAGE_INDEX},
+            UpdateExpression="SET seal_retry_at = :retry, seal_error = :reason",
+            ExpressionAttributeValues={":retry": int(time.time()) + SEAL_RETRY_SECONDS, ":reason": reason},
+        )
+
+    def _seal_buckets(self, note_id: str, index: Dict[str, Any]) -> None:
+        """Seal the oldest full buckets of the note's open range.
+
+        `index` is the note's index item as just updated (so it is current).
+        A bucket is sealed only when its newest comment is `seal_settle_seconds`
+        old, so a comment that reaches NoteIndex late cannot fall before a
+        sealed boundary. Each seal writes the bucket and appends its boundary
+        in one transaction conditioned on the boundary count, so concurrent
+        writers seal a bucket once. `open_count` is reset to what is left; it
+        only decides when the next write tries again. A bucket too large for
+        one item pauses sealing (see `_pause_sealing`); its comments stay in
+        the open bucket.
+        """
+        size = self.page_bucket_size
+        boundaries = index.get("boundaries", [])
+        after = boundaries[-1] if boundaries else None
+        items = self._open_items(note_id, after, limit=size * MAX_SEALS_PER_WRITE + 1)
+        truncated = len(items) > size * MAX_SEALS_PER_WRITE
+        settled = (datetime.now(timezone.utc) - timedelta(seconds=self.seal_settle_seconds)).isoformat()
+        client = self.dynamodb.meta.client
+        sealed = 0
+        while sealed < MAX_SEALS_PER_WRITE and len(items) - sealed * size >= size:
+            bucket = items[sealed * size:(sealed + 1) * size]
+            boundary = bucket[-1]["created_at"]
+            if boundary > settled:
+                break
+            number = len(boundaries) + sealed
+            if _bucket_bytes(bucket) > BUCKET_MAX_BYTES:
+                self._pause_sealing(note_id, number, "bucket too large")
+                return
+            remaining = len(items) - (sealed + 1) * size
+            try:
+                client.transact_write_items(
+                    TransactItems=[
+                        {
+                            "Put": {
+                                "TableName": self.pages_table_name,
+                                "Item": {
+                                    "note_id": note_id,
+                                    "bucket": number,
+                                    "comments": bucket,
+                                    "first_created_at": bucket[0]["created_at"],
+                                    "last_created_at": boundary,
+                                },
+                                "ConditionExpression": "attribute_not_exists(note_id)",
+                            }
+                        },
+                        {
+                            "Update": {
+                                "TableName": self.pages_table_name,
+                                "Key": {"note_id": note_id, "bucket": PAGE_INDEX},
+                                "UpdateExpression": "SET #boundaries = list_append(if_not_exists(#boundaries, :empty), :boundary), #open = :open",
+                                "ConditionExpression": "attribute_not_exists(#boundaries) OR size(#boundaries) = :sealed",
+                                "ExpressionAttributeNames": {"#boundaries": "boundaries", "#open": "open_count"},
+                                "ExpressionAttributeValues": {
+                                    ":empty": [],
+                                    ":boundary": [boundary],
+                                    # Past the queried range, keep the next write sealing
+                                    ":open": max(remaining, size) if truncated else remaining,
+                                    ":sealed": number,
+                                },
+                            }
+                        },
+                    ]
+                )
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code")
+                if code == "TransactionCanceledException":
+                    return  # another writer sealed it first
+                if code == "ValidationException":
+                    # Rejected as a whole (e.g. over the item size limit): retrying won't help soon
+                    self._pause_sealing(note_id, number, str(e))
+                    return
+                raise
+            sealed += 1
+
+    async def list_comments_since(self, note_id: str, since: datetime, limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Return comments created after `since` (oldest first) and whether more follow.
+
+        A range query on NoteIndex (`created_at > since`), so the cost is the
+        number of new comments rather than the whole thread. `created_at` is
+        stored as UTC ISO-8601, which orders the same as a string.
+        """
+        after = since.astimezone(timezone.utc).isoformat()
+        items: List[Dict[str, Any]] = []
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": "NoteIndex",
+            "KeyConditionExpression": Key("note_id").eq(note_id) & Key("created_at").gt(after),
+            "ScanIndexForward": True,
+            # One extra item tells whether there is more
+            "Limit": limit + 1,
+        }
+        try:
+            while len(items) <= limit:
+                response = await asyncio.to_thread(self.table.query, **query_kwargs)
+                items.extend(response.get("Items", []))
+                if "LastEvaluatedKey" not in response:
+                    break
+                query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        except ClientError as e:
+            raise RuntimeError(f"Failed to list comments: {e}")
+        comments = [self._item_to_comment(item).to_dict() for item in items[:limit]]
+        return comments, len(items) > limit
+
+    async def create_comment(
+        self,
+        comment: Comment,
+        outbox_event: Optional[OutboxEvent] = None,
+        note_access: Optional[NoteAccess] = None,
+    ) -> Dict[str, Any]:
+        """Create a new comment.
+
+        The outbox event (if any) and the note access check go in the same
+        TransactWriteItems call, so the whole create is one round trip. The
+        access check is a conditional Update that also adds one to the note's
+        `comment_count`, so the count moves exactly with the comments.
+        """
+        item = self._comment_to_item(comment)
+        transact_items: List[Dict[str, Any]] = [
+            {
+                "Put": {
+                    "TableName": self.table_name,
+                    "Item": item,
+                    "ConditionExpression": "attribute_not_exists(id)",
+                }
+            }
+        ]
+        if outbox_event is not None:
+            if not self.outbox_table_name:
+                raise RuntimeError("Outbox event given but no outbox table is configured")
+            transact_items.append(
+                {
+                    "Put": {
+                        "TableName": self.outbox_table_name,
+                        "Item": outbox_event_to_item(outbox_event),
+                        "ConditionExpression": "attribute_not_exists(id)",
+                    }
+                }
+            )
+        access_index: Optional[int] = None
+        if note_access is not None:
+            if not self.notes_table_name:
+                raise RuntimeError("Note access check given but no notes table is configured")
+            access_index = len(transact_items)
+            transact_items.append(
+                {
+                    "Update": {
+                        "TableName": self.notes_table_name,
+                        **comment_count_update(note_access),
+                    }
+                }
+            )
+
+        try:
+            if len(transact_items) == 1:
+                self.table.put_item(Item=item, ConditionExpression="attribute_not_exists(id)")
+            else:
+                # The resource's client serializes plain Python values itself
+                self.table.meta.client.transact_write_items(TransactItems=transact_items)
+
+        except ClientError as e:
+            if access_index is not None and e.response.get("Error", {}).get("Code") == "TransactionCanceledException":
+                reasons = e.response.get("CancellationReasons") or []
+                if len(reasons) > access_index and reasons[access_index].get("Code") == "ConditionalCheckFailed":
+                    raise NoteNotAccessibleError(note_access)
+            raise RuntimeError(f"Failed to create comment: {e}")
+
+        if self.page_bucket_size:
+            self._schedule_paging(comment.note_id)
+        return comment.to_dict()
+
+    async def get_comment(self, comment_id: str) -> Optional[Dict[str, Any]]:
+        """Return a single comment dict by id or None."""
+        try:
+            response = self.table.get_item(Key={"id": comment_id})
+            item = response.get("Item")
+            return self._item_to_comment(item).to_dict() if item else None
+        except ClientError as e:
+            raise RuntimeError(f"Failed to get comment: {e}")
+
+    async def reassign_author(self, from_uid: str, to_uid: str, to_display_name: str, concurrency: int = 8) -> int:
+        """Attribute every comment by `from_uid` to `to_uid` (conditional per item, so re-runs are safe)."""
+        client = self.table.meta.client
+        semaphore = asyncio.Semaphore(concurrency)
+
+        comment_ids: List[str] = []
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": "AuthorIndex",
+            "KeyConditionExpression": Key("author_uid").eq(from_uid),
+            "ProjectionExpression": "id",
+        }
+        try:
+            while True:
+                response = self.table.query(**query_kwargs)
+                comment_ids.extend(item["id"] for item in response.get("Items", []))
+                if "LastEvaluatedKey" not in response:
+                    break
+                query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        except ClientError as e:
+            raise RuntimeError(f"Failed to list comments by author: {e}")
+
+        def move(comment_id: str) -> Optional[Dict[str, Any]]:
+            try:
+                response = client.update_item(
+                    TableName=self.table_name,
+                    Key={"id": comment_id},
+                    UpdateExpression="SET #author = :to, #name = :name",
+                    ConditionExpression="#author = :from",
+                    ExpressionAttributeNames={"#author": "author_uid", "#name": "author_display_name"},
+                    ExpressionAttributeValues={
+                        ":to": to_uid,
+                        ":from": from_uid,
+                        ":name": to_display_name,
+                    },
+                    ReturnValues="ALL_NEW",
+                )
+                return response["Attributes"]
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                    return None
+                raise RuntimeError(f"Failed to reassign comment: {e}")
+
+        async def bounded(comment_id: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.to_thread(move, comment_id)
+
+        results = await asyncio.gather(*(bounded(comment_id) for comment_id in comment_ids))
+        moved = [item for item in results if item is not None]
+        if moved and self.page_bucket_size:
+            await asyncio.to_thread(self._reassign_in_buckets, moved, from_uid, to_uid, to_display_name)
+        return len(moved)
+
+    def _reassign_in_buckets(self, moved: List[Dict[str, Any]], from_uid: str, to_uid: str, to_display_name: str) -> None:
+        """Rewrite the sealed buckets holding moved comments (their copies keep the old author)."""
+        created_by_note: Dict[str, List[str]] = {}
+        for item in moved:
+            created_by_note.setdefault(item["note_id"], []).append(item["created_at"])
+        try:
+            for note_id, created in created_by_note.items():
+                boundaries = self._page_index(note_id, consistent=True).get("boundaries", [])
+                # Bucket n holds (boundaries[n - 1], boundaries[n]]; past the last one is the open bucket
+                numbers = {bisect_left(boundaries, created_at) for created_at in created} - {len(boundaries)}
+                for number in sorted(numbers):
+                    bucket = self.pages_table.get_item(
+                        Key={"note_id": note_id, "bucket": number}, ConsistentRead=True
+                    ).get("Item")
+                    if bucket is None:
+                        continue
+                    for comment in bucket["comments"]:
+                        if comment["author_uid"] == from_uid:
+                            comment["author_uid"] = to_uid
+                            comment["author_display_name"] = to_display_name
+                    self.pages_table.put_item(Item=bucket)
+        except ClientError as e:
+            raise RuntimeError(f"Failed to reassign comment: {e}")
@@ -2,16 +2,124 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 from datetime import datetime, timezone
-from typing import List, Tuple, Dict, Any, Optional
+from typing import List, Tuple, Dict, Any, Optional, Sequence, AsyncIterator
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
 
-from app.domain.entities.note import Note, Author
+from app.domain.entities.note import Note, Author, NoteView
+from app.domain.entities.note_access import NoteAccess, NoteVisibility
 from app.domain.ports.notes_repository import NotesRepository
 
 
+# Attributes read for view="summary"; the (large) content attribute is never fetched
+SUMMARY_ATTRIBUTES = (
+    "id",
+    "title",
+    "excerpt",
+    "content_length",
+    "comment_count",
+    "author_id",
+    "author_name",
+    "author_avatar_url",
+    "created_at",
+    "updated_at",
+    "published_at",
+    "owner_uid",
+    "is_public",
+)
+
+
+# Small attributes always read with a sparse fieldset: enough to rebuild the
+# entity and to check visibility/ownership without fetching the content
+CORE_ATTRIBUTES = (
+    "id",
+    "title",
+    "author_id",
+    "author_name",
+    "created_at",
+    "updated_at",
+    "published_at",
+    "owner_uid",
+    "is_public",
+)
+
+# Attributes a visibility/ownership check needs
+ACCESS_ATTRIBUTES = ("id", "owner_uid", "is_public")
+
+
+def note_access_condition(access: NoteAccess) -> Dict[str, Any]:
+    """Condition expression kwargs that hold when the note item satisfies `access`.
+
+    Guards note updates made inside other tables' writes (see `comment_count_update`).
+    """
+    if access.owner_uid is None:
+        return {
+            "ConditionExpression": "#is_public = :true",
+            "ExpressionAttributeNames": {"#is_public": "is_public"},
+            "ExpressionAttributeValues": {":true": "true"},
+        }
+    return {
+        "ConditionExpression": "#owner = :owner",
+        "ExpressionAttributeNames": {"#owner": "owner_uid"},
+        "ExpressionAttributeValues": {":owner": access.owner_uid},
+    }
+
+
+def comment_count_update(access: NoteAccess) -> Dict[str, Any]:
+    """Update kwargs that add one to the note's comment count while it satisfies `access`.
+
+    Used in the comment write's transaction in place of a bare ConditionCheck
+    (a transaction may touch the note item only once).
+    """
+    condition = note_access_condition(access)
+    return {
+        "Key": {"id": access.note_id},
+        "UpdateExpression": "ADD #comment_count :one",
+        "ConditionExpression": condition["ConditionExpression"],
+        "ExpressionAttributeNames": {**condition["ExpressionAttributeNames"], "#comment_count": "comment_count"},
+        "ExpressionAttributeValues": {**condition["ExpressionAttributeValues"], ":one": 1},
+    }
+
+
+# API field -> item attributes it is built from
+FIELD_ATTRIBUTES: Dict[str, Tuple[str, ...]] = {
+    "content": ("content",),
+    "excerpt": ("excerpt",),
+    "contentLength": ("content_length",),
+    "commentCount": ("comment_count",),
+    "author": ("author_avatar_url",),
+}
+
+
+def _projection(attributes: Sequence[str]) -> Dict[str, Any]:
+    """Build ProjectionExpression kwargs, aliasing every name to dodge reserved words."""
+    names = {f"#p{i}": attr for i, attr in enumerate(attributes)}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+
+
+def _projection_for(view: NoteView = "full", fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Projection kwargs for a read; empty when the whole item is needed."""
+    if fields:
+        attributes = list(CORE_ATTRIBUTES)
+        for field in fields:
+            for attr in FIELD_ATTRIBUTES.get(field, ()):
+                if attr == "content" and view == "summary":
+                    continue
+                if attr not in attributes:
+                    attributes.append(attr)
+        return _projection(attributes)
+    if view == "summary":
+        return _projection(SUMMARY_ATTRIBUTES)
+    return {}
+
+
 class DynamoDBNotesRepository(NotesRepository):
     """DynamoDB implementation of NotesRepository."""
     
@@ -44,14 +152,16 @@ class DynamoDBNotesRepository(NotesRepository):
         self.dynamodb = session.resource("dynamodb", **dynamodb_kwargs)
         self.table = self.dynamodb.Table(table_name)
     
-    async def list_public_notes(self, page: int, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    async def list_public_notes(self, page: int, limit: int, view: NoteView = "full", fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """Return list of public note dicts and pagination dict matching OpenAPI schema."""
         try:
             # Query using PublicNotesIndex GSI
+            query_kwargs = _projection_for(view, fields)
             response = self.table.query(
                 IndexName="PublicNotesIndex",
                 KeyConditionExpression=Key("is_public").eq("true"),
                 ScanIndexForward=False,  # Sort by published_at descending
+                **query_kwargs,
             )
             items = response.get("Items", [])
             
@@ -65,7 +175,7 @@ class DynamoDBNotesRepository(NotesRepository):
             page_notes = notes[start:end]
             
             # Convert to dict format
-            note_dicts = [n.to_public_dict() for n in page_notes]
+            note_dicts = [n.to_public_view(view, fields) for n in page_notes]
             
             pagination = {
                 "page": page,
@@ -80,22 +190,26 @@ class DynamoDBNotesRepository(NotesRepository):
         except ClientError as e:
             raise RuntimeError(f"Failed to list public notes: {e}")
     
-    async def get_public_note(self, note_id: str) -> Optional[Dict[str, Any]]:
+    async def get_public_note(self, note_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
         """Return a single public note dict by id or None."""
         try:
-            response = self.table.get_item(Key={"id": note_id})
+            response = self.table.get_item(Key={"id": note_id}, **_projection_for(fields=fields))
             item = response.get("Item")
             if not item or item.get("is_public") != "true":
                 return None
             
             note = self._item_to_note(item)
-            return note.to_public_dict()
+            return note.to_public_view(fields=fields)
             
         except ClientError as e:
             raise RuntimeError(f"Failed to get public note: {e}")
     
     def _item_to_note(self, item: dict) -> Note:
-        """Convert DynamoDB item to Note entity."""
+        """Convert DynamoDB item to Note entity.
+
+        Summary projections carry no `content`; the stored excerpt and length
+        are used instead, and stay None for items written before they were stored.
+        """
         author = Author(
             id=item["author_id"],
             displayName=item["author_name"],
@@ -105,13 +219,17 @@ class DynamoDBNotesRepository(NotesRepository):
         return Note(
             id=item["id"],
             title=item["title"],
-            content=item["content"],
+            content=item.get("content", ""),
             author=author,
             createdAt=datetime.fromisoformat(item["created_at"]),
             updatedAt=datetime.fromisoformat(item["updated_at"]),
             publishedAt=datetime.fromisoformat(item["published_at"]) if item.get("published_at") else None,
             owner_uid=item["owner_uid"],
             is_public=item.get("is_public") == "true",
+            excerpt=item.get("excerpt"),
+            content_length=int(item["content_length"]) if "content_length" in item else None,
+            comment_count=int(item.get("comment_count", 0)),
+            content_loaded="content" in item,
         )
     
     def _note_to_item(self, note: Note) -> dict:
@@ -120,6 +238,8 @@ class DynamoDBNotesRepository(NotesRepository):
             "id": note.id,
             "title": note.title,
             "content": note.content,
+            "excerpt": note.excerpt,
+            "content_length": note.content_length,
             "author_id": note.author.id,
             "author_name": note.author.displayName,
             "author_avatar_url": note.author.avatarUrl or "",
@@ -127,6 +247,7 @@ class DynamoDBNotesRepository(NotesRepository):
             "updated_at": note.updatedAt.isoformat(),
             "owner_uid": note.owner_uid,
             "is_public": "true" if note.is_public else "false",
+            "comment_count": note.comment_count,
         }
         
         if note.publishedAt:
@@ -134,14 +255,16 @@ class DynamoDBNotesRepository(NotesRepository):
         
         return item
     
-    async def get_notes_by_owner(self, owner_uid: str, page: int, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    async def get_notes_by_owner(self, owner_uid: str, page: int, limit: int, view: NoteView = "full", fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """Return list of user's note dicts and pagination dict."""
         try:
             # Query using OwnerIndex GSI
+            query_kwargs = _projection_for(view, fields)
             response = self.table.query(
                 IndexName="OwnerIndex",
                 KeyConditionExpression=Key("owner_uid").eq(owner_uid),
                 ScanIndexForward=False,  # Sort by created_at descending
+                **query_kwargs,
             )
             items = response.get("Items", [])
             
@@ -155,7 +278,7 @@ class DynamoDBNotesRepository(NotesRepository):
             page_notes = notes[start:end]
             
             # Convert to dict format
-            note_dicts = [n.to_private_dict() for n in page_notes]
+            note_dicts = [n.to_private_view(view, fields) for n in page_notes]
             
             pagination = {
                 "page": page,
@@ -170,20 +293,120 @@ class DynamoDBNotesRepository(NotesRepository):
         except ClientError as e:
             raise RuntimeError(f"Failed to get notes by owner: {e}")
     
-    async def get_note_by_owner(self, note_id: str, owner_uid: str) -> Optional[Dict[str, Any]]:
+    async def iter_notes_by_owner(self, owner_uid: str, page_size: int = 100) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of the user's note dicts, following LastEvaluatedKey lazily."""
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": "OwnerIndex",
+            "KeyConditionExpression": Key("owner_uid").eq(owner_uid),
+            "ScanIndexForward": False,  # Sort by created_at descending
+            "Limit": page_size,
+        }
+        while True:
+            try:
+                response = self.table.query(**query_kwargs)
+            except ClientError as e:
+                raise RuntimeError(f"Failed to export notes by owner: {e}")
+            items = response.get("Items", [])
+            if items:
+                yield [self._item_to_note(item).to_private_dict() for item in items]
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            query_kwargs["ExclusiveStartKey"] = last_key
+    
+    async def list_note_ids_by_owner(self, owner_uid: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        """Return one OwnerIndex page of note ids; the cursor is the JSON-encoded LastEvaluatedKey."""
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": "OwnerIndex",
+            "KeyConditionExpression": Key("owner_uid").eq(owner_uid),
+            "ScanIndexForward": False,
+            "Limit": limit,
+            **_projection(["id"]),
+        }
+        if cursor:
+            query_kwargs["ExclusiveStartKey"] = json.loads(cursor)
+        try:
+            response = self.table.query(**query_kwargs)
+        except ClientError as e:
+            raise RuntimeError(f"Failed to list notes by owner: {e}")
+        last_key = response.get("LastEvaluatedKey")
+        return [item["id"] for item in response.get("Items", [])], json.dumps(last_key) if last_key else None
+    
+    async def reassign_notes(self, note_ids: Sequence[str], from_uid: str, to_author: Author, concurrency: int = 8) -> int:
+        """Move notes with parallel conditional UpdateItems (owner_uid must still be `from_uid`).
+
+        BatchWriteItem cannot carry conditions, so each note is its own conditional
+        write; they run concurrently on the thread-safe low-level client.
+        """
+        client = self.table.meta.client
+        semaphore = asyncio.Semaphore(concurrency)
+
+        def move(note_id: str) -> bool:
+            try:
+                client.update_item(
+                    TableName=self.table_name,
+                    Key={"id": note_id},
+                    UpdateExpression="SET #owner = :to, #author_id = :to, #author_name = :name, #author_avatar = :avatar",
+                    ConditionExpression="#owner = :from",
+                    ExpressionAttributeNames={
+                        "#owner": "owner_uid",
+                        "#author_id": "author_id",
+                        "#author_name": "author_name",
+                        "#author_avatar": "author_avatar_url",
+                    },
+                    ExpressionAttributeValues={
+                        ":to": to_author.id,
+                        ":from": from_uid,
+                        ":name": to_author.displayName,
+                        ":avatar": to_author.avatarUrl or "",
+                    },
+                )
+                return True
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                    return False  # Already moved (resumed run) or deleted meanwhile
+                raise RuntimeError(f"Failed to reassign note: {e}")
+
+        async def bounded(note_id: str) -> bool:
+            async with semaphore:
+                return await asyncio.to_thread(move, note_id)
+
+        results = await asyncio.gather(*(bounded(note_id) for note_id in note_ids))
+        return sum(results)
+    
+    async def get_note_by_owner(self, note_id: str, owner_uid: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
         """Return a single note dict by id and owner or None."""
         try:
-            response = self.table.get_item(Key={"id": note_id})
+            response = self.table.get_item(Key={"id": note_id}, **_projection_for(fields=fields))
             item = response.get("Item")
             if not item or item.get("owner_uid") != owner_uid:
                 return None
             
             note = self._item_to_note(item)
-            return note.to_private_dict()
+            return note.to_private_view(fields=fields)
             
         except ClientError as e:
             raise RuntimeError(f"Failed to get note by owner: {e}")
     
+    async def get_note_visibility(self, note_id: str) -> Optional[NoteVisibility]:
+        """Read owner and public flag with a projection of the key attributes only."""
+        try:
+            # Off the event loop, so it can overlap other reads of the same request
+            response = await asyncio.to_thread(
+                self.table.get_item, Key={"id": note_id}, **_projection(ACCESS_ATTRIBUTES)
+            )
+        except ClientError as e:
+            raise RuntimeError(f"Failed to check note access: {e}")
+        item = response.get("Item")
+        if not item:
+            return None
+        return NoteVisibility(owner_uid=item.get("owner_uid", ""), is_public=item.get("is_public") == "true")
+
+    async def check_note_access(self, access: NoteAccess) -> bool:
+        """Check visibility/ownership with a projected read of the key attributes only."""
+        visibility = await self.get_note_visibility(access.note_id)
+        return visibility is not None and visibility.allows(access)
+    
     async def create_note(self, note: Note) -> None:
         """Create a new note."""
         try:
@@ -192,12 +415,51 @@ class DynamoDBNotesRepository(NotesRepository):
         except ClientError as e:
             raise RuntimeError(f"Failed to create note: {e}")
     
+    async def increment_comment_count(self, note_id: str) -> bool:
+        """Atomically add one to the note's comment count. Returns False if the note does not exist."""
+        try:
+            self.table.update_item(
+                Key={"id": note_id},
+                UpdateExpression="ADD #comment_count :one",
+                ConditionExpression="attribute_exists(id)",
+                ExpressionAttributeNames={"#comment_count": "comment_count"},
+                ExpressionAttributeValues={":one": 1},
+            )
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise RuntimeError(f"Failed to increment comment count: {e}")
+    
     async def update_note(self, note: Note) -> None:
-        """Update an existing note."""
+        """Update an existing note.
+
+        Sets every attribute except `comment_count`, which comment writes
+        maintain concurrently; a whole-item put would reset it. The update is
+        conditional on the note still existing for its owner, so an edit that
+        races a delete cannot recreate a partial item; it raises ValueError.
+        """
         try:
             item = self._note_to_item(note)
-            self.table.put_item(Item=item)
+            del item["id"], item["comment_count"]
+            names = {f"#a{i}": attr for i, attr in enumerate(item)}
+            values = {f":a{i}": value for i, value in enumerate(item.values())}
+            update_expression = "SET " + ", ".join(f"{name} = :a{i}" for i, name in enumerate(names))
+            if "published_at" not in item:
+                names["#published_at"] = "published_at"
+                update_expression += " REMOVE #published_at"
+            names.update({"#id": "id", "#owner": "owner_uid"})
+            values[":owner"] = note.owner_uid
+            self.table.update_item(
+                Key={"id": note.id},
+                UpdateExpression=update_expression,
+                ConditionExpression="attribute_exists(#id) AND #owner = :owner",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
         except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                raise ValueError(f"Note {note.id} not found for owner {note.owner_uid}")
             raise RuntimeError(f"Failed to update note: {e}")
     
     async def delete_note(self, note_id: str, owner_uid: str) -> bool:
@@ -0,0 +1,166 @@
+"""DynamoDB implementation of the comment event outbox."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+from app.domain.entities.outbox_event import OutboxEvent
+from app.domain.ports.outbox_repository import OutboxRepository
+
+
+# Every outbox item carries pending="1", so DeliverableIndex (pending, visible_at)
+# orders undelivered events by when they may next be sent; delivered events are
+# deleted. Keying on visible_at lets the claim query skip leased and backing-off
+# events in the key condition instead of reading and filtering them out.
+PENDING = "1"
+INDEX_NAME = "DeliverableIndex"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def outbox_event_to_item(event: OutboxEvent) -> Dict[str, Any]:
+    return {
+        "id": event.id,
+        "event_type": event.event_type,
+        "topic": event.topic,
+        # Stored as a JSON string: payloads round-trip without Decimal conversion
+        "payload": json.dumps(event.payload),
+        "created_at": event.created_at.isoformat(),
+        "attempts": event.attempts,
+        # Deliverable from now, queued behind events that became visible earlier
+        "visible_at": _now_ms(),
+        "pending": PENDING,
+    }
+
+
+def _item_to_outbox_event(item: Dict[str, Any]) -> OutboxEvent:
+    return OutboxEvent(
+        id=item["id"],
+        event_type=item["event_type"],
+        topic=item["topic"],
+        payload=json.loads(item["payload"]),
+        created_at=datetime.fromisoformat(item["created_at"]),
+        attempts=int(item.get("attempts", 0)),
+    )
+
+
+class DynamoDBOutboxRepository(OutboxRepository):
+    def __init__(
+        self,
+        table_name: str,
+        endpoint_url: Optional[str] = None,
+        region_name: str = "ap-northeast-1",
+        aws_access_key_id: Optional[str] = None,
+        aws_secret_access_key: Optional[str] = None,
+    ):
+        """Initialize DynamoDB outbox repository."""
+        self.table_name = table_name
+
+        session_kwargs = {"region_name": region_name}
+        if aws_access_key_id and aws_secret_access_key:
+            session_kwargs.update({
+                "aws_access_key_id": aws_access_key_id,
+                "aws_secret_access_key": aws_secret_access_key,
+            })
+        session = boto3.Session(**session_kwargs)
+
+        dynamodb_kwargs = {}
+        if endpoint_url:
+            dynamodb_kwargs["endpoint_url"] = endpoint_url
+
+        self.dynamodb = session.resource("dynamodb", **dynamodb_kwargs)
+        self.table = self.dynamodb.Table(table_name)
+
+    async def claim_pending(self, limit: int, lease_seconds: float) -> List[OutboxEvent]:
+        """Find visible events on DeliverableIndex, then lease each with a conditional update.
+
+        The key condition (visible_at <= now) returns only deliverable events, so
+        one page of `limit` is enough however many events are leased. The
+        condition on the update makes concurrent drainers claim disjoint sets.
+        """
+        now = _now_ms()
+        try:
+            response = self.table.query(
+                IndexName=INDEX_NAME,
+                KeyConditionExpression=Key("pending").eq(PENDING) & Key("visible_at").lte(now),
+                ProjectionExpression="id",
+                ScanIndexForward=True,
+                Limit=limit,
+            )
+        except ClientError as e:
+            raise RuntimeError(f"Failed to query outbox: {e}")
+        candidates = [item["id"] for item in response.get("Items", [])]
+
+        lease_until = now + int(lease_seconds * 1000)
+
+        def claim(event_id: str) -> Optional[OutboxEvent]:
+            try:
+                response = self.table.update_item(
+                    Key={"id": event_id},
+                    UpdateExpression="SET visible_at = :lease ADD attempts :one",
+                    ConditionExpression="attribute_exists(id) AND visible_at <= :now",
+                    ExpressionAttributeValues={":lease": lease_until, ":now": now, ":one": 1},
+                    ReturnValues="ALL_NEW",
+                )
+                return _item_to_outbox_event(response["Attributes"])
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                    return None  # Claimed by another drainer, or delivered meanwhile
+                raise RuntimeError(f"Failed to claim outbox event: {e}")
+
+        claimed = await asyncio.gather(*(asyncio.to_thread(claim, event_id) for event_id in candidates))
+        events = [event for event in claimed if event is not None]
+        events.sort(key=lambda event: event.created_at)
+        return events
+
+    async def mark_delivered(self, event_ids: Sequence[str]) -> None:
+        try:
+            with self.table.batch_writer() as batch:
+                for event_id in event_ids:
+                    batch.delete_item(Key={"id": event_id})
+        except ClientError as e:
+            raise RuntimeError(f"Failed to delete outbox events: {e}")
+
+    async def mark_failed(self, event_ids: Sequence[str], retry_after_seconds: float) -> None:
+        visible_at = _now_ms() + int(retry_after_seconds * 1000)
+
+        def release(event_id: str) -> None:
+            try:
+                self.table.update_item(
+                    Key={"id": event_id},
+                    UpdateExpression="SET visible_at = :visible",
+                    ConditionExpression="attribute_exists(id)",
+                    ExpressionAttributeValues={":visible": visible_at},
+                )
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                    raise RuntimeError(f"Failed to release outbox event: {e}")
+
+        await asyncio.gather(*(asyncio.to_thread(release, event_id) for event_id in event_ids))
+
+    async def pending_count(self) -> int:
+        count = 0
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": INDEX_NAME,
+            "KeyConditionExpression": Key("pending").eq(PENDING),
+            "Select": "COUNT",
+        }
+        try:
+            while True:
+                response = self.table.query(**query_kwargs)
+                count += response.get("Count", 0)
+                if "LastEvaluatedKey" not in response:
+                    return count
+                query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        except ClientError as e:
+            raise RuntimeError(f"Failed to count outbox events: {e}")
@@ -0,0 +1,169 @@
+"""DynamoDB implementation of the ownership transfer store."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+from app.domain.entities.ownership_transfer import OwnershipTransfer
+from app.domain.ports.ownership_transfer_repository import OwnershipTransferRepository
+
+
+# Attribute name aliases (`status`, `error`, `cursor` are reserved words)
+NAMES = {
+    "#status": "status",
+    "#error": "error",
+    "#finished_at": "finished_at",
+    "#lease_owner": "lease_owner",
+    "#lease_until": "lease_until",
+}
+
+
+def _transfer_to_item(transfer: OwnershipTransfer) -> Dict[str, Any]:
+    item: Dict[str, Any] = {
+        "to_uid": transfer.to_uid,
+        "from_uid": transfer.from_uid,
+        "to_display_name": transfer.to_display_name,
+        "to_avatar_url": transfer.to_avatar_url or "",
+        "status": transfer.status,
+        "notes_moved": transfer.notes_moved,
+        "notes_skipped": transfer.notes_skipped,
+        "comments_moved": transfer.comments_moved,
+        "pages_done": transfer.pages_done,
+        "started_at": transfer.started_at.isoformat(),
+    }
+    if transfer.cursor is not None:
+        item["cursor"] = transfer.cursor
+    if transfer.error is not None:
+        item["error"] = transfer.error
+    if transfer.finished_at is not None:
+        item["finished_at"] = transfer.finished_at.isoformat()
+    return item
+
+
+def _item_to_transfer(item: Dict[str, Any]) -> OwnershipTransfer:
+    return OwnershipTransfer(
+        from_uid=item["from_uid"],
+        to_uid=item["to_uid"],
+        to_display_name=item.get("to_display_name") or "User",
+        to_avatar_url=item.get("to_avatar_url") or None,
+        status=item["status"],
+        notes_moved=int(item.get("notes_moved", 0)),
+        notes_skipped=int(item.get("notes_skipped", 0)),
+        comments_moved=int(item.get("comments_moved", 0)),
+        pages_done=int(item.get("pages_done", 0)),
+        cursor=item.get("cursor"),
+        error=item.get("error"),
+        started_at=datetime.fromisoformat(item["started_at"]),
+        finished_at=datetime.fromisoformat(item["finished_at"]) if item.get("finished_at") else None,
+    )
+
+
+class DynamoDBOwnershipTransferRepository(OwnershipTransferRepository):
+    """Transfers table keyed by `to_uid`; `lease_owner`/`lease_until` (epoch seconds) guard the runner."""
+
+    def __init__(
+        self,
+        table_name: str,
+        endpoint_url: Optional[str] = None,
+        region_name: str = "ap-northeast-1",
+        aws_access_key_id: Optional[str] = None,
+        aws_secret_access_key: Optional[str] = None,
+    ):
+        """Initialize DynamoDB ownership transfer repository."""
+        self.table_name = table_name
+
+        session_kwargs = {"region_name": region_name}
+        if aws_access_key_id and aws_secret_access_key:
+            session_kwargs.update({
+                "aws_access_key_id": aws_access_key_id,
+                "aws_secret_access_key": aws_secret_access_key,
+            })
+        session = boto3.Session(**session_kwargs)
+
+        dynamodb_kwargs = {}
+        if endpoint_url:
+            dynamodb_kwargs["endpoint_url"] = endpoint_url
+
+        self.dynamodb = session.resource("dynamodb", **dynamodb_kwargs)
+        self.table = self.dynamodb.Table(table_name)
+
+    async def get(self, to_uid: str) -> Optional[OwnershipTransfer]:
+        try:
+            response = await asyncio.to_thread(self.table.get_item, Key={"to_uid": to_uid}, ConsistentRead=True)
+        except ClientError as e:
+            raise RuntimeError(f"Failed to get ownership transfer: {e}")
+        item = response.get("Item")
+        return _item_to_transfer(item) if item else None
+
+    async def put(self, transfer: OwnershipTransfer) -> bool:
+        try:
+            await asyncio.to_thread(
+                self.table.put_item,
+                Item=_transfer_to_item(transfer),
+                ConditionExpression="attribute_not_exists(to_uid) OR #status <> :running",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={":running": "running"},
+            )
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise RuntimeError(f"Failed to save ownership transfer: {e}")
+
+    async def acquire(
+        self, to_uid: str, worker_id: str, lease_seconds: float, retry_failed_before: datetime
+    ) -> Optional[OwnershipTransfer]:
+        now = time.time()
+        try:
+            response = await asyncio.to_thread(
+                self.table.update_item,
+                Key={"to_uid": to_uid},
+                UpdateExpression=(
+                    "SET #status = :running, #lease_owner = :me, #lease_until = :until REMOVE #error, #finished_at"
+                ),
+                ConditionExpression=(
+                    "(#status = :running AND (attribute_not_exists(#lease_until) OR #lease_until < :now"
+                    " OR #lease_owner = :me))"
+                    " OR (#status = :failed AND #finished_at < :retry_before)"
+                ),
+                ExpressionAttributeNames=NAMES,
+                ExpressionAttributeValues={
+                    ":running": "running",
+                    ":failed": "failed",
+                    ":me": worker_id,
+                    ":now": int(now),
+                    ":until": int(now + lease_seconds),
+                    ":retry_before": retry_failed_before.isoformat(),
+                },
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return None
+            raise RuntimeError(f"Failed to acquire ownership transfer: {e}")
+        return _item_to_transfer(response["Attributes"])
+
+    async def save_progress(self, transfer: OwnershipTransfer, worker_id: str, lease_seconds: Optional[float]) -> bool:
+        item = _transfer_to_item(transfer)
+        if lease_seconds is not None:
+            item["lease_owner"] = worker_id
+            item["lease_until"] = int(time.time() + lease_seconds)
+        try:
+            await asyncio.to_thread(
+                self.table.put_item,
+                Item=item,
+                ConditionExpression="#lease_owner = :me",
+                ExpressionAttributeNames={"#lease_owner": "lease_owner"},
+                ExpressionAttributeValues={":me": worker_id},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise RuntimeError(f"Failed to save ownership transfer: {e}")
+        return True
@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.types import TypeDeserializer
 from botocore.exceptions import ClientError
 
-from app.domain.ports.user_repository import UserRepository
+from app.domain.ports.user_repository import (
+    ProfileWriteCondition,
+    ProfileWriteOutcome,
+    UserRepository,
+)
 from app.shared.logger import get_logger
 
 
@@ -102,3 +107,69 @@ class DynamoDBUserRepository(UserRepository):
             
         except ClientError as e:
             raise RuntimeError(f"Failed to update user profile: {e}")
+
+    async def create_or_patch(
+        self,
+        uid: str,
+        patch: Dict[str, Any],
+        defaults: Optional[Dict[str, Any]] = None,
+        when: ProfileWriteCondition = "always",
+    ) -> Tuple[Dict[str, Any], ProfileWriteOutcome]:
+        """Create-if-absent-else-patch in one conditional UpdateItem.
+
+        `patch` fields are always SET, `defaults` only via if_not_exists, and
+        createdAt is stamped with if_not_exists too: the write created the item
+        exactly when the returned createdAt equals this call's timestamp.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        names: Dict[str, str] = {"#createdAt": "createdAt", "#updatedAt": "updatedAt"}
+        values: Dict[str, Any] = {":now": now}
+        assignments = ["#createdAt = if_not_exists(#createdAt, :now)", "#updatedAt = :now"]
+        for i, (field, value) in enumerate(patch.items()):
+            names[f"#p{i}"] = field
+            values[f":p{i}"] = value
+            assignments.append(f"#p{i} = :p{i}")
+        for i, (field, value) in enumerate((defaults or {}).items()):
+            if field in patch:
+                continue
+            names[f"#d{i}"] = field
+            values[f":d{i}"] = value
+            assignments.append(f"#d{i} = if_not_exists(#d{i}, :d{i})")
+
+        kwargs: Dict[str, Any] = {
+            "Key": {"uid": uid},
+            "UpdateExpression": "SET " + ", ".join(assignments),
+            "ReturnValues": "ALL_NEW",
+        }
+        if when != "always":
+            names["#uid"] = "uid"
+            condition = "attribute_not_exists(#uid)"
+            if when == "anonymous":
+                names["#isAnonymous"] = "isAnonymous"
+                values[":true"] = True
+                condition += " OR #isAnonymous = :true"
+            kwargs["ConditionExpression"] = condition
+            # Hand back the existing item on a failed condition so no extra read is needed
+            kwargs["ReturnValuesOnConditionCheckFailure"] = "ALL_OLD"
+        kwargs["ExpressionAttributeNames"] = names
+        kwargs["ExpressionAttributeValues"] = values
+
+        try:
+            self._log.info("repo.create_or_patch", extra={"uid": uid, "when": when, "table": self.table_name})
+            response = self.table.update_item(**kwargs)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise RuntimeError(f"Failed to write user profile: {e}")
+            raw = e.response.get("Item")
+            if raw is not None:
+                deserializer = TypeDeserializer()
+                item = {k: deserializer.deserialize(v) for k, v in raw.items()}
+            else:  # Older DynamoDB Local builds omit the item
+                item = self.table.get_item(Key={"uid": uid}).get("Item") or {}
+            self._log.info("repo.create_or_patch.result", extra={"uid": uid, "outcome": "unchanged"})
+            return item, "unchanged"
+
+        item = response.get("Attributes", {})
+        outcome: ProfileWriteOutcome = "created" if item.get("createdAt") == now else "updated"
+        self._log.info("repo.create_or_patch.result", extra={"uid": uid, "outcome": outcome})
+        return item, outcome
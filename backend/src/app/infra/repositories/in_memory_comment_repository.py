@@ -1,16 +1,28 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import uuid
 
 from app.domain.entities.comment import Comment
+from app.domain.entities.note_access import NoteAccess, NoteNotAccessibleError
+from app.domain.entities.outbox_event import OutboxEvent
 from app.domain.ports.comment_repository import CommentRepository
+from app.domain.ports.notes_repository import NotesRepository
+from app.infra.repositories.in_memory_outbox_repository import InMemoryOutboxRepository
 
 
 class InMemoryCommentRepository(CommentRepository):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        outbox: Optional[InMemoryOutboxRepository] = None,
+        notes: Optional[NotesRepository] = None,
+    ) -> None:
         self._comments: List[Comment] = []
+        self.outbox = outbox
+        # Checked for `note_access` on create, and its comment count bumped
+        self.notes = notes
 
     async def list_comments_by_note(self, note_id: str, page: int, limit: int) -> tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """Return list of comment dicts for a note and pagination dict."""
@@ -34,9 +46,35 @@ class InMemoryCommentRepository(CommentRepository):
         }
         return comments, pagination
     
-    async def create_comment(self, comment: Comment) -> Dict[str, Any]:
-        """Create a new comment and return the comment dict."""
+    async def list_comments_since(self, note_id: str, since: datetime, limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Return comments created after `since` (oldest first) and whether more follow."""
+        newer = sorted(
+            (c for c in self._comments if c.note_id == note_id and c.created_at > since),
+            key=lambda c: c.created_at,
+        )
+        return [c.to_dict() for c in newer[:limit]], len(newer) > limit
+    
+    async def create_comment(
+        self,
+        comment: Comment,
+        outbox_event: Optional[OutboxEvent] = None,
+        note_access: Optional[NoteAccess] = None,
+    ) -> Dict[str, Any]:
+        """Create a new comment (with its outbox event and the note's comment count, in the same step)."""
+        if outbox_event is not None and self.outbox is None:
+            raise RuntimeError("Outbox event given but no outbox is configured")
+        if note_access is not None:
+            if self.notes is None:
+                raise RuntimeError("Note access check given but no notes repository is configured")
+            if not await self.notes.check_note_access(note_access):
+                raise NoteNotAccessibleError(note_access)
+            # The in-memory notes repository never suspends here, so the count
+            # and the comment below change in the same step
+            await self.notes.increment_comment_count(note_access.note_id)
+        # No await between the two writes, so no other task sees one without the other
         self._comments.append(comment)
+        if outbox_event is not None:
+            self.outbox.add(outbox_event)
         return comment.to_dict()
     
     async def get_comment(self, comment_id: str) -> Optional[Dict[str, Any]]:
@@ -44,4 +82,13 @@ class InMemoryCommentRepository(CommentRepository):
         for comment in self._comments:
             if comment.id == comment_id:
                 return comment.to_dict()
-        return None
\ No newline at end of file
+        return None
+    
+    async def reassign_author(self, from_uid: str, to_uid: str, to_display_name: str) -> int:
+        """Attribute every comment by `from_uid` to `to_uid`."""
+        moved = 0
+        for i, comment in enumerate(self._comments):
+            if comment.author_uid == from_uid:
+                self._comments[i] = replace(comment, author_uid=to_uid, author_display_name=to_display_name)
+                moved += 1
+        return moved
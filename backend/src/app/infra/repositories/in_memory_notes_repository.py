@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import datetime, timezone
-from typing import List, Tuple, Dict, Any, Optional
+from typing import List, Tuple, Dict, Any, Optional, Sequence, AsyncIterator
 
-from app.domain.entities.note import Note, Author
+from app.domain.entities.note import Note, Author, NoteView
+from app.domain.entities.note_access import NoteAccess, NoteVisibility
 from app.domain.ports.notes_repository import NotesRepository
 
 
@@ -45,7 +47,7 @@ class InMemoryNotesRepository(NotesRepository):
             ),
         ]
 
-    async def list_public_notes(self, page: int, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    async def list_public_notes(self, page: int, limit: int, view: NoteView = "full", fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         # Filter only public notes
         public_notes = [n for n in self._notes if n.is_public]
         
@@ -53,7 +55,7 @@ class InMemoryNotesRepository(NotesRepository):
         start = (page - 1) * limit
         end = start + limit
         items = public_notes[start:end]
-        notes = [n.to_public_dict() for n in items]
+        notes = [n.to_public_view(view, fields) for n in items]
         pagination = {
             "page": page,
             "limit": limit,
@@ -63,13 +65,13 @@ class InMemoryNotesRepository(NotesRepository):
         }
         return notes, pagination
 
-    async def get_public_note(self, note_id: str) -> Optional[Dict[str, Any]]:
+    async def get_public_note(self, note_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
         for n in self._notes:
             if n.id == note_id and n.is_public:
-                return n.to_public_dict()
+                return n.to_public_view(fields=fields)
         return None
     
-    async def get_notes_by_owner(self, owner_uid: str, page: int, limit: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    async def get_notes_by_owner(self, owner_uid: str, page: int, limit: int, view: NoteView = "full", fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         # Filter notes by owner
         owner_notes = [n for n in self._notes if n.owner_uid == owner_uid]
         # Sort by created_at descending
@@ -79,7 +81,7 @@ class InMemoryNotesRepository(NotesRepository):
         start = (page - 1) * limit
         end = start + limit
         items = owner_notes[start:end]
-        notes = [n.to_private_dict() for n in items]
+        notes = [n.to_private_view(view, fields) for n in items]
         pagination = {
             "page": page,
             "limit": limit,
@@ -89,19 +91,70 @@ class InMemoryNotesRepository(NotesRepository):
         }
         return notes, pagination
     
-    async def get_note_by_owner(self, note_id: str, owner_uid: str) -> Optional[Dict[str, Any]]:
+    async def iter_notes_by_owner(self, owner_uid: str, page_size: int = 100) -> AsyncIterator[List[Dict[str, Any]]]:
+        owner_notes = [n for n in self._notes if n.owner_uid == owner_uid]
+        owner_notes.sort(key=lambda n: n.createdAt, reverse=True)
+        for start in range(0, len(owner_notes), page_size):
+            yield [n.to_private_dict() for n in owner_notes[start:start + page_size]]
+    
+    async def list_note_ids_by_owner(self, owner_uid: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        # Cursor is "<createdAt>|<id>" of the last note returned (newest first), so
+        # it stays valid while notes are moved away from this owner
+        owner_notes = sorted(
+            (n for n in self._notes if n.owner_uid == owner_uid),
+            key=lambda n: (n.createdAt.isoformat(), n.id),
+            reverse=True,
+        )
+        if cursor:
+            after = tuple(cursor.split("|", 1))
+            owner_notes = [n for n in owner_notes if (n.createdAt.isoformat(), n.id) < after]
+        page = owner_notes[:limit]
+        next_cursor = None
+        if len(owner_notes) > limit:
+            last = page[-1]
+            next_cursor = f"{last.createdAt.isoformat()}|{last.id}"
+        return [n.id for n in page], next_cursor
+    
+    async def reassign_notes(self, note_ids: Sequence[str], from_uid: str, to_author: Author) -> int:
+        wanted = set(note_ids)
+        moved = 0
+        for i, n in enumerate(self._notes):
+            if n.id in wanted and n.owner_uid == from_uid:
+                self._notes[i] = replace(n, owner_uid=to_author.id, author=to_author)
+                moved += 1
+        return moved
+    
+    async def get_note_by_owner(self, note_id: str, owner_uid: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
         for n in self._notes:
             if n.id == note_id and n.owner_uid == owner_uid:
-                return n.to_private_dict()
+                return n.to_private_view(fields=fields)
+        return None
+    
+    async def get_note_visibility(self, note_id: str) -> Optional[NoteVisibility]:
+        for n in self._notes:
+            if n.id == note_id:
+                return NoteVisibility(owner_uid=n.owner_uid, is_public=n.is_public)
         return None
     
+    async def check_note_access(self, access: NoteAccess) -> bool:
+        visibility = await self.get_note_visibility(access.note_id)
+        return visibility is not None and visibility.allows(access)
+    
+    async def increment_comment_count(self, note_id: str) -> bool:
+        for i, n in enumerate(self._notes):
+            if n.id == note_id:
+                self._notes[i] = replace(n, comment_count=n.comment_count + 1)
+                return True
+        return False
+    
     async def create_note(self, note: Note) -> None:
         self._notes.append(note)
     
     async def update_note(self, note: Note) -> None:
         for i, n in enumerate(self._notes):
             if n.id == note.id and n.owner_uid == note.owner_uid:
-                self._notes[i] = note
+                # The comment count is not the caller's to set
+                self._notes[i] = replace(note, comment_count=n.comment_count)
                 return
         raise ValueError(f"Note {note.id} not found for owner {note.owner_uid}")
     
@@ -126,6 +179,9 @@ class InMemoryNotesRepository(NotesRepository):
                     publishedAt=datetime.now(timezone.utc),
                     owner_uid=n.owner_uid,
                     is_public=True,
+                    excerpt=n.excerpt,
+                    content_length=n.content_length,
+                    comment_count=n.comment_count,
                 )
                 self._notes[i] = updated_note
                 return True
@@ -145,6 +201,9 @@ class InMemoryNotesRepository(NotesRepository):
                     publishedAt=None,
                     owner_uid=n.owner_uid,
                     is_public=False,
+                    excerpt=n.excerpt,
+                    content_length=n.content_length,
+                    comment_count=n.comment_count,
                 )
                 self._notes[i] = updated_note
                 return True
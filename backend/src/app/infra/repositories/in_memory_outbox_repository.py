@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from typing import Dict, List, Sequence
+
+from app.domain.entities.outbox_event import OutboxEvent
+from app.domain.ports.outbox_repository import OutboxRepository
+
+
+class InMemoryOutboxRepository(OutboxRepository):
+    """Outbox kept next to the in-memory comments; same lease semantics as DynamoDB."""
+
+    def __init__(self) -> None:
+        # Insertion order is creation order
+        self._events: Dict[str, OutboxEvent] = {}
+        self._visible_at: Dict[str, float] = {}
+
+    def add(self, event: OutboxEvent) -> None:
+        """Store an event; called by the comment repository inside the same write."""
+        self._events[event.id] = event
+        self._visible_at[event.id] = 0.0
+
+    async def claim_pending(self, limit: int, lease_seconds: float) -> List[OutboxEvent]:
+        now = time.monotonic()
+        claimed: List[OutboxEvent] = []
+        for event_id, event in self._events.items():
+            if len(claimed) >= limit:
+                break
+            if self._visible_at[event_id] > now:
+                continue
+            event = replace(event, attempts=event.attempts + 1)
+            self._events[event_id] = event
+            self._visible_at[event_id] = now + lease_seconds
+            claimed.append(event)
+        return claimed
+
+    async def mark_delivered(self, event_ids: Sequence[str]) -> None:
+        for event_id in event_ids:
+            self._events.pop(event_id, None)
+            self._visible_at.pop(event_id, None)
+
+    async def mark_failed(self, event_ids: Sequence[str], retry_after_seconds: float) -> None:
+        visible_at = time.monotonic() + retry_after_seconds
+        for event_id in event_ids:
+            if event_id in self._events:
+                self._visible_at[event_id] = visible_at
+
+    async def pending_count(self) -> int:
+        return len(self._events)
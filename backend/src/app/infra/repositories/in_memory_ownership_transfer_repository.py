@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from app.domain.entities.ownership_transfer import OwnershipTransfer
+from app.domain.ports.ownership_transfer_repository import OwnershipTransferRepository
+
+
+class InMemoryOwnershipTransferRepository(OwnershipTransferRepository):
+    """Transfers kept in process; same lease semantics as DynamoDB."""
+
+    def __init__(self) -> None:
+        # to_uid -> (transfer, lease owner, lease expiry on the monotonic clock)
+        self._transfers: Dict[str, Tuple[OwnershipTransfer, Optional[str], float]] = {}
+
+    async def get(self, to_uid: str) -> Optional[OwnershipTransfer]:
+        entry = self._transfers.get(to_uid)
+        # Copies, so callers only change the stored record through save_progress
+        return replace(entry[0]) if entry else None
+
+    async def put(self, transfer: OwnershipTransfer) -> bool:
+        current = self._transfers.get(transfer.to_uid)
+        if current is not None and current[0].status == "running":
+            return False
+        self._transfers[transfer.to_uid] = (replace(transfer), None, 0.0)
+        return True
+
+    async def acquire(
+        self, to_uid: str, worker_id: str, lease_seconds: float, retry_failed_before: datetime
+    ) -> Optional[OwnershipTransfer]:
+        entry = self._transfers.get(to_uid)
+        if entry is None:
+            return None
+        transfer, owner, lease_until = entry
+        now = time.monotonic()
+        if transfer.status == "running":
+            if owner not in (None, worker_id) and lease_until > now:
+                return None
+        elif not (transfer.status == "failed" and transfer.finished_at and transfer.finished_at < retry_failed_before):
+            return None
+        transfer = replace(transfer, status="running", error=None, finished_at=None)
+        self._transfers[to_uid] = (transfer, worker_id, now + lease_seconds)
+        return replace(transfer)
+
+    async def save_progress(self, transfer: OwnershipTransfer, worker_id: str, lease_seconds: Optional[float]) -> bool:
+        entry = self._transfers.get(transfer.to_uid)
+        if entry is None or entry[1] != worker_id:
+            return False
+        if lease_seconds is None:
+            self._transfers[transfer.to_uid] = (replace(transfer), None, 0.0)
+        else:
+            self._transfers[transfer.to_uid] = (replace(transfer), worker_id, time.monotonic() + lease_seconds)
+        return True
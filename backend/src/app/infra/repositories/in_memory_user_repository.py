@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 from app.domain.entities.user_profile import UserProfile
-from app.domain.ports.user_repository import UserRepository
+from app.domain.ports.user_repository import (
+    ProfileWriteCondition,
+    ProfileWriteOutcome,
+    UserRepository,
+)
 
 
 class InMemoryUserRepository(UserRepository):
@@ -48,3 +52,16 @@ class InMemoryUserRepository(UserRepository):
         self._store[uid] = updated
         return updated.to_dict()
 
+    async def create_or_patch(
+        self,
+        uid: str,
+        patch: Dict[str, Any],
+        defaults: Optional[Dict[str, Any]] = None,
+        when: ProfileWriteCondition = "always",
+    ) -> Tuple[Dict[str, Any], ProfileWriteOutcome]:
+        current = self._store.get(uid)
+        if current is not None and (when == "missing" or (when == "anonymous" and not current.isAnonymous)):
+            return current.to_dict(), "unchanged"
+        if current is None:
+            return await self.upsert({**(defaults or {}), **patch, "uid": uid}), "created"
+        return await self.update(uid, patch), "updated"  # type: ignore[return-value]
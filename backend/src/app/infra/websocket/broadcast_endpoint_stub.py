@@ -0,0 +1,127 @@
+"""Local ASGI stand-in for the serverless `/broadcast/comments` endpoint.
+
+Accepts the same bodies as the broadcast Lambda (single messages and
+`{"type": "batch", "messages": [...]}`) and simulates its cost without AWS:
+a fixed invocation latency (plus jitter), one `postToConnection` per
+subscriber per message (`connections` subscribers per topic, sent
+`send_concurrency` at a time, `send_ms` each), and a configurable share of
+503 responses. Each delivered message is recorded with the time it finished,
+which is what the delivery benchmark measures against.
+
+Used in-process through `httpx.ASGITransport`, or standalone in place of
+`serverless offline`:
+
+    BROADCAST_STUB_LATENCY_MS=40 BROADCAST_STUB_CONNECTIONS=200 \\
+        uvicorn app.infra.websocket.broadcast_endpoint_stub:app --port 3000
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import Receive, Scope, Send
+
+from app.application.services.broadcast_coalescer import BATCH_MESSAGE_TYPE
+
+
+BROADCAST_PATHS = ("/broadcast/comments", "/development/broadcast/comments")
+
+
+class StubBroadcastEndpoint:
+    def __init__(
+        self,
+        latency_ms: float = 20.0,
+        jitter_ms: float = 5.0,
+        error_rate: float = 0.0,
+        connections: int = 100,
+        send_ms: float = 1.0,
+        send_concurrency: int = 50,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.connections = connections
+        self.send_ms = send_ms
+        self.send_concurrency = max(1, send_concurrency)
+        self._rng = random.Random(seed)
+        # (message, perf_counter when its fan-out finished)
+        self.delivered: List[Tuple[Dict[str, Any], float]] = []
+        self.requests = 0
+        self.errors = 0
+        self.sends = 0
+
+    @classmethod
+    def from_env(cls) -> "StubBroadcastEndpoint":
+        return cls(
+            latency_ms=float(os.getenv("BROADCAST_STUB_LATENCY_MS", "20")),
+            jitter_ms=float(os.getenv("BROADCAST_STUB_JITTER_MS", "5")),
+            error_rate=float(os.getenv("BROADCAST_STUB_ERROR_RATE", "0")),
+            connections=int(os.getenv("BROADCAST_STUB_CONNECTIONS", "100")),
+            send_ms=float(os.getenv("BROADCAST_STUB_SEND_MS", "1")),
+            send_concurrency=int(os.getenv("BROADCAST_STUB_SEND_CONCURRENCY", "50")),
+        )
+
+    def fanout_seconds(self, messages: int) -> float:
+        """Simulated time to post `messages` messages to every subscriber."""
+        sends = messages * self.connections
+        return math.ceil(sends / self.send_concurrency) * self.send_ms / 1000
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return
+        if scope["method"] != "POST" or scope["path"] not in BROADCAST_PATHS:
+            # Anything else (warm-up OPTIONS, probes) just answers
+            await JSONResponse({"message": "ok"})(scope, receive, send)
+            return
+
+        self.requests += 1
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            await JSONResponse({"message": "Invalid JSON in request body"}, status_code=400)(scope, receive, send)
+            return
+        items = payload["messages"] if payload.get("type") == BATCH_MESSAGE_TYPE else [payload]
+
+        latency = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+        if self._rng.random() < self.error_rate:
+            self.errors += 1
+            await asyncio.sleep(latency)
+            await JSONResponse({"message": "Service Unavailable"}, status_code=503)(scope, receive, send)
+            return
+
+        await asyncio.sleep(latency + self.fanout_seconds(len(items)))
+        finished = time.perf_counter()
+        self.delivered.extend((item, finished) for item in items)
+        self.sends += len(items) * self.connections
+        await JSONResponse(
+            {
+                "message": "Broadcast completed",
+                "messageCount": len(items),
+                "results": {"totalConnections": self.connections, "sent": len(items) * self.connections},
+            }
+        )(scope, receive, send)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "messages": len(self.delivered),
+            "sends": self.sends,
+        }
+
+
+app = StubBroadcastEndpoint.from_env()
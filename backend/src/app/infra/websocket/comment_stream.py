@@ -0,0 +1,233 @@
+"""Server-Sent Events stream of one note's comments, for clients that cannot use WebSockets.
+
+A stream is a subscriber of the in-process ``WebSocketHub``, which receives
+every comment event published on this instance, so it gets the same
+``comment.created`` messages as ``/ws`` clients. Each event carries the
+comment's ``createdAt`` as its SSE id; a reconnecting browser sends it back
+as ``Last-Event-ID`` and the missed comments are replayed from storage
+before live events resume. Replayed and live events may overlap (the replay
+starts a little early); the stream drops ids it has already sent and clients
+dedupe by comment id as they do for WebSocket redeliveries.
+
+When broadcasts go to an external endpoint (API Gateway), the hub only sees
+comments posted through this instance, so the stream is also given a `poll`
+that reads the note's newer comments from storage every `poll_seconds`.
+
+The hub bounds what a stream may have queued (frames and bytes); a stream
+that falls further behind is evicted like a slow WebSocket and the browser
+reconnects with its ``Last-Event-ID``. While idle, a comment line is sent
+every ``heartbeat_seconds`` to keep proxies from closing the connection.
+The note's visibility is checked before each live event and on every tick,
+so a stream ends once the note stops being public. With ``max_seconds`` the
+stream ends on its own before a serverless runtime's timeout would cut it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.infra.websocket.fanout_hub import HubConnection, WebSocketHub
+
+
+COMMENT_CREATED = "comment.created"
+# Tells the client to re-fetch the comment list: the gap was too long to replay
+RESET_EVENT = "reset"
+# Comment ids remembered per stream to drop replay/live overlaps and redeliveries
+SEEN_IDS = 512
+
+
+def format_event(data: str, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """Encode one SSE event (`data` must be a single line, e.g. compact JSON)."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+def comment_event(note_id: str, comment: Dict[str, Any]) -> Tuple[str, str]:
+    """(comment id, SSE event) for a comment dict, in the `/ws` message shape."""
+    message = {
+        "type": COMMENT_CREATED,
+        "data": {"noteId": note_id, "comment": comment, "isPrivateNote": False},
+        "timestamp": comment.get("createdAt"),
+    }
+    return comment["id"], format_event(json.dumps(message), COMMENT_CREATED, comment.get("createdAt"))
+
+
+# Polls the note's comments created after a `createdAt` cursor:
+# (comments, whether that is all of them)
+Poll = Callable[[str], Awaitable[Tuple[List[Dict[str, Any]], bool]]]
+
+
+def _later(created_at: str, cursor: Optional[str]) -> bool:
+    """Whether `created_at` is after `cursor` (both ISO-8601; "Z" allowed)."""
+    if cursor is None:
+        return True
+    try:
+        return datetime.fromisoformat(created_at.replace("Z", "+00:00")) > datetime.fromisoformat(
+            cursor.replace("Z", "+00:00")
+        )
+    except (ValueError, TypeError):
+        return False
+
+
+@lru_cache(maxsize=256)
+def _frame_event(frame: str) -> Optional[Tuple[str, str, Optional[str]]]:
+    """(comment id, SSE event, createdAt) for a hub frame, or None for other messages.
+
+    `isPrivateNote` only says which route the comment came through (an owner
+    commenting on their public note via /me/notes sets it), so visibility is
+    left to the stream's check of the note itself. Hub frames are shared by
+    every subscriber, so the cache makes this one decode per message rather
+    than one per stream.
+    """
+    try:
+        message = json.loads(frame)
+        if message.get("type") != COMMENT_CREATED:
+            return None
+        comment = message["data"]["comment"]
+        created_at = comment.get("createdAt")
+        return comment["id"], format_event(frame, COMMENT_CREATED, created_at), created_at
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class CommentStream:
+    def __init__(
+        self,
+        hub: WebSocketHub,
+        note_id: str,
+        still_visible: Callable[[], Awaitable[bool]],
+        heartbeat_seconds: float = 15.0,
+        max_buffer_bytes: int = 256 * 1024,
+        retry_ms: int = 3000,
+        poll: Optional[Poll] = None,
+        poll_seconds: float = 5.0,
+        max_seconds: float = 0.0,
+    ) -> None:
+        self.note_id = note_id
+        self._hub = hub
+        self._still_visible = still_visible
+        self.heartbeat_seconds = heartbeat_seconds
+        self.retry_ms = retry_ms
+        self._poll = poll
+        self.poll_seconds = poll_seconds
+        # 0 means no limit (a long-running server)
+        self.max_seconds = max_seconds
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        # createdAt of the newest comment sent; where the next poll starts
+        self._cursor: Optional[str] = None
+        # One frame at a time; the hub's queue (and its byte cap) holds the rest
+        self._handoff: asyncio.Queue[Optional[str]] = asyncio.Queue(maxsize=1)
+        self._closed = False
+        # Subscribe before the caller reads the replay, so nothing falls in between
+        self._connection: HubConnection = hub.register(self._put, self._close, max_pending_bytes=max_buffer_bytes)
+        hub.subscribe(self._connection, [note_id])
+
+    async def _put(self, frame: str) -> None:
+        await self._handoff.put(frame)
+
+    async def _close(self, code: int, reason: str) -> None:
+        # Evicted as a slow consumer, or the app is shutting down
+        self._closed = True
+        try:
+            self._handoff.put_nowait(None)
+        except asyncio.QueueFull:
+            pass  # the reader checks `_closed` after the pending frame
+
+    def _first_time(self, comment_id: str, created_at: Optional[str]) -> bool:
+        if comment_id in self._seen:
+            return False
+        self._seen[comment_id] = None
+        if len(self._seen) > SEEN_IDS:
+            self._seen.popitem(last=False)
+        if created_at is not None and _later(created_at, self._cursor):
+            self._cursor = created_at
+        return True
+
+    async def _tick(self) -> Optional[List[str]]:
+        """Periodic work: re-check visibility and poll storage; None ends the stream."""
+        if not await self._still_visible():
+            return None
+        if self._poll is None or self._cursor is None:
+            return []
+        comments, complete = await self._poll(self._cursor)
+        events = []
+        for comment in comments:
+            comment_id, event = comment_event(self.note_id, comment)
+            if self._first_time(comment_id, comment.get("createdAt")):
+                events.append(event)
+        if not complete:
+            events.append(format_event(json.dumps({"noteId": self.note_id}), RESET_EVENT))
+        return events
+
+    async def events(
+        self, replay: List[Dict[str, Any]], complete: bool = True, cursor: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Yield the stream: retry hint, replayed comments (or a reset), then live events.
+
+        `cursor` is where polling starts (the resume point or the time the
+        stream opened); it advances with every comment sent.
+        """
+        loop = asyncio.get_running_loop()
+        tick_seconds = min(self.poll_seconds, self.heartbeat_seconds) if self._poll else self.heartbeat_seconds
+        deadline = loop.time() + self.max_seconds if self.max_seconds > 0 else None
+        self._cursor = cursor
+        try:
+            yield f"retry: {self.retry_ms}\n\n"
+            for comment in replay:
+                comment_id, event = comment_event(self.note_id, comment)
+                if self._first_time(comment_id, comment.get("createdAt")):
+                    yield event
+            if not complete:
+                yield format_event(json.dumps({"noteId": self.note_id}), RESET_EVENT)
+
+            last_sent = next_tick = loop.time()
+            next_tick += tick_seconds
+            while not self._closed:
+                now = loop.time()
+                if deadline is not None and now >= deadline:
+                    return  # the browser reconnects with its Last-Event-ID
+                if now >= next_tick:
+                    next_tick = now + tick_seconds
+                    events = await self._tick()
+                    if events is None:
+                        return
+                    if not events and now - last_sent >= self.heartbeat_seconds:
+                        events = [": keep-alive\n\n"]
+                    for event in events:
+                        yield event
+                    if events:
+                        last_sent = loop.time()
+                    continue
+                wait = next_tick - now if deadline is None else min(next_tick, deadline) - now
+                try:
+                    async with asyncio.timeout(wait):
+                        frame = await self._handoff.get()
+                except TimeoutError:
+                    continue
+                if frame is None:
+                    return
+                parsed = _frame_event(frame)
+                if parsed is None or parsed[0] in self._seen:
+                    continue
+                # The note may have been unpublished since the stream opened
+                if not await self._still_visible():
+                    return
+                if self._first_time(parsed[0], parsed[2]):
+                    yield parsed[1]
+                    last_sent = loop.time()
+        finally:
+            self.unsubscribe()
+
+    def unsubscribe(self) -> None:
+        """Leave the hub (also done when `events` ends)."""
+        self._hub.unregister(self._connection)
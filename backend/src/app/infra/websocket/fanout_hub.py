@@ -0,0 +1,245 @@
+"""In-process pub/sub hub behind the self-hosted ``/ws`` WebSocket endpoint.
+
+Used when the backend runs without API Gateway (plain uvicorn). Routing
+matches the deployed broadcast Lambda: clients subscribe to note IDs, a
+message with a ``topic`` goes to that note's subscribers, a message without
+one goes to every connection, and batches are unpacked in order.
+
+Fan-out never awaits a socket. Each message is JSON-encoded once and the same
+frame is put on every subscriber's bounded send queue; a per-connection writer
+task drains the queue to the socket. A subscriber whose queue is full, or
+whose socket does not accept a frame within ``send_timeout`` seconds, is a slow
+consumer and is evicted (closed with 1013) so it cannot hold memory or delay
+anyone else.
+
+SSE comment streams (``GET /notes/{id}/comments/stream``) subscribe here as
+well, with an additional cap on the bytes they may have queued.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.infra.websocket.local_topic_router import split_by_topic
+from app.shared.logger import get_logger
+
+
+SendText = Callable[[str], Awaitable[None]]
+Close = Callable[[int, str], Awaitable[None]]
+
+# "Try Again Later": the client may reconnect and resubscribe
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class HubConnection:
+    """One client (WebSocket or SSE stream): its topics, bounded send queue and writer task."""
+
+    def __init__(
+        self, send_text: SendText, close: Close, queue_size: int, max_pending_bytes: Optional[int] = None
+    ) -> None:
+        self.id = uuid.uuid4().hex
+        self.topics: Set[str] = set()
+        self._send_text = send_text
+        self._close = close
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        # Optional cap on queued frame bytes, on top of the frame count
+        self._max_pending_bytes = max_pending_bytes
+        self._pending_bytes = 0
+        self._writer: Optional[asyncio.Task] = None
+        self.closed = False
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._pending_bytes
+
+    def offer(self, frame: str) -> bool:
+        """Queue an encoded frame; False if the queue (or its byte cap) is full."""
+        if self._max_pending_bytes is not None and self._pending_bytes + len(frame) > self._max_pending_bytes:
+            return False
+        try:
+            self._queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            return False
+        self._pending_bytes += len(frame)
+        return True
+
+    def start(self, on_stalled: Callable[["HubConnection"], None], send_timeout: float) -> None:
+        self._writer = asyncio.create_task(self._write_loop(on_stalled, send_timeout), name=f"ws-writer-{self.id}")
+
+    async def _write_loop(self, on_stalled: Callable[["HubConnection"], None], send_timeout: float) -> None:
+        while True:
+            frame = await self._queue.get()
+            self._pending_bytes -= len(frame)
+            try:
+                # asyncio.timeout, unlike wait_for, does not wrap each send in a new task
+                async with asyncio.timeout(send_timeout):
+                    await self._send_text(frame)
+            except TimeoutError:
+                on_stalled(self)
+                return
+            except Exception:
+                # Socket already gone; the receive loop unregisters the connection
+                return
+
+    def stop(self) -> None:
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+    async def close(self, code: int, reason: str) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.stop()
+        try:
+            await self._close(code, reason)
+        except Exception:
+            pass
+
+
+class WebSocketHub:
+    def __init__(
+        self,
+        queue_size: int = 256,
+        send_timeout: float = 5.0,
+        max_subscriptions: int = 25,
+    ) -> None:
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.max_subscriptions = max_subscriptions
+        self._connections: Dict[str, HubConnection] = {}
+        self._topics: Dict[str, Set[HubConnection]] = {}
+        self._closing: Set[asyncio.Task] = set()
+        self._log = get_logger("app.websocket.hub")
+        # Metrics
+        self.published = 0
+        self.frames = 0
+        self.evicted = 0
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._connections)
+
+    def register(self, send_text: SendText, close: Close, max_pending_bytes: Optional[int] = None) -> HubConnection:
+        connection = HubConnection(send_text, close, self.queue_size, max_pending_bytes)
+        self._connections[connection.id] = connection
+        connection.start(self._on_stalled, self.send_timeout)
+        return connection
+
+    def unregister(self, connection: HubConnection) -> None:
+        if self._connections.pop(connection.id, None) is None:
+            return
+        for topic in connection.topics:
+            self._discard(topic, connection)
+        connection.topics.clear()
+        connection.stop()
+
+    def subscribe(self, connection: HubConnection, note_ids: List[Any]) -> List[str]:
+        """Subscribe to notes (up to `max_subscriptions` per connection); returns the noteIds added."""
+        accepted: List[str] = []
+        for note_id in dict.fromkeys(n for n in note_ids if isinstance(n, str) and n):
+            if note_id in connection.topics:
+                continue
+            if len(connection.topics) >= self.max_subscriptions:
+                break
+            connection.topics.add(note_id)
+            self._topics.setdefault(note_id, set()).add(connection)
+            accepted.append(note_id)
+        return accepted
+
+    def unsubscribe(self, connection: HubConnection, note_ids: List[Any]) -> List[str]:
+        removed = [n for n in note_ids if isinstance(n, str) and n in connection.topics]
+        for note_id in removed:
+            connection.topics.discard(note_id)
+            self._discard(note_id, connection)
+        return removed
+
+    def handle_client_message(self, connection: HubConnection, message: Any) -> Dict[str, Any]:
+        """Apply a client message (same protocol as the `$default` Lambda); returns the reply."""
+        action = message.get("action") if isinstance(message, dict) else None
+        note_ids = message.get("noteIds") if isinstance(message, dict) else None
+        if action == "subscribe" and isinstance(note_ids, list):
+            return {"type": "subscribed", "data": {"noteIds": self.subscribe(connection, note_ids)}}
+        if action == "unsubscribe" and isinstance(note_ids, list):
+            return {"type": "unsubscribed", "data": {"noteIds": self.unsubscribe(connection, note_ids)}}
+        return {"type": "echo", "data": {"message": "Message received"}}
+
+    def send(self, connection: HubConnection, message: Dict[str, Any]) -> None:
+        """Send a message to one connection through its queue (keeps one writer per socket)."""
+        if not connection.offer(json.dumps(message)):
+            self._evict(connection)
+
+    async def publish(self, body: Dict[str, Any]) -> bool:
+        """Fan a broadcast body (single message or batch) out to subscribers; never blocks on sockets."""
+        self.published += 1
+        slow: List[HubConnection] = []
+        for topic, message in split_by_topic(body):
+            audience = self._connections.values() if topic is None else self._topics.get(topic, ())
+            if not audience:
+                continue
+            frame = json.dumps(message)  # encoded once per message, shared by every subscriber
+            for connection in audience:
+                if connection.offer(frame):
+                    self.frames += 1
+                else:
+                    slow.append(connection)
+        for connection in slow:
+            self._evict(connection)
+        return True
+
+    def _on_stalled(self, connection: HubConnection) -> None:
+        self._evict(connection)
+
+    def _evict(self, connection: HubConnection) -> None:
+        if connection.id not in self._connections:
+            return
+        self.evicted += 1
+        self._log.warning(
+            "evicting slow websocket consumer",
+            extra={
+                "connection": connection.id,
+                "pending": connection.pending,
+                "pendingBytes": connection.pending_bytes,
+                "topics": len(connection.topics),
+            },
+        )
+        self.unregister(connection)
+        task = asyncio.create_task(connection.close(SLOW_CONSUMER_CLOSE_CODE, "slow consumer"))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _discard(self, topic: str, connection: HubConnection) -> None:
+        subscribers = self._topics.get(topic)
+        if subscribers is not None:
+            subscribers.discard(connection)
+            if not subscribers:
+                del self._topics[topic]
+
+    async def close(self) -> None:
+        """Close every connection (app shutdown)."""
+        connections = list(self._connections.values())
+        for connection in connections:
+            self.unregister(connection)
+        await asyncio.gather(
+            *(c.close(1001, "server shutdown") for c in connections),
+            *self._closing,
+            return_exceptions=True,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        pending = [c.pending for c in self._connections.values()]
+        return {
+            "connections": len(self._connections),
+            "topics": len(self._topics),
+            "published": self.published,
+            "frames": self.frames,
+            "evicted": self.evicted,
+            "queueSize": self.queue_size,
+            "maxPending": max(pending, default=0),
+        }
@@ -0,0 +1,95 @@
+"""In-process stand-in for the WebSocket connection store and broadcast Lambda."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.application.services.broadcast_coalescer import BATCH_MESSAGE_TYPE
+from app.shared.logger import get_logger
+
+
+def split_by_topic(body: Dict[str, Any]) -> List[tuple[Optional[str], Dict[str, Any]]]:
+    """Unpack a broadcast POST body into (topic, client message) pairs.
+
+    Mirrors the Lambda: a batch is unpacked in order, the routing ``topic`` is
+    removed from what clients receive, and a message without a topic is meant
+    for every connection (topic ``None``).
+    """
+    items = body.get("messages", []) if body.get("type") == BATCH_MESSAGE_TYPE else [body]
+    routed = []
+    for item in items:
+        message = {k: v for k, v in item.items() if k != "topic"}
+        routed.append((item.get("topic") or None, message))
+    return routed
+
+
+class LocalTopicRouter:
+    """Topic-routed fan-out with the same semantics as the deployed broadcast path.
+
+    Used when ``APP_SERVERLESS_WEBSOCKET_ENDPOINT=local`` so tests and offline
+    development can register connections, subscribe them to notes and assert on
+    what each connection would have received, without API Gateway or DynamoDB.
+    """
+
+    def __init__(self) -> None:
+        # noteId -> connectionIds, and the reverse index used on disconnect
+        self._subscribers: Dict[str, Set[str]] = {}
+        self._connections: Dict[str, Set[str]] = {}
+        self.delivered: Dict[str, List[Dict[str, Any]]] = {}
+        self._log = get_logger("app.websocket.local_router")
+        # Metrics
+        self.posts = 0
+        self.messages = 0
+        self.deliveries = 0
+
+    def connect(self, connection_id: str) -> None:
+        self._connections.setdefault(connection_id, set())
+        self.delivered.setdefault(connection_id, [])
+
+    def disconnect(self, connection_id: str) -> None:
+        for note_id in self._connections.pop(connection_id, set()):
+            self._discard(note_id, connection_id)
+        self.delivered.pop(connection_id, None)
+
+    def subscribe(self, connection_id: str, note_ids: Iterable[str]) -> None:
+        self.connect(connection_id)
+        for note_id in note_ids:
+            self._connections[connection_id].add(note_id)
+            self._subscribers.setdefault(note_id, set()).add(connection_id)
+
+    def unsubscribe(self, connection_id: str, note_ids: Iterable[str]) -> None:
+        for note_id in note_ids:
+            self._connections.get(connection_id, set()).discard(note_id)
+            self._discard(note_id, connection_id)
+
+    def subscribers(self, note_id: str) -> Set[str]:
+        return set(self._subscribers.get(note_id, ()))
+
+    def _discard(self, note_id: str, connection_id: str) -> None:
+        subscribers = self._subscribers.get(note_id)
+        if subscribers is not None:
+            subscribers.discard(connection_id)
+            if not subscribers:
+                del self._subscribers[note_id]
+
+    async def post(self, body: Dict[str, Any]) -> bool:
+        """Accept a broadcast POST body (single or batch) and deliver it by topic."""
+        self.posts += 1
+        for topic, message in split_by_topic(body):
+            self.messages += 1
+            audience = self._connections.keys() if topic is None else self._subscribers.get(topic, ())
+            for connection_id in audience:
+                self.delivered[connection_id].append(message)
+                self.deliveries += 1
+        self._log.debug("local broadcast", extra={"posts": self.posts, "deliveries": self.deliveries})
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self._connections),
+            "topics": len(self._subscribers),
+            "posts": self.posts,
+            "messages": self.messages,
+            "deliveries": self.deliveries,
+            "fanoutPerMessage": self.deliveries / self.messages if self.messages else 0.0,
+        }
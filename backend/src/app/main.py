@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -5,11 +7,53 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.shared import generated_imports  # noqa: F401
 
 from app.api.router import api_router
+from app.shared.auth import token_cache_stats
+from app.shared.compression import CompressionMiddleware
 from app.shared.config import get_settings
+from app.shared.dependencies import (
+    get_comment_repository,
+    get_notes_repository,
+    get_outbox_drainer,
+    get_user_repository,
+    get_websocket_hub,
+    get_websocket_service,
+)
+from app.shared.firebase_keys import get_firebase_key_store
+from app.shared.http_clients import get_http_clients
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load token signing keys before serving and keep them fresh in the background
+    key_store = get_firebase_key_store()
+    if key_store is not None:
+        await key_store.start()
+    websocket_service = get_websocket_service()
+    websocket_service.start()
+    # Pay TLS handshakes now rather than on the first broadcasts
+    http_clients = get_http_clients()
+    await http_clients.warm_up()
+    outbox_drainer = get_outbox_drainer()
+    if outbox_drainer is not None:
+        outbox_drainer.start()
+    try:
+        yield
+    finally:
+        # Deliver queued broadcasts before the process goes away
+        if outbox_drainer is not None:
+            await outbox_drainer.stop(get_settings().websocket_broadcast_drain_seconds)
+        comments = get_comment_repository()
+        if hasattr(comments, "flush_page_updates"):
+            await comments.flush_page_updates()
+        await websocket_service.close()
+        await get_websocket_hub().close()
+        if key_store is not None:
+            await key_store.stop()
+        await http_clients.aclose()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Simple Note Application API", version="1.0.0")
+    app = FastAPI(title="Simple Note Application API", version="1.0.0", lifespan=lifespan)
 
     # CORS - Only add CORS middleware for local development
     # In deployed environments (staging/production), AWS Lambda Function URL handles CORS
@@ -26,12 +70,37 @@ def create_app() -> FastAPI:
             allow_methods=["*"],
             allow_headers=["*"],
         )
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.compression_gzip_level,
+            brotli_quality=settings.compression_brotli_quality,
+            zstd_level=settings.compression_zstd_level,
+            cache_entries=settings.compression_cache_entries,
+        )
     app.include_router(api_router)
 
     # Lightweight health endpoint for Lambda Web Adapter readiness
     @app.get("/healthz")
     def healthz():
         return {"status": "ok"}
+
+    if settings.metrics_enabled:
+        @app.get("/internal/metrics", include_in_schema=False)
+        async def metrics():
+            users = get_user_repository()
+            notes = get_notes_repository()
+            outbox_drainer = get_outbox_drainer()
+            return {
+                "authTokenCache": token_cache_stats(),
+                "userCache": users.stats() if hasattr(users, "stats") else {"enabled": False},
+                "noteAccessCache": notes.stats() if hasattr(notes, "stats") else {"enabled": False},
+                "broadcast": get_websocket_service().stats(),
+                "websocketHub": get_websocket_hub().stats(),
+                "httpClients": get_http_clients().stats(),
+                "outbox": await outbox_drainer.stats() if outbox_drainer is not None else None,
+            }
     return app
 
 
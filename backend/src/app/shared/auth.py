@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import hashlib
 import os
 import json
-from typing import Optional
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
 from fastapi import Depends, HTTPException, Request, status
 from .config import get_settings
+from .firebase_keys import InvalidIdTokenError, get_firebase_key_store
+from .ttl_cache import TTLCache
 
 try:  # Optional: only used when Firebase Admin is configured
     import firebase_admin
@@ -50,11 +55,14 @@ def _verify_firebase_token_simulated(id_token: str) -> UserContext:
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
 _firebase_initialized = False
+# Monotonic time of the last failed initialization; failures are not retried on
+# every request, only once FIREBASE_INIT_RETRY_SECONDS have passed
+_firebase_init_failed_at: Optional[float] = None
 
 
 def _ensure_firebase_initialized() -> bool:
     """Initialize Firebase Admin if possible. Returns True if ready to verify tokens."""
-    global _firebase_initialized
+    global _firebase_initialized, _firebase_init_failed_at
     if _firebase_initialized:
         return True
 
@@ -62,6 +70,19 @@ def _ensure_firebase_initialized() -> bool:
         return False
 
     settings = get_settings()
+    if (
+        _firebase_init_failed_at is not None
+        and time.monotonic() - _firebase_init_failed_at < settings.firebase_init_retry_seconds
+    ):
+        return False
+    ready = _initialize_firebase_app()
+    _firebase_initialized = ready
+    _firebase_init_failed_at = None if ready else time.monotonic()
+    return ready
+
+
+def _initialize_firebase_app() -> bool:
+    settings = get_settings()
 
     # Initialize app if not already initialized
     try:
@@ -82,7 +103,6 @@ def _ensure_firebase_initialized() -> bool:
             else:
                 # No emulator and no credentials → cannot initialize
                 return False
-        _firebase_initialized = True
         return True
     except Exception:
         # Fallback to simulated mode if initialization fails
@@ -97,27 +117,101 @@ def _verify_firebase_token_admin(id_token: str) -> Optional[UserContext]:
         return None
     try:
         decoded = admin_auth.verify_id_token(id_token)  # type: ignore[union-attr]
-        uid = decoded.get("uid") or decoded.get("user_id")
-        firebase_claims = decoded.get("firebase", {}) or {}
-        provider = firebase_claims.get("sign_in_provider")
-        is_anon = provider == "anonymous" or bool(decoded.get("is_anonymous"))
-        return UserContext(
-            uid=str(uid),
-            is_anonymous=is_anon,
-            email=decoded.get("email"),
-            display_name=decoded.get("name"),
-            provider=provider,
-        )
+        user = _user_from_claims(decoded)
     except Exception:
         # If verification fails, return None so caller can fallback
         return None
+    _remember_verified_token(id_token, user, decoded.get("exp"))
+    return user
+
+
+def _verify_firebase_token_local(id_token: str) -> Optional[UserContext]:
+    """Verify a Firebase ID token against the locally held signing keys.
+    Returns None when local verification is unavailable so the caller can fall back.
+    """
+    key_store = get_firebase_key_store()
+    if key_store is None:
+        return None
+    try:
+        decoded = key_store.verify(id_token)
+    except InvalidIdTokenError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    if decoded is None:
+        return None
+    user = _user_from_claims(decoded)
+    _remember_verified_token(id_token, user, decoded.get("exp"))
+    return user
+
+
+def _user_from_claims(decoded: Dict[str, Any]) -> UserContext:
+    uid = decoded.get("uid") or decoded.get("user_id")
+    firebase_claims = decoded.get("firebase", {}) or {}
+    provider = firebase_claims.get("sign_in_provider")
+    is_anon = provider == "anonymous" or bool(decoded.get("is_anonymous"))
+    return UserContext(
+        uid=str(uid),
+        is_anonymous=is_anon,
+        email=decoded.get("email"),
+        display_name=decoded.get("name"),
+        provider=provider,
+    )
+
+
+# --- Verified token cache ---------------------------------------------------
+# Clients reuse the same ID token for up to an hour, so caching the verified
+# UserContext lets repeat requests skip the RSA signature check. Only tokens
+# that passed verification are cached, and only until shortly before `exp`.
+
+@lru_cache(maxsize=1)
+def _token_cache() -> Optional[TTLCache[str, UserContext]]:
+    settings = get_settings()
+    if settings.auth_token_cache_size <= 0:
+        return None
+    return TTLCache(max_entries=settings.auth_token_cache_size)
+
+
+def _token_cache_key(id_token: str) -> str:
+    # Never keep raw bearer tokens in memory longer than the request
+    return hashlib.sha256(id_token.encode("utf-8")).hexdigest()
+
+
+def _cached_user(id_token: str) -> Optional[UserContext]:
+    cache = _token_cache()
+    if cache is None:
+        return None
+    return cache.get(_token_cache_key(id_token))
+
+
+def _remember_verified_token(id_token: str, user: UserContext, exp: Any) -> None:
+    cache = _token_cache()
+    if cache is None or exp is None:
+        return
+    try:
+        ttl = float(exp) - time.time() - get_settings().auth_token_cache_margin_seconds
+    except (TypeError, ValueError):
+        return
+    if ttl > 0:
+        cache.set(_token_cache_key(id_token), user, ttl_seconds=ttl)
+
+
+def token_cache_stats() -> Dict[str, Any]:
+    cache = _token_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
 
 
 def get_authenticated_user(request: Request) -> UserContext:
-    token = _parse_bearer_token(request)
+    return authenticate_token(_parse_bearer_token(request))
+
+
+def authenticate_token(token: str) -> UserContext:
+    """Verify an ID token and return its user; raises 401 if it is not valid."""
     # Try real Firebase verification first if token looks like a JWT
     if "." in token:
-        user = _verify_firebase_token_admin(token)
+        user = (
+            _cached_user(token)
+            or _verify_firebase_token_local(token)
+            or _verify_firebase_token_admin(token)
+        )
         if user is not None:
             return user
     # Development fallback: simulated tokens like "anon:<uid>" or "user:<uid>"
@@ -0,0 +1,127 @@
+"""Circuit breaker and jittered backoff for calls to flaky dependencies.
+
+The breaker is closed while calls succeed. After ``failure_threshold``
+consecutive failures it opens and every call is rejected immediately (no
+timeout paid) for ``reset_timeout`` seconds. It then goes half-open and lets
+up to ``half_open_max_calls`` probe calls through: a successful probe closes
+it, a failed one opens it again for another ``reset_timeout``.
+
+Single event loop only; state changes are not synchronised across threads.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Any, Callable, Dict, Literal, Optional
+
+from app.shared.logger import get_logger
+
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+def jittered_backoff(
+    attempt: int,
+    base: float,
+    cap: float,
+    rng: Optional[random.Random] = None,
+) -> float:
+    """Delay before retry number `attempt` (1-based): full jitter over an exponential ceiling."""
+    ceiling = min(cap, base * (2 ** (attempt - 1)))
+    return (rng or random).uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state: BreakerState = "closed"
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._log = get_logger("app.circuit_breaker")
+        # Metrics
+        self.consecutive_failures = 0
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> BreakerState:
+        if self._state == "open" and self._clock() - self._opened_at >= self.reset_timeout:
+            self._transition("half_open")
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now; every allowed call must be followed by record_*() or release()."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and self._probes_in_flight < self.half_open_max_calls:
+            self._probes_in_flight += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.successes += 1
+        self.consecutive_failures = 0
+        if self._state == "half_open":
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._transition("closed")
+
+    def release(self) -> None:
+        """End an allowed call that produced no verdict (cancelled, or never sent).
+
+        Frees its half-open probe slot without closing or re-opening the breaker.
+        """
+        if self._state == "half_open":
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self._state == "half_open":
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._open()
+        elif self._state == "closed" and self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self.opened += 1
+        self._opened_at = self._clock()
+        self._transition("open")
+
+    def _transition(self, state: BreakerState) -> None:
+        if state == self._state:
+            return
+        previous, self._state = self._state, state
+        if state != "half_open":
+            self._probes_in_flight = 0
+        self._log.warning(
+            "circuit breaker state change",
+            extra={"breaker": self.name, "from": previous, "to": state, "consecutiveFailures": self.consecutive_failures},
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "consecutiveFailures": self.consecutive_failures,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "opened": self.opened,
+            "retryInSeconds": max(0.0, self.reset_timeout - (self._clock() - self._opened_at)) if state == "open" else 0.0,
+        }
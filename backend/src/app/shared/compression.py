@@ -0,0 +1,194 @@
+"""Response compression middleware (brotli / zstd / gzip) tuned for note payloads.
+
+Note lists are plain text wrapped in JSON, which compresses very well, so the
+defaults favour a fast-but-good level over maximum ratio. Small bodies are sent
+as-is because the framing overhead outweighs the savings. Streaming responses
+(`more_body=True` on the first chunk, e.g. NDJSON exports or SSE) are passed
+through untouched so they are never buffered.
+
+Compressed bodies are memoised in a bounded LRU keyed by the encoding and a
+digest of the serialized body: hot feed pages are identical across requests
+until a note changes, so repeat requests skip the compressor entirely.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.shared.ttl_cache import TTLCache
+
+try:  # Optional: only used when the `compression` extra is installed
+    import brotli
+except Exception:  # pragma: no cover - optional dependency at runtime
+    brotli = None
+
+try:  # Optional: only used when the `compression` extra is installed
+    import zstandard
+except Exception:  # pragma: no cover - optional dependency at runtime
+    zstandard = None
+
+
+# Server-side preference when the client accepts several encodings equally
+PREFERRED_ENCODINGS = ("br", "zstd", "gzip")
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/problem+json",
+    "text/",
+)
+
+# Bodies larger than this are compressed but never memoised
+MAX_CACHEABLE_BODY = 1024 * 1024
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        token = part.strip()
+        if not token:
+            continue
+        coding, _, params = token.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+class Compressor:
+    """Compresses bytes with every encoding available in this process."""
+
+    def __init__(self, gzip_level: int = 6, brotli_quality: int = 5, zstd_level: int = 6) -> None:
+        self._codecs: Dict[str, Callable[[bytes], bytes]] = {
+            "gzip": lambda body: gzip.compress(body, compresslevel=gzip_level, mtime=0),
+        }
+        if brotli is not None:
+            self._codecs["br"] = lambda body: brotli.compress(
+                body, quality=brotli_quality, mode=brotli.MODE_TEXT
+            )
+        if zstandard is not None:
+            zstd = zstandard.ZstdCompressor(level=zstd_level)
+            self._codecs["zstd"] = zstd.compress
+
+    @property
+    def encodings(self) -> List[str]:
+        return [e for e in PREFERRED_ENCODINGS if e in self._codecs]
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        """Pick the best supported encoding for an Accept-Encoding header, if any."""
+        if not accept_encoding:
+            return None
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*")
+        best: Optional[Tuple[float, str]] = None
+        for encoding in self.encodings:
+            q = accepted.get(encoding, wildcard if wildcard is not None else 0.0)
+            if q > 0 and (best is None or q > best[0]):
+                best = (q, encoding)
+        return best[1] if best else None
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        return self._codecs[encoding](body)
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        zstd_level: int = 6,
+        cache_entries: int = 256,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compressor = Compressor(gzip_level, brotli_quality, zstd_level)
+        self.cache: Optional[TTLCache[Tuple[str, bytes], bytes]] = (
+            TTLCache(max_entries=cache_entries) if cache_entries > 0 else None
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.compressor.negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def compress_cached(self, encoding: str, body: bytes) -> bytes:
+        if self.cache is None or len(body) > MAX_CACHEABLE_BODY:
+            return self.compressor.compress(encoding, body)
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = self.compressor.compress(encoding, body)
+            self.cache.set(key, compressed)
+        return compressed
+
+
+class _CompressionResponder:
+    """Per-request send wrapper; buffers only the start message until the body arrives."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Optional[Message] = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+        start = self._start
+        if start is None:  # pragma: no cover - ASGI servers always send start first
+            await self._send(message)
+            return
+        headers = MutableHeaders(raw=start["headers"])
+        body: bytes = message.get("body", b"")
+        if message.get("more_body", False) or not self._should_compress(headers, body):
+            # Streaming or not worth compressing: forward everything unchanged
+            self._passthrough = True
+            if self._is_compressible_type(headers):
+                headers.add_vary_header("Accept-Encoding")
+            await self._send(start)
+            await self._send(message)
+            return
+
+        compressed = self.middleware.compress_cached(self.encoding, body)
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        headers.add_vary_header("Accept-Encoding")
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    def _should_compress(self, headers: MutableHeaders, body: bytes) -> bool:
+        if len(body) < self.middleware.minimum_size:
+            return False
+        if "content-encoding" in headers:
+            return False
+        return self._is_compressible_type(headers)
+
+    @staticmethod
+    def _is_compressible_type(headers: MutableHeaders) -> bool:
+        content_type = headers.get("content-type", "").lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES)
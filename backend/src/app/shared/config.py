@@ -44,6 +44,22 @@ class Settings:
     firebase_credentials_json: Optional[str] = os.getenv("FIREBASE_CREDENTIALS_JSON")
     firebase_auth_emulator_host: Optional[str] = os.getenv("FIREBASE_AUTH_EMULATOR_HOST")
 
+    # Local ID-token verification ("local" verifies against cached signing keys,
+    # "admin" always defers to the Admin SDK). FIREBASE_CERTS_FILE replaces the
+    # remote key endpoint for offline development and tests.
+    firebase_token_verifier: str = os.getenv("FIREBASE_TOKEN_VERIFIER", "local").lower()
+    firebase_certs_url: str = os.getenv(
+        "FIREBASE_CERTS_URL",
+        "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com",
+    )
+    firebase_certs_file: Optional[str] = os.getenv("FIREBASE_CERTS_FILE")
+    firebase_certs_refresh_margin_seconds: int = int(os.getenv("FIREBASE_CERTS_REFRESH_MARGIN_SECONDS", "300"))
+    firebase_init_retry_seconds: int = int(os.getenv("FIREBASE_INIT_RETRY_SECONDS", "60"))
+
+    # Verified ID-token cache (0 disables it)
+    auth_token_cache_size: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+    auth_token_cache_margin_seconds: int = int(os.getenv("AUTH_TOKEN_CACHE_MARGIN_SECONDS", "60"))
+
     # Repository Configuration
     repository_provider: str = os.getenv("REPOSITORY_PROVIDER", "memory")
     environment: str = os.getenv("ENVIRONMENT", "development")
@@ -57,11 +73,112 @@ class Settings:
     # DynamoDB Configuration
     dynamodb_table_notes: str = os.getenv("DYNAMODB_TABLE_NOTES", "notes")
     dynamodb_table_users: str = os.getenv("DYNAMODB_TABLE_USERS", "users")
+    dynamodb_table_comments: str = os.getenv("DYNAMODB_TABLE_COMMENTS", "comments")
+    dynamodb_table_outbox: str = os.getenv("DYNAMODB_TABLE_OUTBOX", "comment-outbox")
+    dynamodb_table_comment_pages: str = os.getenv("DYNAMODB_TABLE_COMMENT_PAGES", "comment-pages")
+    dynamodb_table_ownership_transfers: str = os.getenv("DYNAMODB_TABLE_OWNERSHIP_TRANSFERS", "ownership-transfers")
+
+    # In-process user profile cache in front of DynamoDB (0 disables it)
+    user_cache_size: int = int(os.getenv("USER_CACHE_SIZE", "1000"))
+    user_cache_ttl_seconds: int = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+    # In-process note visibility cache (id -> owner, is_public) for comment
+    # endpoints; local writes invalidate it, other instances within the TTL (0 disables it)
+    note_access_cache_size: int = int(os.getenv("NOTE_ACCESS_CACHE_SIZE", "10000"))
+    note_access_cache_ttl_seconds: int = int(os.getenv("NOTE_ACCESS_CACHE_TTL_SECONDS", "30"))
+
+    # Query a note's comments while its visibility is checked instead of after
+    # (one round trip instead of two; wasted reads on unauthorized requests)
+    comment_list_speculative: bool = _get_bool("COMMENT_LIST_SPECULATIVE", default=False)
+    # Delta comment fetches (?since=): how far behind now the returned
+    # high-water mark stays, so comments indexed late are not skipped
+    comment_delta_settle_seconds: float = float(os.getenv("COMMENT_DELTA_SETTLE_SECONDS", "5"))
+    # DynamoDB: seal every N comments of a note into one page bucket item, so
+    # listing old pages reads buckets by key instead of the whole thread
+    # (0 disables; at most 64 so a bucket fits one item)
+    comment_page_bucket_size: int = int(os.getenv("COMMENT_PAGE_BUCKET_SIZE", "0"))
+
+    # Notes moved per OwnerIndex page when an anonymous account is promoted
+    ownership_transfer_page_size: int = int(os.getenv("OWNERSHIP_TRANSFER_PAGE_SIZE", "100"))
+    # A run that saves no progress for this long is taken over by the next resume
+    ownership_transfer_lease_seconds: float = float(os.getenv("OWNERSHIP_TRANSFER_LEASE_SECONDS", "60"))
     
     # WebSocket Configuration
     app_serverless_websocket_endpoint: Optional[str] = os.getenv("APP_SERVERLESS_WEBSOCKET_ENDPOINT")
+    # Broadcast delivery: "queue" (background workers), "coalesce" (queue + batching
+    # per window), "inline" (within the request) or "outbox" (event stored with
+    # the comment, delivered at-least-once by a background drainer). Lambda
+    # freezes the process once the response is sent, so it defaults to inline there
+    websocket_broadcast_mode: str = os.getenv(
+        "WEBSOCKET_BROADCAST_MODE", "inline" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "queue"
+    ).lower()
+    websocket_broadcast_queue_size: int = int(os.getenv("WEBSOCKET_BROADCAST_QUEUE_SIZE", "1000"))
+    websocket_broadcast_workers: int = int(os.getenv("WEBSOCKET_BROADCAST_WORKERS", "4"))
+    # drop_oldest | drop_newest | block
+    websocket_broadcast_drop_policy: str = os.getenv("WEBSOCKET_BROADCAST_DROP_POLICY", "drop_oldest").lower()
+    websocket_broadcast_drain_seconds: float = float(os.getenv("WEBSOCKET_BROADCAST_DRAIN_SECONDS", "10"))
+    # Coalescing window (max added latency) and batch size cap for "coalesce" mode
+    websocket_broadcast_window_ms: int = int(os.getenv("WEBSOCKET_BROADCAST_WINDOW_MS", "30"))
+    websocket_broadcast_max_batch: int = int(os.getenv("WEBSOCKET_BROADCAST_MAX_BATCH", "100"))
+    # Broadcast endpoint HTTP budgets, retries (jittered exponential backoff)
+    # and circuit breaker (opens after N consecutive failures, probes after reset)
+    websocket_broadcast_connect_timeout_seconds: float = float(os.getenv("WEBSOCKET_BROADCAST_CONNECT_TIMEOUT_SECONDS", "2"))
+    websocket_broadcast_read_timeout_seconds: float = float(os.getenv("WEBSOCKET_BROADCAST_READ_TIMEOUT_SECONDS", "10"))
+    websocket_broadcast_max_attempts: int = int(os.getenv("WEBSOCKET_BROADCAST_MAX_ATTEMPTS", "3"))
+    websocket_broadcast_retry_base_ms: int = int(os.getenv("WEBSOCKET_BROADCAST_RETRY_BASE_MS", "100"))
+    websocket_broadcast_retry_max_ms: int = int(os.getenv("WEBSOCKET_BROADCAST_RETRY_MAX_MS", "2000"))
+    websocket_breaker_failure_threshold: int = int(os.getenv("WEBSOCKET_BREAKER_FAILURE_THRESHOLD", "5"))
+    websocket_breaker_reset_seconds: float = float(os.getenv("WEBSOCKET_BREAKER_RESET_SECONDS", "30"))
+    # Outbox drainer ("outbox" mode): events per batch, idle poll interval,
+    # claim lease (redelivered after it expires) and attempts before an event is dropped
+    outbox_batch_size: int = int(os.getenv("OUTBOX_BATCH_SIZE", "25"))
+    outbox_poll_seconds: float = float(os.getenv("OUTBOX_POLL_SECONDS", "1"))
+    outbox_lease_seconds: float = float(os.getenv("OUTBOX_LEASE_SECONDS", "30"))
+    outbox_max_attempts: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+    # Self-hosted /ws hub (used when no broadcast endpoint is configured):
+    # frames buffered per connection before it is evicted as a slow consumer,
+    # max seconds a single socket send may take, and notes per connection
+    websocket_hub_queue_size: int = int(os.getenv("WEBSOCKET_HUB_QUEUE_SIZE", "256"))
+    websocket_hub_send_timeout_seconds: float = float(os.getenv("WEBSOCKET_HUB_SEND_TIMEOUT_SECONDS", "5"))
+    websocket_hub_max_subscriptions: int = int(os.getenv("WEBSOCKET_HUB_MAX_SUBSCRIPTIONS", "25"))
+    # SSE comment streams (GET /notes/{id}/comments/stream): idle keep-alive
+    # interval, bytes a stream may have queued before it is evicted, and
+    # comments replayed on a Last-Event-ID resume before asking for a re-fetch
+    comment_stream_heartbeat_seconds: float = float(os.getenv("COMMENT_STREAM_HEARTBEAT_SECONDS", "15"))
+    comment_stream_max_buffer_bytes: int = int(os.getenv("COMMENT_STREAM_MAX_BUFFER_BYTES", "262144"))
+    comment_stream_max_replay: int = int(os.getenv("COMMENT_STREAM_MAX_REPLAY", "500"))
+    # How often a stream reads new comments from storage when broadcasts go to
+    # an external endpoint (other instances' comments never reach this hub),
+    # and how long a stream may stay open (0 = no limit; keep it under the
+    # Lambda timeout so the stream ends cleanly and the browser resumes)
+    comment_stream_poll_seconds: float = float(os.getenv("COMMENT_STREAM_POLL_SECONDS", "5"))
+    comment_stream_max_seconds: float = float(os.getenv("COMMENT_STREAM_MAX_SECONDS", "0"))
+
+    # Outbound HTTP clients (broadcast endpoint, certificate fetches): pool cap,
+    # idle keep-alive pool, optional HTTP/2 (needs the `http2` extra) and
+    # connections opened per client at startup
+    http_client_max_connections: int = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "100"))
+    http_client_max_keepalive_connections: int = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    http_client_keepalive_expiry_seconds: float = float(os.getenv("HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    http_client_http2: bool = _get_bool("HTTP_CLIENT_HTTP2", default=False)
+    http_client_warmup_connections: int = int(os.getenv("HTTP_CLIENT_WARMUP_CONNECTIONS", "2"))
+
+    # HTTP caching for public endpoints (CDN in front of the Lambda)
+    public_cache_max_age: int = int(os.getenv("PUBLIC_CACHE_MAX_AGE", "30"))
+    public_cache_s_maxage: int = int(os.getenv("PUBLIC_CACHE_S_MAXAGE", "300"))
+    public_cache_stale_while_revalidate: int = int(os.getenv("PUBLIC_CACHE_STALE_WHILE_REVALIDATE", "600"))
+
+    # Response compression (brotli/zstd need the `compression` extra)
+    compression_enabled: bool = _get_bool("COMPRESSION_ENABLED", default=True)
+    compression_minimum_size: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    compression_gzip_level: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    compression_brotli_quality: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+    compression_zstd_level: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "6"))
+    compression_cache_entries: int = int(os.getenv("COMPRESSION_CACHE_ENTRIES", "256"))
+
+    # Operational metrics endpoint (cache hit rates etc.); keep off in public deployments
+    metrics_enabled: bool = _get_bool("METRICS_ENABLED", default=False)
 
-    
     # Misc
     log_level: str = os.getenv("LOG_LEVEL", "info")
 
@@ -4,6 +4,8 @@ Adds environment-driven DI switching between in-memory and DynamoDB repositories
 """
 
 from functools import lru_cache
+from typing import Optional
+
 from fastapi import Depends
 
 from app.shared.config import get_settings
@@ -11,17 +13,42 @@ from app.infra.repositories.in_memory_notes_repository import InMemoryNotesRepos
 from app.infra.repositories.dynamodb_notes_repository import DynamoDBNotesRepository
 from app.infra.repositories.in_memory_user_repository import InMemoryUserRepository
 from app.infra.repositories.dynamodb_user_repository import DynamoDBUserRepository
+from app.infra.repositories.caching_user_repository import CachingUserRepository
+from app.infra.repositories.caching_notes_repository import CachingNotesRepository
 from app.infra.repositories.in_memory_comment_repository import InMemoryCommentRepository
+from app.infra.repositories.dynamodb_comment_repository import DynamoDBCommentRepository
+from app.infra.repositories.in_memory_outbox_repository import InMemoryOutboxRepository
+from app.infra.repositories.dynamodb_outbox_repository import DynamoDBOutboxRepository
+from app.infra.repositories.in_memory_ownership_transfer_repository import InMemoryOwnershipTransferRepository
+from app.infra.repositories.dynamodb_ownership_transfer_repository import DynamoDBOwnershipTransferRepository
+from app.infra.cdn.recording_cache_purger import RecordingCachePurger
+from app.infra.websocket.fanout_hub import WebSocketHub
+from app.infra.websocket.local_topic_router import LocalTopicRouter
 from app.application.services.notes_service import NotesApplicationService
 from app.application.services.user_service import UserApplicationService
+from app.application.services.ownership_transfer_service import OwnershipTransferService
 from app.application.services.comment_service import CommentApplicationService
-from app.application.services.websocket_service import WebSocketService
+from app.application.services.outbox_drainer import OutboxDrainer
+from app.application.services.websocket_service import WebSocketService, broadcast_timeout, broadcast_url
+from app.shared.http_clients import get_http_clients
 
 
 # Repository layer dependencies
 @lru_cache()
 def get_notes_repository():
-    """Get singleton notes repository instance (in-memory or DynamoDB)."""
+    """Get singleton notes repository instance, with a visibility cache unless disabled."""
+    settings = get_settings()
+    repository = _create_notes_repository()
+    if settings.note_access_cache_size > 0 and not isinstance(repository, InMemoryNotesRepository):
+        return CachingNotesRepository(
+            repository,
+            max_entries=settings.note_access_cache_size,
+            ttl_seconds=settings.note_access_cache_ttl_seconds,
+        )
+    return repository
+
+
+def _create_notes_repository():
     settings = get_settings()
     provider = (settings.repository_provider or "memory").lower()
     if provider == "dynamodb":
@@ -52,7 +79,19 @@ def get_notes_repository():
 
 @lru_cache()
 def get_user_repository():
-    """Get singleton user repository instance."""
+    """Get singleton user repository instance, cached in memory unless disabled."""
+    settings = get_settings()
+    repository = _create_user_repository()
+    if settings.user_cache_size > 0 and not isinstance(repository, InMemoryUserRepository):
+        return CachingUserRepository(
+            repository,
+            max_entries=settings.user_cache_size,
+            ttl_seconds=settings.user_cache_ttl_seconds,
+        )
+    return repository
+
+
+def _create_user_repository():
     settings = get_settings()
     provider = (settings.repository_provider or "memory").lower()
     if provider == "dynamodb":
@@ -81,12 +120,19 @@ def get_user_repository():
     return InMemoryUserRepository()
 
 
+@lru_cache()
+def get_cache_purger():
+    """Get singleton CDN cache purger (only the logging stand-in is built in)."""
+    return RecordingCachePurger()
+
+
 # Application layer dependencies
 def get_notes_application_service(
     notes_repository=Depends(get_notes_repository),
+    cache_purger=Depends(get_cache_purger),
 ) -> NotesApplicationService:
     """FastAPI dependency for notes application service."""
-    return NotesApplicationService(notes_repository)
+    return NotesApplicationService(notes_repository, cache_purger)
 
 
 def get_user_application_service(
@@ -96,34 +142,196 @@ def get_user_application_service(
     return UserApplicationService(user_repository)
 
 
+@lru_cache()
+def get_ownership_transfer_repository():
+    """Get singleton ownership transfer store (in-memory or DynamoDB)."""
+    settings = get_settings()
+    provider = (settings.repository_provider or "memory").lower()
+    if provider == "dynamodb":
+        env = (settings.environment or "development").lower()
+        is_dev = env == "development"
+
+        if is_dev and settings.aws_endpoint_url and settings.aws_endpoint_url.strip():
+            return DynamoDBOwnershipTransferRepository(
+                table_name=settings.dynamodb_table_ownership_transfers,
+                endpoint_url=settings.aws_endpoint_url,
+                region_name=settings.aws_region,
+                aws_access_key_id=settings.aws_access_key_id,
+                aws_secret_access_key=settings.aws_secret_access_key,
+            )
+        else:
+            return DynamoDBOwnershipTransferRepository(
+                table_name=settings.dynamodb_table_ownership_transfers,
+                endpoint_url=None,
+                region_name=settings.aws_region,
+                aws_access_key_id=None,
+                aws_secret_access_key=None,
+            )
+    return InMemoryOwnershipTransferRepository()
+
+
+@lru_cache()
+def get_ownership_transfer_service() -> OwnershipTransferService:
+    """Get singleton ownership transfer service (it runs transfers on this instance)."""
+    settings = get_settings()
+    return OwnershipTransferService(
+        get_notes_repository(),
+        get_comment_repository(),
+        get_ownership_transfer_repository(),
+        get_cache_purger(),
+        page_size=settings.ownership_transfer_page_size,
+        lease_seconds=settings.ownership_transfer_lease_seconds,
+    )
+
+
 # Comment repository dependencies
 @lru_cache()
 def get_comment_repository():
-    """Get singleton comment repository instance (in-memory only for now)."""
-    # For now, only support in-memory comments
-    # TODO: Add DynamoDB comment repository when needed
-    return InMemoryCommentRepository()
+    """Get singleton comment repository instance (in-memory or DynamoDB), sharing the outbox."""
+    settings = get_settings()
+    provider = (settings.repository_provider or "memory").lower()
+    if provider == "dynamodb":
+        env = (settings.environment or "development").lower()
+        is_dev = env == "development"
+
+        # Use local DynamoDB with explicit credentials only in development
+        if is_dev and settings.aws_endpoint_url and settings.aws_endpoint_url.strip():
+            return DynamoDBCommentRepository(
+                table_name=settings.dynamodb_table_comments,
+                outbox_table_name=settings.dynamodb_table_outbox,
+                notes_table_name=settings.dynamodb_table_notes,
+                pages_table_name=settings.dynamodb_table_comment_pages,
+                page_bucket_size=settings.comment_page_bucket_size,
+                seal_settle_seconds=settings.comment_delta_settle_seconds,
+                endpoint_url=settings.aws_endpoint_url,
+                region_name=settings.aws_region,
+                aws_access_key_id=settings.aws_access_key_id,
+                aws_secret_access_key=settings.aws_secret_access_key,
+            )
+        else:
+            # AWS Lambda/Staging/Production - use IAM role
+            return DynamoDBCommentRepository(
+                table_name=settings.dynamodb_table_comments,
+                outbox_table_name=settings.dynamodb_table_outbox,
+                notes_table_name=settings.dynamodb_table_notes,
+                pages_table_name=settings.dynamodb_table_comment_pages,
+                page_bucket_size=settings.comment_page_bucket_size,
+                seal_settle_seconds=settings.comment_delta_settle_seconds,
+                endpoint_url=None,
+                region_name=settings.aws_region,
+                aws_access_key_id=None,
+                aws_secret_access_key=None,
+            )
+    return InMemoryCommentRepository(outbox=get_outbox_repository(), notes=get_notes_repository())
+
+
+@lru_cache()
+def get_outbox_repository():
+    """Get singleton comment event outbox (in-memory or DynamoDB)."""
+    settings = get_settings()
+    provider = (settings.repository_provider or "memory").lower()
+    if provider == "dynamodb":
+        env = (settings.environment or "development").lower()
+        is_dev = env == "development"
+
+        if is_dev and settings.aws_endpoint_url and settings.aws_endpoint_url.strip():
+            return DynamoDBOutboxRepository(
+                table_name=settings.dynamodb_table_outbox,
+                endpoint_url=settings.aws_endpoint_url,
+                region_name=settings.aws_region,
+                aws_access_key_id=settings.aws_access_key_id,
+                aws_secret_access_key=settings.aws_secret_access_key,
+            )
+        else:
+            return DynamoDBOutboxRepository(
+                table_name=settings.dynamodb_table_outbox,
+                endpoint_url=None,
+                region_name=settings.aws_region,
+                aws_access_key_id=None,
+                aws_secret_access_key=None,
+            )
+    return InMemoryOutboxRepository()
+
+
+@lru_cache()
+def get_outbox_drainer() -> Optional[OutboxDrainer]:
+    """Singleton outbox drainer; only built when WEBSOCKET_BROADCAST_MODE is "outbox"."""
+    settings = get_settings()
+    if settings.websocket_broadcast_mode != "outbox":
+        return None
+    return OutboxDrainer(
+        get_outbox_repository(),
+        get_websocket_service().deliver,
+        batch_size=settings.outbox_batch_size,
+        poll_interval=settings.outbox_poll_seconds,
+        lease_seconds=settings.outbox_lease_seconds,
+        max_attempts=settings.outbox_max_attempts,
+    )
 
 
 # WebSocket service dependency
 @lru_cache()
 def get_websocket_service() -> WebSocketService:
-    """Get singleton WebSocket service instance."""
-    return WebSocketService()
+    """Get singleton WebSocket service instance.
+
+    Broadcasts go to the configured API Gateway broadcast endpoint (and are
+    mirrored to the in-process hub for SSE streams); without one, to the
+    self-hosted /ws hub; with "local", to the in-process topic router used
+    by tests.
+    """
+    endpoint = (get_settings().app_serverless_websocket_endpoint or "").strip()
+    if endpoint.lower() == "local":
+        return WebSocketService(local_sink=get_local_topic_router().post)
+    if not endpoint:
+        return WebSocketService(local_sink=get_websocket_hub().publish)
+    client = get_http_clients().client(
+        "websocket-broadcast", timeout=broadcast_timeout(), warm_url=broadcast_url(endpoint)
+    )
+    # SSE comment streams on this instance are fed from the hub either way
+    return WebSocketService(client=client, local_mirror=get_websocket_hub().publish)
+
+
+@lru_cache()
+def get_local_topic_router() -> LocalTopicRouter:
+    """In-process topic router standing in for the broadcast endpoint."""
+    return LocalTopicRouter()
+
+
+@lru_cache()
+def get_websocket_hub() -> WebSocketHub:
+    """Singleton pub/sub hub behind the self-hosted /ws endpoint."""
+    settings = get_settings()
+    return WebSocketHub(
+        queue_size=settings.websocket_hub_queue_size,
+        send_timeout=settings.websocket_hub_send_timeout_seconds,
+        max_subscriptions=settings.websocket_hub_max_subscriptions,
+    )
 
 
 def get_comment_application_service(
     comment_repository=Depends(get_comment_repository),
     notes_repository=Depends(get_notes_repository),
     websocket_service=Depends(get_websocket_service),
+    outbox_drainer=Depends(get_outbox_drainer),
+    cache_purger=Depends(get_cache_purger),
 ) -> CommentApplicationService:
     """FastAPI dependency for comment application service."""
-    return CommentApplicationService(comment_repository, notes_repository, websocket_service)
+    settings = get_settings()
+    return CommentApplicationService(
+        comment_repository,
+        notes_repository,
+        websocket_service,
+        outbox_drainer,
+        speculative_list=settings.comment_list_speculative,
+        delta_settle_seconds=settings.comment_delta_settle_seconds,
+        cache_purger=cache_purger,
+    )
 
 
 # Legacy dependency names for backward compatibility
 def get_unified_notes_application_service(
     notes_repository=Depends(get_notes_repository),
+    cache_purger=Depends(get_cache_purger),
 ) -> NotesApplicationService:
     """Backward compatibility alias for notes application service."""
-    return NotesApplicationService(notes_repository)
\ No newline at end of file
+    return NotesApplicationService(notes_repository, cache_purger)
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""Async byte-stream encoders for exports (NDJSON, optionally zipped).
+
+Both encoders consume an async iterator lazily and only ever hold the
+current page of records plus the compressor's window in memory, so the
+memory footprint stays constant no matter how many records are exported.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List
+
+
+async def ndjson_pages(pages: AsyncIterable[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """Encode each page of records as newline-delimited JSON (one chunk per page)."""
+    async for page in pages:
+        if page:
+            yield "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in page).encode("utf-8")
+
+
+class _ZipSink(io.RawIOBase):
+    """Write-only, non-seekable sink; zipfile then emits data descriptors instead of seeking back."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:  # type: ignore[override]
+        data = bytes(b)
+        self._chunks.append(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def zip_stream(chunks: AsyncIterable[bytes], filename: str) -> AsyncIterator[bytes]:
+    """Wrap a byte stream into a single-entry deflated zip archive, streaming as it goes."""
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open(filename, mode="w", force_zip64=True) as entry:
+            async for chunk in chunks:
+                entry.write(chunk)
+                data = sink.drain()
+                if data:
+                    yield data
+        data = sink.drain()
+        if data:
+            yield data
+    # Central directory is written when the archive closes
+    data = sink.drain()
+    if data:
+        yield data
@@ -0,0 +1,221 @@
+"""Local Firebase ID-token verification against Google's published signing keys.
+
+The Admin SDK fetches Google's certificates lazily inside the request path.
+`FirebaseKeyStore` instead loads them once at startup (see the lifespan in
+`app.main`) and refreshes them in a background task shortly before they expire,
+so requests only ever do an in-memory key lookup plus a local RS256 check.
+
+Keys come from `FIREBASE_CERTS_URL` (either Google's x509 `{kid: PEM}` map or a
+JWKS document) or, for offline development and tests, from `FIREBASE_CERTS_FILE`
+holding the same JSON.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.shared.config import get_settings
+from app.shared.http_clients import get_http_clients
+from app.shared.logger import get_logger
+
+try:  # Optional: PyJWT[crypto] ships with firebase-admin
+    import jwt
+    from cryptography.x509 import load_pem_x509_certificate
+except Exception:  # pragma: no cover - optional dependency at runtime
+    jwt = None
+    load_pem_x509_certificate = None
+
+
+_log = get_logger("app.firebase_keys")
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class InvalidIdTokenError(Exception):
+    """The token was checked against a known key and rejected."""
+
+
+class FirebaseKeyStore:
+    def __init__(
+        self,
+        project_id: str,
+        certs_url: Optional[str] = None,
+        certs_file: Optional[str] = None,
+        refresh_interval_seconds: float = 3600.0,
+        refresh_margin_seconds: float = 300.0,
+        retry_seconds: float = 30.0,
+        leeway_seconds: int = 5,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        self.project_id = project_id
+        # Shared client from the app's HttpClients (keeps the TLS connection between refreshes)
+        self.client = client
+        self.certs_url = certs_url
+        self.certs_file = certs_file
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.retry_seconds = retry_seconds
+        self.leeway_seconds = leeway_seconds
+        self.issuer = f"https://securetoken.google.com/{project_id}"
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._loaded_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_now = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._keys)
+
+    async def start(self) -> None:
+        """Load keys (best effort) and start the background refresher."""
+        self._loop = asyncio.get_running_loop()
+        try:
+            await self.refresh()
+        except Exception as exc:
+            _log.warning("firebase_keys: initial load failed", extra={"error": str(exc)})
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        task, self._refresh_task = self._refresh_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def refresh(self) -> None:
+        if self.certs_file:
+            raw = await asyncio.to_thread(_read_file, self.certs_file)
+            max_age = self.refresh_interval_seconds
+        elif self.certs_url:
+            if self.client is not None:
+                resp = await self.client.get(self.certs_url)
+            else:
+                async with httpx.AsyncClient(timeout=10.0) as client:
+                    resp = await client.get(self.certs_url)
+            resp.raise_for_status()
+            raw = resp.text
+            match = _MAX_AGE_RE.search(resp.headers.get("cache-control", ""))
+            max_age = float(match.group(1)) if match else self.refresh_interval_seconds
+        else:
+            raise RuntimeError("No FIREBASE_CERTS_URL or FIREBASE_CERTS_FILE configured")
+        # PEM/JWK parsing is CPU work; keep it off the event loop
+        self._keys = await asyncio.to_thread(_parse_keys, raw)
+        self._loaded_at = time.time()
+        self._expires_at = self._loaded_at + max_age
+        _log.info("firebase_keys: loaded", extra={"kids": sorted(self._keys), "maxAge": max_age})
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            if self.ready:
+                delay = max(self._expires_at - time.time() - self.refresh_margin_seconds, self.retry_seconds)
+            else:
+                delay = self.retry_seconds
+            try:
+                await asyncio.wait_for(self._refresh_now.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._refresh_now.clear()
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # Keep serving with the previous keys until a refresh succeeds
+                _log.warning("firebase_keys: refresh failed", extra={"error": str(exc)})
+
+    def verify(self, id_token: str) -> Optional[Dict[str, Any]]:
+        """Verify a token locally.
+
+        Returns the decoded claims, or None when no key is available to decide
+        (keys not loaded yet or an unknown `kid`). Raises `InvalidIdTokenError`
+        when the token is rejected.
+        """
+        if jwt is None or not self.ready:
+            return None
+        try:
+            header = jwt.get_unverified_header(id_token)
+        except jwt.PyJWTError as exc:
+            raise InvalidIdTokenError(str(exc)) from exc
+        if header.get("alg") != "RS256":
+            raise InvalidIdTokenError("unexpected alg")
+        key = self._keys.get(header.get("kid"))
+        if key is None:
+            # Probably a key rotation we have not picked up yet; verify() runs in
+            # the threadpool, so wake the refresher through its loop. Throttled so
+            # forged kids cannot hammer the cert endpoint.
+            if self._loop is not None and time.time() - self._loaded_at >= self.retry_seconds:
+                self._loop.call_soon_threadsafe(self._refresh_now.set)
+            return None
+        try:
+            decoded = jwt.decode(
+                id_token,
+                key=key,
+                algorithms=["RS256"],
+                audience=self.project_id,
+                issuer=self.issuer,
+                leeway=self.leeway_seconds,
+                options={"require": ["exp", "iat", "sub"]},
+            )
+        except jwt.PyJWTError as exc:
+            raise InvalidIdTokenError(str(exc)) from exc
+        if not decoded.get("sub"):
+            raise InvalidIdTokenError("empty sub")
+        auth_time = decoded.get("auth_time")
+        if auth_time is not None and float(auth_time) > time.time() + self.leeway_seconds:
+            raise InvalidIdTokenError("auth_time in the future")
+        decoded.setdefault("uid", decoded["sub"])
+        return decoded
+
+
+def _read_file(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _parse_keys(raw: str) -> Dict[str, Any]:
+    """Parse either a JWKS document or Google's x509 `{kid: PEM}` map."""
+    if jwt is None or load_pem_x509_certificate is None:
+        raise RuntimeError("PyJWT[crypto] is not installed")
+    data = json.loads(raw)
+    keys: Dict[str, Any] = {}
+    if isinstance(data, dict) and isinstance(data.get("keys"), list):
+        for jwk in data["keys"]:
+            kid = jwk.get("kid")
+            if kid:
+                keys[kid] = jwt.PyJWK(jwk).key
+    else:
+        for kid, pem in data.items():
+            keys[kid] = load_pem_x509_certificate(pem.encode("utf-8")).public_key()
+    if not keys:
+        raise ValueError("no signing keys found")
+    return keys
+
+
+@lru_cache(maxsize=1)
+def get_firebase_key_store() -> Optional[FirebaseKeyStore]:
+    """Singleton key store, or None when local verification is not applicable."""
+    settings = get_settings()
+    if settings.firebase_token_verifier != "local" or jwt is None:
+        return None
+    # Emulator tokens are unsigned; leave them to the Admin SDK
+    if not settings.firebase_project_id or settings.firebase_auth_emulator_host:
+        return None
+    return FirebaseKeyStore(
+        project_id=settings.firebase_project_id,
+        certs_url=settings.firebase_certs_url,
+        certs_file=settings.firebase_certs_file,
+        refresh_margin_seconds=settings.firebase_certs_refresh_margin_seconds,
+        client=get_http_clients().client("firebase-certs", timeout=10.0) if settings.firebase_certs_url else None,
+    )
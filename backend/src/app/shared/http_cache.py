@@ -0,0 +1,42 @@
+"""Cache-Control and surrogate-key helpers for CDN-cacheable responses."""
+
+from __future__ import annotations
+
+from typing import Iterable, List
+
+from fastapi import Response
+
+from app.shared.config import get_settings
+
+
+# Surrogate key attached to every page of the public feed (`GET /notes`)
+FEED_SURROGATE_KEY = "notes"
+
+
+def note_surrogate_key(note_id: str) -> str:
+    """Surrogate key for a single public note (`GET /notes/{id}`)."""
+    return f"note-{note_id}"
+
+
+def note_surrogate_keys(note_id: str) -> List[str]:
+    """Keys to purge when a note changes: the note itself and the feed that may list it."""
+    return [note_surrogate_key(note_id), FEED_SURROGATE_KEY]
+
+
+def public_cache_control() -> str:
+    """Build the Cache-Control value for public, anonymous responses."""
+    settings = get_settings()
+    directives = [
+        "public",
+        f"max-age={settings.public_cache_max_age}",
+        f"s-maxage={settings.public_cache_s_maxage}",
+    ]
+    if settings.public_cache_stale_while_revalidate > 0:
+        directives.append(f"stale-while-revalidate={settings.public_cache_stale_while_revalidate}")
+    return ", ".join(directives)
+
+
+def apply_public_cache_headers(response: Response, surrogate_keys: Iterable[str]) -> None:
+    """Mark a response as CDN-cacheable and tag it for targeted purges."""
+    response.headers["Cache-Control"] = public_cache_control()
+    response.headers["Surrogate-Key"] = " ".join(surrogate_keys)
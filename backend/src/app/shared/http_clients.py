@@ -0,0 +1,127 @@
+"""Outbound HTTP clients owned by the application lifespan.
+
+Every service that calls out (broadcast endpoint, certificate fetches) gets
+its `httpx.AsyncClient` from one `HttpClients` registry instead of building
+its own. The registry applies the shared pool settings (connection cap,
+keep-alive pool and expiry, optional HTTP/2), warms registered clients at
+startup so the first broadcasts after a cold start reuse an open TLS
+connection, and closes every client on shutdown (see the lifespan in
+`app.main`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.shared.config import get_settings
+from app.shared.logger import get_logger
+
+try:  # Optional: HTTP/2 needs the `http2` extra (h2)
+    import h2
+except Exception:  # pragma: no cover - optional dependency at runtime
+    h2 = None
+
+
+_log = get_logger("app.http_clients")
+
+
+class HttpClients:
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        warmup_connections: int = 2,
+        warmup_timeout: float = 3.0,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2 and h2 is None:
+            _log.warning("http_clients: HTTP/2 requested but h2 is not installed; using HTTP/1.1")
+        self.http2 = http2 and h2 is not None
+        # One multiplexed HTTP/2 connection carries every request
+        self.warmup_connections = 1 if self.http2 else max(0, warmup_connections)
+        self.warmup_timeout = warmup_timeout
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._warm_urls: Dict[str, str] = {}
+        self._warmed: Dict[str, int] = {}
+        self._closed = False
+
+    def client(self, name: str, timeout: httpx.Timeout | float, warm_url: Optional[str] = None) -> httpx.AsyncClient:
+        """Return the named client, creating it on first use.
+
+        `warm_url` is requested at startup to open connections ahead of real
+        traffic; any response (even an error status) leaves them pooled.
+        """
+        if self._closed:
+            raise RuntimeError("HTTP clients are closed")
+        client = self._clients.get(name)
+        if client is None:
+            client = httpx.AsyncClient(timeout=timeout, limits=self.limits, http2=self.http2)
+            self._clients[name] = client
+        if warm_url:
+            self._warm_urls[name] = warm_url
+        return client
+
+    async def warm_up(self) -> Dict[str, int]:
+        """Open `warmup_connections` connections per client with a warm URL (best effort)."""
+        if self.warmup_connections == 0 or not self._warm_urls:
+            return {}
+
+        async def ping(client: httpx.AsyncClient, url: str) -> bool:
+            try:
+                await client.request("OPTIONS", url)
+                return True
+            except httpx.HTTPError as exc:
+                _log.warning("http_clients: warm-up request failed", extra={"url": url, "error": repr(exc)})
+                return False
+
+        async def warm(name: str, url: str) -> None:
+            client = self._clients[name]
+            # Concurrent requests force separate connections instead of reusing one
+            results = await asyncio.gather(*(ping(client, url) for _ in range(self.warmup_connections)))
+            self._warmed[name] = sum(results)
+
+        try:
+            async with asyncio.timeout(self.warmup_timeout):
+                await asyncio.gather(*(warm(name, url) for name, url in self._warm_urls.items()))
+        except TimeoutError:
+            _log.warning("http_clients: warm-up timed out", extra={"timeout": self.warmup_timeout})
+        _log.info("http_clients: warmed", extra={"connections": dict(self._warmed)})
+        return dict(self._warmed)
+
+    async def aclose(self) -> None:
+        self._closed = True
+        clients, self._clients = list(self._clients.values()), {}
+        await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clients": sorted(self._clients),
+            "http2": self.http2,
+            "maxConnections": self.limits.max_connections,
+            "maxKeepaliveConnections": self.limits.max_keepalive_connections,
+            "keepaliveExpiry": self.limits.keepalive_expiry,
+            "warmed": dict(self._warmed),
+        }
+
+
+@lru_cache(maxsize=1)
+def get_http_clients() -> HttpClients:
+    settings = get_settings()
+    return HttpClients(
+        max_connections=settings.http_client_max_connections,
+        max_keepalive_connections=settings.http_client_max_keepalive_connections,
+        keepalive_expiry=settings.http_client_keepalive_expiry_seconds,
+        http2=settings.http_client_http2,
+        warmup_connections=settings.http_client_warmup_connections,
+        warmup_timeout=settings.websocket_broadcast_connect_timeout_seconds + 1,
+    )
@@ -0,0 +1,112 @@
+"""Small thread-safe LRU cache with optional per-entry TTL.
+
+Used for in-process caches that must stay bounded (compressed response
+bodies, verified tokens, profiles, ...). Entries are evicted in
+least-recently-used order once `max_entries` is reached. Expired entries
+are dropped lazily on access, and a full cache sweeps them out once every
+`max_entries` inserts, so an insert costs O(1) amortized.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at or None, value)
+        self._entries: "OrderedDict[K, Tuple[Optional[float], V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Inserts into a full cache since the last sweep for expired entries
+        self._full_inserts = 0
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value; `ttl_seconds` overrides the cache-wide TTL for this entry."""
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        if ttl is not None and ttl <= 0:
+            return
+        now = self._clock()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # Reclaim expired entries before evicting live ones, but only
+                # every max_entries inserts; in between the LRU entry makes room
+                self._full_inserts += 1
+                if self._full_inserts >= self.max_entries:
+                    self._full_inserts = 0
+                    self._purge_expired_locked(now)
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: K) -> Optional[V]:
+        """Invalidate a single entry, returning its value if it was cached."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return entry[1] if entry else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry; returns how many were removed."""
+        with self._lock:
+            return self._purge_expired_locked(self._clock())
+
+    def _purge_expired_locked(self, now: float) -> int:
+        expired = [k for k, (expires_at, _) in self._entries.items() if expires_at is not None and expires_at <= now]
+        for k in expired:
+            del self._entries[k]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxEntries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": (self.hits / lookups) if lookups else 0.0,
+        }
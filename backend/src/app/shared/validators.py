@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import uuid
+from typing import List, Optional, Sequence
 
-from fastapi import HTTPException, Path
+from fastapi import HTTPException, Path, Query
+
+from app.domain.entities.note import PRIVATE_NOTE_FIELDS, PUBLIC_NOTE_FIELDS
 
 
 def validate_uuid(note_id: str = Path(..., description="Note UUID")) -> str:
@@ -11,4 +14,32 @@ def validate_uuid(note_id: str = Path(..., description="Note UUID")) -> str:
         uuid.UUID(note_id)
         return note_id
     except ValueError:
-        raise HTTPException(status_code=422, detail="Invalid UUID format")
\ No newline at end of file
+        raise HTTPException(status_code=422, detail="Invalid UUID format")
+
+def parse_fields(raw: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    """Parse a comma-separated sparse fieldset; `id` is always included."""
+    if raw is None:
+        return None
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(unknown)}")
+    if not fields:
+        return None
+    if "id" not in fields:
+        fields.insert(0, "id")
+    return list(dict.fromkeys(fields))
+
+
+def public_note_fields(
+    fields: Optional[str] = Query(None, description="Comma-separated note fields to return"),
+) -> Optional[List[str]]:
+    """Sparse fieldset for public note responses."""
+    return parse_fields(fields, PUBLIC_NOTE_FIELDS)
+
+
+def private_note_fields(
+    fields: Optional[str] = Query(None, description="Comma-separated note fields to return"),
+) -> Optional[List[str]]:
+    """Sparse fieldset for personal notebook responses."""
+    return parse_fields(fields, PRIVATE_NOTE_FIELDS)
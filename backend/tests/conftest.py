@@ -0,0 +1,86 @@
+"""Shared fixtures: DynamoDB tables on moto, shaped like infrastructure/localstack/scripts/init-dynamodb.sh."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List
+
+import boto3
+import pytest
+from moto import mock_aws
+
+REGION = "ap-northeast-1"
+
+
+def _index(name: str, *keys: Dict[str, str], projection: Dict[str, Any]) -> Dict[str, Any]:
+    return {"IndexName": name, "KeySchema": list(keys), "Projection": projection}
+
+
+def _hash(name: str) -> Dict[str, str]:
+    return {"AttributeName": name, "KeyType": "HASH"}
+
+
+def _range(name: str) -> Dict[str, str]:
+    return {"AttributeName": name, "KeyType": "RANGE"}
+
+
+def _attributes(**types: str) -> List[Dict[str, str]]:
+    return [{"AttributeName": name, "AttributeType": kind} for name, kind in types.items()]
+
+
+@pytest.fixture
+def dynamodb(monkeypatch: pytest.MonkeyPatch) -> Iterator[Any]:
+    """A moto DynamoDB with the tables the repositories use."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", REGION)
+    monkeypatch.delenv("AWS_ENDPOINT_URL", raising=False)
+    with mock_aws():
+        resource = boto3.resource("dynamodb", region_name=REGION)
+        all_attributes = {"ProjectionType": "ALL"}
+        resource.create_table(
+            TableName="notes",
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=_attributes(id="S", owner_uid="S", created_at="S", is_public="S", published_at="S"),
+            KeySchema=[_hash("id")],
+            GlobalSecondaryIndexes=[
+                _index("OwnerIndex", _hash("owner_uid"), _range("created_at"), projection=all_attributes),
+                _index("PublicNotesIndex", _hash("is_public"), _range("published_at"), projection=all_attributes),
+            ],
+        )
+        resource.create_table(
+            TableName="comments",
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=_attributes(id="S", note_id="S", created_at="S", author_uid="S"),
+            KeySchema=[_hash("id")],
+            GlobalSecondaryIndexes=[
+                _index("NoteIndex", _hash("note_id"), _range("created_at"), projection=all_attributes),
+                _index("AuthorIndex", _hash("author_uid"), projection={"ProjectionType": "KEYS_ONLY"}),
+            ],
+        )
+        resource.create_table(
+            TableName="comment-pages",
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=_attributes(note_id="S", bucket="N"),
+            KeySchema=[_hash("note_id"), _range("bucket")],
+        )
+        resource.create_table(
+            TableName="ownership-transfers",
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=_attributes(to_uid="S"),
+            KeySchema=[_hash("to_uid")],
+        )
+        resource.create_table(
+            TableName="comment-outbox",
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=_attributes(id="S", pending="S", visible_at="N"),
+            KeySchema=[_hash("id")],
+            GlobalSecondaryIndexes=[
+                _index(
+                    "DeliverableIndex",
+                    _hash("pending"),
+                    _range("visible_at"),
+                    projection={"ProjectionType": "KEYS_ONLY"},
+                ),
+            ],
+        )
+        yield resource
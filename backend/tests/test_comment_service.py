@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.application.services.comment_service import CommentApplicationService
+from app.application.services.websocket_service import WebSocketService
+from app.domain.entities.comment import CommentCursorError
+from app.domain.entities.note import Author, Note
+from app.domain.entities.note_access import NoteAccess, NoteNotAccessibleError
+from app.infra.cdn.recording_cache_purger import RecordingCachePurger
+from app.infra.repositories.in_memory_comment_repository import InMemoryCommentRepository
+from app.infra.repositories.in_memory_notes_repository import InMemoryNotesRepository
+
+NOTE_ID = "550e8400-e29b-41d4-a716-446655440000"
+OWNER = "user_ABC123"
+
+
+class SlowAccessNotesRepository(InMemoryNotesRepository):
+    """Answers the access check after the speculative read has already finished."""
+
+    async def check_note_access(self, access: NoteAccess) -> bool:
+        await asyncio.sleep(0.01)
+        return await super().check_note_access(access)
+
+
+def _service() -> CommentApplicationService:
+    notes = SlowAccessNotesRepository()
+    comments = InMemoryCommentRepository(notes=notes)
+    return CommentApplicationService(comments, notes, websocket_service=None, speculative_list=True)
+
+
+async def test_speculative_read_error_is_hidden_when_access_is_denied():
+    service = _service()
+    with pytest.raises(NoteNotAccessibleError):
+        await service.list_comments_since_for_private_note(NOTE_ID, "user_intruder", "not-a-cursor", 10)
+    with pytest.raises(NoteNotAccessibleError):
+        await service.list_comments_since_for_public_note("missing-note", "not-a-cursor", 10)
+
+
+async def test_speculative_read_error_surfaces_when_access_is_allowed():
+    service = _service()
+    with pytest.raises(CommentCursorError):
+        await service.list_comments_since_for_private_note(NOTE_ID, OWNER, "not-a-cursor", 10)
+    comments, meta = await service.list_comments_since_for_public_note(NOTE_ID, "2000-01-01T00:00:00Z", 10)
+    assert meta["hasMore"] is False
+
+
+async def _accept(message) -> bool:
+    return True
+
+
+async def test_comment_purges_only_the_cached_note():
+    notes = InMemoryNotesRepository()
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    await notes.create_note(
+        Note(
+            id="private-note",
+            title="Draft",
+            content="draft",
+            author=Author(id=OWNER, displayName="Alice"),
+            createdAt=created,
+            updatedAt=created,
+            publishedAt=None,
+            owner_uid=OWNER,
+            is_public=False,
+        )
+    )
+    purger = RecordingCachePurger()
+    service = CommentApplicationService(
+        InMemoryCommentRepository(notes=notes),
+        notes,
+        WebSocketService(local_sink=_accept, mode="inline"),
+        cache_purger=purger,
+    )
+
+    await service.create_comment_on_public_note(NOTE_ID, "hi", "user_2", "Bob", None)
+    # The owner's route, but the note is public: its cached commentCount is stale too
+    await service.create_comment_on_private_note(NOTE_ID, OWNER, "thanks", OWNER, "Alice", None)
+    await service.create_comment_on_private_note("private-note", OWNER, "memo", OWNER, "Alice", None)
+
+    # The feed key is left alone, so its cache survives busy threads
+    assert list(purger.purged) == [[f"note-{NOTE_ID}"], [f"note-{NOTE_ID}"], ["note-private-note"]]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timezone
+
+from app.application.services.comment_service import CommentApplicationService
+from app.application.services.websocket_service import WebSocketService
+from app.infra.repositories.in_memory_comment_repository import InMemoryCommentRepository
+from app.infra.repositories.in_memory_notes_repository import InMemoryNotesRepository
+from app.infra.websocket.comment_stream import CommentStream
+from app.infra.websocket.fanout_hub import WebSocketHub
+
+NOTE_ID = "550e8400-e29b-41d4-a716-446655440000"
+OWNER = "user_ABC123"
+
+
+async def _accept(message) -> bool:
+    return True
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _comment_ids(events) -> list:
+    return [json.loads(event.split("data: ", 1)[1])["data"]["comment"]["id"] for event in events if "comment.created" in event]
+
+
+async def _collect(stream: CommentStream, cursor: str, count: int) -> list:
+    events = []
+    async for event in stream.events([], cursor=cursor):
+        events.append(event)
+        if len(_comment_ids(events)) == count:
+            break
+    return events
+
+
+def _setup():
+    notes = InMemoryNotesRepository()
+    service = CommentApplicationService(
+        InMemoryCommentRepository(notes=notes), notes, WebSocketService(local_sink=_accept, mode="inline")
+    )
+    return notes, service
+
+
+async def test_owner_comments_on_a_public_note_are_streamed():
+    notes, service = _setup()
+    hub = WebSocketHub()
+    stream = CommentStream(hub, NOTE_ID, lambda: service.is_public_note(NOTE_ID), heartbeat_seconds=0.05)
+    collecting = asyncio.create_task(_collect(stream, _now(), 1))
+    await asyncio.sleep(0)
+
+    # Posted through /me/notes, so the message says isPrivateNote; the note is public
+    comment = await service.create_comment_on_private_note(NOTE_ID, OWNER, "thanks", OWNER, "Alice", None)
+    await hub.publish(WebSocketService.comment_created_message(NOTE_ID, comment, is_private_note=True))
+
+    events = await asyncio.wait_for(collecting, 1)
+    assert _comment_ids(events) == [comment["id"]]
+
+
+async def test_comments_from_other_instances_arrive_through_polling():
+    notes, service = _setup()
+    stream = CommentStream(
+        WebSocketHub(),
+        NOTE_ID,
+        lambda: service.is_public_note(NOTE_ID),
+        poll=lambda cursor: service.comments_missed_by_stream(NOTE_ID, cursor, 100),
+        poll_seconds=0.02,
+    )
+    collecting = asyncio.create_task(_collect(stream, _now(), 2))
+
+    # Saved without reaching this instance's hub
+    first = await service.create_comment_on_public_note(NOTE_ID, "one", "user_2", "Bob", None)
+    second = await service.create_comment_on_public_note(NOTE_ID, "two", "user_3", "Carol", None)
+
+    events = await asyncio.wait_for(collecting, 1)
+    assert _comment_ids(events) == [first["id"], second["id"]]
+
+
+async def test_stream_ends_when_the_note_is_unpublished():
+    notes, service = _setup()
+    hub = WebSocketHub()
+    stream = CommentStream(hub, NOTE_ID, lambda: service.is_public_note(NOTE_ID), heartbeat_seconds=10)
+    collecting = asyncio.create_task(_collect(stream, _now(), 1))
+    await asyncio.sleep(0)
+
+    await notes.unpublish_note(NOTE_ID, OWNER)
+    comment = await service.create_comment_on_private_note(NOTE_ID, OWNER, "private now", OWNER, "Alice", None)
+    await hub.publish(WebSocketService.comment_created_message(NOTE_ID, comment, is_private_note=True))
+
+    events = await asyncio.wait_for(collecting, 1)
+    assert _comment_ids(events) == []
+    assert hub.connection_count == 0
+
+
+async def test_stream_ends_after_max_seconds():
+    notes, service = _setup()
+    stream = CommentStream(
+        WebSocketHub(), NOTE_ID, lambda: service.is_public_note(NOTE_ID), heartbeat_seconds=10, max_seconds=0.05
+    )
+    events = await asyncio.wait_for(_collect(stream, _now(), 1), 1)
+    assert events == ["retry: 3000\n\n"]
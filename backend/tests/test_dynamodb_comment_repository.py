@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.domain.entities.comment import Comment
+from app.infra.repositories import dynamodb_comment_repository
+from app.infra.repositories.dynamodb_comment_repository import DynamoDBCommentRepository
+
+BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _comment(i: int, note_id: str = "note-1", author: str = "user_1") -> Comment:
+    created = BASE + timedelta(seconds=i)
+    return Comment(str(uuid.uuid4()), f"comment {i}", note_id, author, "Alice", None, created, created)
+
+
+def _paged(size: int = 4) -> DynamoDBCommentRepository:
+    return DynamoDBCommentRepository(table_name="comments", pages_table_name="comment-pages", page_bucket_size=size)
+
+
+async def _assert_same_pages(plain: DynamoDBCommentRepository, paged: DynamoDBCommentRepository, total: int) -> None:
+    for limit in (1, 3, 4, 7, 50):
+        for page in range(1, total // limit + 3):
+            assert await paged.list_comments_by_note("note-1", page, limit) == await plain.list_comments_by_note(
+                "note-1", page, limit
+            ), (page, limit)
+
+
+async def test_bucketed_pages_match_the_plain_listing(dynamodb):
+    plain = DynamoDBCommentRepository(table_name="comments")
+    paged = _paged()
+    # A backlog written before buckets were enabled is sealed as new comments arrive
+    for i in range(5):
+        await plain.create_comment(_comment(i))
+    for i in range(5, 30):
+        await paged.create_comment(_comment(i, author="user_2" if i % 3 == 0 else "user_1"))
+        await paged.flush_page_updates()
+
+    index = paged._page_index("note-1")
+    assert len(index["boundaries"]) == 7
+    await _assert_same_pages(plain, paged, 30)
+    assert await paged.list_comments_by_note("missing", 1, 20) == await plain.list_comments_by_note("missing", 1, 20)
+
+    # Sealed copies follow an author reassignment
+    assert await paged.reassign_author("user_2", "user_3", "Carol") == 8
+    await _assert_same_pages(plain, paged, 30)
+
+
+async def test_oversized_bucket_pauses_sealing(dynamodb, monkeypatch):
+    monkeypatch.setattr(dynamodb_comment_repository, "BUCKET_MAX_BYTES", 100)
+    plain = DynamoDBCommentRepository(table_name="comments")
+    paged = _paged()
+    attempts = []
+    seal = paged._seal_buckets
+    monkeypatch.setattr(paged, "_seal_buckets", lambda note_id, index: attempts.append(note_id) or seal(note_id, index))
+
+    for i in range(10):
+        await paged.create_comment(_comment(i))
+        await paged.flush_page_updates()
+
+    index = paged._page_index("note-1")
+    assert "boundaries" not in index
+    assert index["seal_error"] == "bucket too large"
+    # Tried once when the first bucket filled, not on every later write
+    assert attempts == ["note-1"]
+    await _assert_same_pages(plain, paged, 10)
+
+
+async def test_page_bookkeeping_runs_after_the_write(dynamodb):
+    paged = _paged()
+    for i in range(6):
+        await paged.create_comment(_comment(i))
+    # Nothing counted within the requests; the burst lands in one update
+    assert paged._page_index("note-1") == {}
+    writes = []
+    note_written = paged._note_written
+    paged._note_written = lambda note_id, count: writes.append(count) or note_written(note_id, count)
+
+    await paged.flush_page_updates()
+
+    assert writes == [6]
+    assert paged._page_index("note-1")["boundaries"]
+
+
+def test_bucket_size_is_capped_to_fit_one_item():
+    with pytest.raises(ValueError):
+        _paged(dynamodb_comment_repository.MAX_PAGE_BUCKET_SIZE + 1)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.application.services.notes_service import NotesApplicationService
+from app.domain.entities.note import Author, Note
+from app.infra.repositories.dynamodb_notes_repository import DynamoDBNotesRepository
+
+NOTE_ID = "550e8400-e29b-41d4-a716-446655440000"
+
+
+def _put_legacy_note(dynamodb, content: str = "A note written before excerpts were stored") -> None:
+    """A public note item without the write-time `excerpt`/`content_length` attributes."""
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc).isoformat()
+    dynamodb.Table("notes").put_item(
+        Item={
+            "id": NOTE_ID,
+            "title": "Legacy",
+            "content": content,
+            "author_id": "user_1",
+            "author_name": "User 1",
+            "author_avatar_url": "",
+            "created_at": now,
+            "updated_at": now,
+            "published_at": now,
+            "owner_uid": "user_1",
+            "is_public": "true",
+        }
+    )
+
+
+@pytest.fixture
+def repository(dynamodb) -> DynamoDBNotesRepository:
+    return DynamoDBNotesRepository(table_name="notes")
+
+
+async def test_summary_of_legacy_note_has_no_derived_length(dynamodb, repository):
+    _put_legacy_note(dynamodb)
+
+    notes, _ = await repository.list_public_notes(1, 10, view="summary")
+
+    assert notes[0]["contentLength"] is None
+    assert notes[0]["excerpt"] is None
+
+
+async def test_full_read_of_legacy_note_derives_length_from_content(dynamodb, repository):
+    _put_legacy_note(dynamodb, content="twelve chars")
+
+    note = await repository.get_public_note(NOTE_ID, fields=["content", "contentLength"])
+
+    assert note == {"content": "twelve chars", "contentLength": 12}
+
+
+async def test_sparse_content_length_of_legacy_note_is_null(dynamodb, repository):
+    _put_legacy_note(dynamodb)
+
+    public = await repository.get_public_note(NOTE_ID, fields=["contentLength"])
+    owned = await repository.get_note_by_owner(NOTE_ID, "user_1", fields=["contentLength", "excerpt"])
+
+    assert public == {"contentLength": None}
+    assert owned == {"contentLength": None, "excerpt": None}
+
+
+async def test_edit_racing_a_delete_does_not_recreate_the_note(dynamodb, repository):
+    _put_legacy_note(dynamodb)
+    service = NotesApplicationService(repository)
+    read = repository.get_note_by_owner
+
+    async def deleted_after_read(note_id, owner_uid, *args, **kwargs):
+        note = await read(note_id, owner_uid, *args, **kwargs)
+        await repository.delete_note(note_id, owner_uid)
+        return note
+
+    repository.get_note_by_owner = deleted_after_read
+    assert await service.update_my_note("user_1", NOTE_ID, "Edited", None) is None
+    assert "Item" not in dynamodb.Table("notes").get_item(Key={"id": NOTE_ID})
+
+
+async def test_edit_by_another_owner_is_rejected(dynamodb, repository):
+    _put_legacy_note(dynamodb)
+    now = datetime.now(timezone.utc)
+    intruder = Note(
+        id=NOTE_ID,
+        title="Mine now",
+        content="overwritten",
+        author=Author(id="user_2", displayName="User 2"),
+        createdAt=now,
+        updatedAt=now,
+        publishedAt=None,
+        owner_uid="user_2",
+        is_public=False,
+    )
+
+    with pytest.raises(ValueError):
+        await repository.update_note(intruder)
+    assert dynamodb.Table("notes").get_item(Key={"id": NOTE_ID})["Item"]["title"] == "Legacy"
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.application.services import outbox_drainer
+from app.application.services.outbox_drainer import OutboxDrainer
+from app.domain.entities.outbox_event import OutboxEvent
+from app.infra.repositories import dynamodb_outbox_repository
+from app.infra.repositories.dynamodb_outbox_repository import DynamoDBOutboxRepository, outbox_event_to_item
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(dynamodb_outbox_repository.time, "time", lambda: now[0])
+    return now
+
+
+def _write_events(outbox: DynamoDBOutboxRepository, count: int, prefix: str = "evt") -> None:
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        event = OutboxEvent(
+            id=f"{prefix}-{i:02d}",
+            event_type="comment.created",
+            topic="note-1",
+            payload={"n": i},
+            created_at=base + timedelta(seconds=i),
+        )
+        outbox.table.put_item(Item=outbox_event_to_item(event))
+
+
+async def test_leased_events_do_not_starve_newer_ones(dynamodb, clock):
+    outbox = DynamoDBOutboxRepository(table_name="comment-outbox")
+    _write_events(outbox, 12, prefix="old")
+
+    leased = await outbox.claim_pending(5, 30)
+    assert [event.id for event in leased] == [f"old-{i:02d}" for i in range(5)]
+    # A claim can't see the leased events, so it gets the next ones in full
+    leased += await outbox.claim_pending(5, 30)
+    leased += await outbox.claim_pending(5, 30)
+    assert len(leased) == 12 and len({event.id for event in leased}) == 12
+    assert await outbox.claim_pending(5, 30) == []
+
+    clock[0] += 1
+    _write_events(outbox, 1, prefix="new")
+    assert [event.id for event in await outbox.claim_pending(5, 30)] == ["new-00"]
+    assert await outbox.pending_count() == 13
+
+
+async def test_expired_lease_makes_events_claimable_again(dynamodb, clock):
+    outbox = DynamoDBOutboxRepository(table_name="comment-outbox")
+    _write_events(outbox, 3)
+
+    first = await outbox.claim_pending(10, 30)
+    assert [event.attempts for event in first] == [1, 1, 1]
+
+    clock[0] += 29
+    assert await outbox.claim_pending(10, 30) == []
+
+    clock[0] += 2
+    again = await outbox.claim_pending(10, 30)
+    assert [event.id for event in again] == [event.id for event in first]
+    assert [event.attempts for event in again] == [2, 2, 2]
+
+    await outbox.mark_delivered([event.id for event in again])
+    assert await outbox.pending_count() == 0
+
+
+async def test_drainer_drops_events_after_max_attempts(dynamodb, clock, monkeypatch):
+    monkeypatch.setattr(outbox_drainer, "jittered_backoff", lambda attempt, base, cap: 1.0)
+    outbox = DynamoDBOutboxRepository(table_name="comment-outbox")
+    _write_events(outbox, 2)
+    sent = []
+
+    async def failing_endpoint(message):
+        sent.append(message)
+        return False
+
+    drainer = OutboxDrainer(outbox, failing_endpoint, batch_size=10, lease_seconds=30, max_attempts=3)
+    for _ in range(3):
+        assert await drainer.drain_once() == 2
+        # Backoff hides the failed events until the retry is due
+        assert await drainer.drain_once() == 0
+        clock[0] += 2
+
+    assert len(sent) == 3
+    assert drainer.abandoned == 2
+    assert await outbox.pending_count() == 0
+    assert await drainer.drain_once() == 0
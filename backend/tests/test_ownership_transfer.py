@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.application.services.ownership_transfer_service import OwnershipTransferService
+from app.domain.entities.note import Author, Note
+from app.domain.entities.ownership_transfer import OwnershipTransfer, TransferInProgressError
+from app.infra.repositories import dynamodb_ownership_transfer_repository
+from app.infra.repositories.dynamodb_ownership_transfer_repository import DynamoDBOwnershipTransferRepository
+from app.infra.repositories.in_memory_comment_repository import InMemoryCommentRepository
+from app.infra.repositories.in_memory_notes_repository import InMemoryNotesRepository
+from app.infra.repositories.in_memory_ownership_transfer_repository import InMemoryOwnershipTransferRepository
+
+LONG_AGO = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+async def _anonymous_notes(notes: InMemoryNotesRepository, count: int) -> None:
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        created = base + timedelta(minutes=i)
+        await notes.create_note(
+            Note(
+                id=f"note-{i:03d}",
+                title=f"Note {i}",
+                content="draft",
+                author=Author(id="anon", displayName="Guest"),
+                createdAt=created,
+                updatedAt=created,
+                publishedAt=None,
+                owner_uid="anon",
+                is_public=False,
+            )
+        )
+
+
+async def _settle(service: OwnershipTransferService) -> None:
+    await asyncio.gather(*list(service._tasks.values()))
+
+
+async def test_resume_continues_a_run_abandoned_by_another_instance():
+    notes = InMemoryNotesRepository()
+    await _anonymous_notes(notes, 25)
+    transfers = InMemoryOwnershipTransferRepository()
+    comments = InMemoryCommentRepository(notes=notes)
+    crashed = OwnershipTransferService(notes, comments, transfers, page_size=10, lease_seconds=0)
+
+    # The first instance moved one page, saved it, then stopped
+    record = OwnershipTransfer(from_uid="anon", to_uid="user_1", to_display_name="Alice")
+    await transfers.put(record)
+    record = await transfers.acquire("user_1", crashed._worker_id, 0, LONG_AGO)
+    ids, cursor = await notes.list_note_ids_by_owner("anon", 10)
+    record.notes_moved = await notes.reassign_notes(ids, "anon", Author(id="user_1", displayName="Alice"))
+    record.pages_done, record.cursor = 1, cursor
+    assert await transfers.save_progress(record, crashed._worker_id, 0)
+
+    other = OwnershipTransferService(notes, comments, transfers, page_size=10)
+    resumed = await other.resume("user_1")
+    await _settle(other)
+
+    assert resumed.status == "running"
+    done = await other.get_transfer("user_1")
+    assert done.status == "completed"
+    assert done.notes_moved == 25
+    assert done.notes_skipped == 0
+    assert done.pages_done == 3
+    assert await notes.list_note_ids_by_owner("anon", 100) == ([], None)
+    moved, _ = await notes.list_note_ids_by_owner("user_1", 100)
+    assert len(moved) == 25
+
+
+async def test_resume_leaves_a_leased_run_alone():
+    notes = InMemoryNotesRepository()
+    await _anonymous_notes(notes, 3)
+    transfers = InMemoryOwnershipTransferRepository()
+    await transfers.put(OwnershipTransfer(from_uid="anon", to_uid="user_1"))
+    assert await transfers.acquire("user_1", "running-elsewhere", 60, LONG_AGO) is not None
+
+    service = OwnershipTransferService(notes, InMemoryCommentRepository(notes=notes), transfers)
+    await service.resume("user_1")
+    await _settle(service)
+
+    assert (await transfers.get("user_1")).notes_moved == 0
+    ids, _ = await notes.list_note_ids_by_owner("anon", 10)
+    assert len(ids) == 3
+
+
+async def test_second_source_waits_for_the_running_transfer():
+    notes = InMemoryNotesRepository()
+    await _anonymous_notes(notes, 25)
+    transfers = InMemoryOwnershipTransferRepository()
+    service = OwnershipTransferService(notes, InMemoryCommentRepository(notes=notes), transfers, page_size=10)
+    alice = Author(id="user_1", displayName="Alice")
+
+    await service.start_transfer("anon", alice)
+    with pytest.raises(TransferInProgressError):
+        await service.start_transfer("other-anon", alice)
+    await _settle(service)
+
+    # The first transfer was not cut short by the second request
+    first = await transfers.get("user_1")
+    assert first.from_uid == "anon" and first.status == "completed" and first.notes_moved == 25
+
+    second = await service.start_transfer("other-anon", alice)
+    assert second.from_uid == "other-anon"
+    await _settle(service)
+    assert (await transfers.get("user_1")).status == "completed"
+
+
+async def test_new_transfer_starts_after_the_previous_run_exits():
+    notes = InMemoryNotesRepository()
+    await _anonymous_notes(notes, 3)
+    transfers = InMemoryOwnershipTransferRepository()
+    service = OwnershipTransferService(notes, InMemoryCommentRepository(notes=notes), transfers)
+    # A run whose record is already finished, still wrapping up on this instance
+    wrapping_up = asyncio.Event()
+    service._tasks["user_1"] = asyncio.create_task(wrapping_up.wait())
+
+    await service.start_transfer("anon", Author(id="user_1", displayName="Alice"))
+    await asyncio.sleep(0)
+    assert (await transfers.get("user_1")).notes_moved == 0
+
+    wrapping_up.set()
+    await _settle(service)
+    assert (await transfers.get("user_1")).notes_moved == 3
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(dynamodb_ownership_transfer_repository.time, "time", lambda: now[0])
+    return now
+
+
+async def test_dynamodb_lease_is_taken_over_once_expired(dynamodb, clock):
+    repository = DynamoDBOwnershipTransferRepository(table_name="ownership-transfers")
+    assert await repository.put(OwnershipTransfer(from_uid="anon", to_uid="user_1", to_display_name="Alice"))
+    # A running transfer is not replaced
+    assert not await repository.put(OwnershipTransfer(from_uid="other-anon", to_uid="user_1"))
+
+    first = await repository.acquire("user_1", "a", 60, LONG_AGO)
+    assert first is not None and first.to_display_name == "Alice"
+    assert await repository.acquire("user_1", "b", 60, LONG_AGO) is None
+
+    first.pages_done, first.cursor = 1, "cursor-1"
+    assert await repository.save_progress(first, "a", 60)
+
+    clock[0] += 61
+    second = await repository.acquire("user_1", "b", 60, LONG_AGO)
+    assert second.cursor == "cursor-1" and second.pages_done == 1
+    # The stalled worker cannot overwrite the new runner's progress
+    assert not await repository.save_progress(first, "a", 60)
+
+    second.status = "completed"
+    second.finished_at = datetime.now(timezone.utc)
+    assert await repository.save_progress(second, "b", None)
+    assert await repository.acquire("user_1", "c", 60, LONG_AGO) is None
+    assert (await repository.get("user_1")).status == "completed"
+
+
+async def test_dynamodb_failed_transfer_is_retried_after_backoff(dynamodb, clock):
+    repository = DynamoDBOwnershipTransferRepository(table_name="ownership-transfers")
+    failed_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    await repository.put(
+        OwnershipTransfer(from_uid="anon", to_uid="user_1", status="failed", error="boom", finished_at=failed_at)
+    )
+
+    assert await repository.acquire("user_1", "a", 60, failed_at - timedelta(seconds=1)) is None
+    retried = await repository.acquire("user_1", "a", 60, failed_at + timedelta(seconds=1))
+    assert retried.status == "running" and retried.error is None and retried.finished_at is None
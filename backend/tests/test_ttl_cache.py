@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from app.shared.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_full_cache_evicts_lru_without_scanning_every_insert(monkeypatch):
+    cache: TTLCache[int, int] = TTLCache(max_entries=100, ttl_seconds=60, clock=FakeClock())
+    for key in range(100):
+        cache.set(key, key)
+    sweeps = []
+    original = cache._purge_expired_locked
+    monkeypatch.setattr(cache, "_purge_expired_locked", lambda now: sweeps.append(now) or original(now))
+
+    for key in range(100, 350):
+        cache.set(key, key)
+
+    assert len(sweeps) == 2
+    assert len(cache) == 100
+    assert cache.get(249) is None
+    assert cache.get(250) == 250
+    assert cache.evictions == 250
+
+
+def test_full_cache_reclaims_expired_entries_in_a_sweep():
+    clock = FakeClock()
+    cache: TTLCache[str, str] = TTLCache(max_entries=4, ttl_seconds=60, clock=clock)
+    cache.set("short", "x", ttl_seconds=1)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    cache.get("short")  # most recently used, so LRU eviction alone would keep it
+    clock.now = 10
+
+    for key in ("d", "e", "f", "g"):
+        cache.set(key, key)
+
+    assert cache.get("short") is None
+    assert cache.get("g") == "g"
+    assert len(cache) == 4
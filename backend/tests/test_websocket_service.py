@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.application.services.websocket_service import WebSocketService
+from app.shared.circuit_breaker import CircuitBreaker
+
+URL = "http://broadcast.test/broadcast"
+
+
+def _half_open_service(handler) -> WebSocketService:
+    service = WebSocketService(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), mode="inline")
+    service.breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+    service.breaker.record_failure()
+    assert service.breaker.state == "half_open"
+    return service
+
+
+async def test_cancelled_probe_releases_half_open_breaker():
+    started = asyncio.Event()
+
+    async def hang(request: httpx.Request) -> httpx.Response:
+        started.set()
+        await asyncio.Event().wait()
+        return httpx.Response(200)
+
+    service = _half_open_service(hang)
+    probe = asyncio.create_task(service._post_with_retries(URL, {"type": "comment.created"}))
+    await started.wait()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert service.breaker.state == "half_open"
+    assert service.breaker.allow()
+
+
+async def test_unsendable_body_releases_half_open_breaker():
+    service = _half_open_service(lambda request: httpx.Response(200))
+
+    with pytest.raises(TypeError):
+        await service._post_with_retries(URL, {"type": "comment.created", "data": {object()}})
+
+    assert service.breaker.allow()
+
+
+async def test_successful_probe_closes_breaker():
+    service = _half_open_service(lambda request: httpx.Response(200))
+
+    assert await service._post_with_retries(URL, {"type": "comment.created"})
+    assert service.breaker.state == "closed"
@@ -58,6 +58,13 @@ export function PublicNoteCard({
 			<time dateTime={note.publishedAt}>
 				Published {formatDate(note.publishedAt)}
 			</time>
+
+			{/* Comment count (denormalized on the note, no extra request) */}
+			{note.commentCount !== undefined && (
+				<span>
+					{note.commentCount} {note.commentCount === 1 ? "comment" : "comments"}
+				</span>
+			)}
 		</BaseNoteCard>
 	);
 }
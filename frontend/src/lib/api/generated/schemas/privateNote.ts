@@ -35,4 +35,9 @@ export interface PrivateNote {
 	publishedAt?: string | null;
 	/** Whether the note is public or private */
 	isPublic: boolean;
+	/**
+	 * Number of comments on the note
+	 * @minimum 0
+	 */
+	commentCount?: number;
 }
@@ -28,4 +28,9 @@ export interface PublicNote {
 	createdAt: string;
 	updatedAt: string;
 	publishedAt: string;
+	/**
+	 * Number of comments on the note
+	 * @minimum 0
+	 */
+	commentCount?: number;
 }
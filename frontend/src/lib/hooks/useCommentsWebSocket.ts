@@ -27,7 +27,8 @@ export function useCommentsWebSocket({
 	enabled = true,
 }: UseCommentsWebSocketOptions) {
 	const queryClient = useQueryClient();
-	const { subscribeToMessage, isConnected, status } = useWebSocket();
+	const { subscribeToMessage, subscribeToNote, isConnected, status } =
+		useWebSocket();
 
 	// Get the appropriate query key based on note type
 	const getQueryKey = useCallback(() => {
@@ -49,6 +50,11 @@ export function useCommentsWebSocket({
 				queryClient.getQueryData<CommentsListResponse>(queryKey);
 
 			if (currentData) {
+				// Delivery is at-least-once: a redelivered event repeats a comment we have
+				if (currentData.data.comments.some((c) => c.id === data.comment.id)) {
+					return;
+				}
+
 				// Add new comment to the list
 				const updatedData: CommentsListResponse = {
 					...currentData,
@@ -123,16 +129,21 @@ export function useCommentsWebSocket({
 			handleCommentsListUpdate,
 		);
 
+		// Ask the server to route this note's broadcasts to this connection
+		const unsubscribeNote = subscribeToNote(noteId);
+
 		// Cleanup subscriptions
 		return () => {
 			unsubscribeCommentCreated();
 			unsubscribeCommentsList();
+			unsubscribeNote();
 		};
 	}, [
 		enabled,
 		noteId,
 		isPrivateNote,
 		subscribeToMessage,
+		subscribeToNote,
 		handleCommentCreated,
 		handleCommentsListUpdate,
 	]);
@@ -11,6 +11,7 @@ export function useWebSocket() {
 		connect,
 		disconnect,
 		subscribe,
+		subscribeToNote,
 		reconnectAttempts,
 		maxReconnectAttempts,
 	} = useWebSocketStore();
@@ -38,5 +39,6 @@ export function useWebSocket() {
 		connect,
 		disconnect,
 		subscribeToMessage,
+		subscribeToNote,
 	};
 }
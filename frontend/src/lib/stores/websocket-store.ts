@@ -23,6 +23,9 @@ interface WebSocketState {
 
 	// Message subscriptions
 	subscribers: Map<WebsocketMessageType, Set<MessageSubscriber<unknown>>>;
+
+	// Note topics this client wants broadcasts for (noteId -> watcher count)
+	topics: Map<string, number>;
 }
 
 interface WebSocketActions {
@@ -41,10 +44,18 @@ interface WebSocketActions {
 		callback: MessageSubscriber<unknown>,
 	) => void;
 
+	// Topic routing: the server only sends a note's broadcasts to connections
+	// subscribed to it. Returns a function that releases the subscription.
+	subscribeToNote: (noteId: string) => () => void;
+
 	// Internal methods
 	setStatus: (status: ConnectionStatus) => void;
 	setError: (error: string | null) => void;
 	handleMessage: (message: WebsocketMessage) => void;
+	sendTopicAction: (
+		action: "subscribe" | "unsubscribe",
+		noteIds: string[],
+	) => void;
 }
 
 export type WebSocketStore = WebSocketState & WebSocketActions;
@@ -65,6 +76,7 @@ export const useWebSocketStore = create<WebSocketStore>()(
 			reconnectDelay: 3000,
 			socket: null,
 			subscribers: new Map(),
+			topics: new Map(),
 
 			// Actions
 			connect: () => {
@@ -93,6 +105,12 @@ export const useWebSocketStore = create<WebSocketStore>()(
 							reconnectAttempts: 0,
 							socket: newSocket,
 						});
+
+						// Subscriptions belong to the connection; restore them after (re)connecting
+						const noteIds = [...get().topics.keys()];
+						if (noteIds.length > 0) {
+							get().sendTopicAction("subscribe", noteIds);
+						}
 					};
 
 					newSocket.onmessage = (event) => {
@@ -178,6 +196,36 @@ export const useWebSocketStore = create<WebSocketStore>()(
 				}
 			},
 
+			subscribeToNote: (noteId: string) => {
+				const { topics } = get();
+				const count = topics.get(noteId) ?? 0;
+				topics.set(noteId, count + 1);
+				if (count === 0) {
+					get().sendTopicAction("subscribe", [noteId]);
+				}
+
+				let released = false;
+				return () => {
+					if (released) return;
+					released = true;
+					const remaining = (get().topics.get(noteId) ?? 1) - 1;
+					if (remaining > 0) {
+						get().topics.set(noteId, remaining);
+						return;
+					}
+					get().topics.delete(noteId);
+					get().sendTopicAction("unsubscribe", [noteId]);
+				};
+			},
+
+			sendTopicAction: (action, noteIds) => {
+				const { socket } = get();
+				// Sent again from onopen if the socket is not ready yet
+				if (socket?.readyState === WebSocket.OPEN) {
+					socket.send(JSON.stringify({ action, noteIds }));
+				}
+			},
+
 			setStatus: (status) => set({ status }),
 
 			setError: (error) => set({ error }),
@@ -1,7 +1,7 @@
 import { APIGatewayProxyHandler, APIGatewayProxyEvent, APIGatewayProxyResult } from 'aws-lambda';
-import { BroadcastService } from './shared/broadcast-service';
+import { BroadcastService, RoutedMessage } from './shared/broadcast-service';
 import { createCorsResponse, createErrorResponse, validateEnvironment, logger } from './shared/utils';
-import { BroadcastRequestBody, WebSocketMessage } from './shared/types';
+import { BatchBroadcastRequestBody, BroadcastRequestBody, WebSocketMessage } from './shared/types';
 
 export const handler: APIGatewayProxyHandler = async (
   event: APIGatewayProxyEvent
@@ -15,37 +15,45 @@ export const handler: APIGatewayProxyHandler = async (
       return createErrorResponse(400, 'Missing request body', undefined, corsOrigin);
     }
 
-    let requestBody: BroadcastRequestBody;
+    let requestBody: BroadcastRequestBody | BatchBroadcastRequestBody;
     try {
       requestBody = JSON.parse(event.body);
     } catch (parseError) {
       return createErrorResponse(400, 'Invalid JSON in request body', undefined, corsOrigin);
     }
 
+    // A batch carries several messages coalesced by the backend
+    const items = requestBody.type === 'batch' && Array.isArray((requestBody as BatchBroadcastRequestBody).messages)
+      ? (requestBody as BatchBroadcastRequestBody).messages
+      : [requestBody as BroadcastRequestBody];
+
     // Validate request structure
-    if (!requestBody.type || !requestBody.data) {
+    if (items.length === 0 || items.some((item) => !item || !item.type || !item.data)) {
       return createErrorResponse(400, 'Missing required fields: type, data', undefined, corsOrigin);
     }
 
-    const { type, data } = requestBody;
-    
-    logger.info(`Broadcasting message of type: ${type}`);
+    logger.info(`Broadcasting ${items.length} message(s) of type: ${[...new Set(items.map((item) => item.type))].join(', ')}`);
 
-    // Create broadcast message
-    const message: WebSocketMessage = {
-      type,
-      data,
-      timestamp: new Date().toISOString()
-    };
+    // Create broadcast messages; the topic only routes, it is not sent to clients
+    const timestamp = new Date().toISOString();
+    const messages: RoutedMessage[] = items.map(({ type, data, topic, id }) => {
+      const message: WebSocketMessage = { type, ...(id ? { id } : {}), data, timestamp };
+      return { message, topic: topic || undefined };
+    });
 
-    // Initialize broadcast service and send to all connections
-    const broadcastService = new BroadcastService(config.DYNAMODB_CONNECTIONS_TABLE);
-    const results = await broadcastService.broadcastToAll(message);
+    // Send each message to its topic's subscribers (untopiced messages go to everyone)
+    const broadcastService = new BroadcastService(
+      config.DYNAMODB_CONNECTIONS_TABLE,
+      config.DYNAMODB_SUBSCRIPTIONS_TABLE
+    );
+    const results = await broadcastService.broadcastRouted(messages);
 
     return createCorsResponse(
       200,
       {
         message: 'Broadcast completed',
+        messageCount: messages.length,
+        topics: [...new Set(messages.map(({ topic }) => topic).filter(Boolean))],
         results: {
           totalConnections: results.sent + results.failed + results.stale,
           sent: results.sent,
@@ -2,7 +2,11 @@ import { APIGatewayProxyHandler, APIGatewayProxyEvent, APIGatewayProxyResult } f
 import { PostToConnectionCommand } from '@aws-sdk/client-apigatewaymanagementapi';
 import { apiGatewayClient } from './shared/clients';
 import { createResponse, createErrorResponse, validateEnvironment, logger, encodeMessage } from './shared/utils';
-import { WebSocketMessage } from './shared/types';
+import { SubscriptionStore } from './shared/subscription-store';
+import { SubscriptionRequestBody, WebSocketMessage } from './shared/types';
+
+const isSubscriptionRequest = (message: any): message is SubscriptionRequestBody =>
+  (message?.action === 'subscribe' || message?.action === 'unsubscribe') && Array.isArray(message.noteIds);
 
 export const handler: APIGatewayProxyHandler = async (
   event: APIGatewayProxyEvent
@@ -15,21 +19,41 @@ export const handler: APIGatewayProxyHandler = async (
   }
 
   try {
-    validateEnvironment();
+    const config = validateEnvironment();
     
     const message = JSON.parse(event.body || '{}');
     logger.info(`Received message from ${connectionId}:`, message);
     
-    // Create response message
-    const response: WebSocketMessage = {
-      type: 'echo',
-      data: { 
-        message: 'Message received', 
-        original: message,
-        connectionId 
-      },
-      timestamp: new Date().toISOString()
-    };
+    let response: WebSocketMessage;
+    if (isSubscriptionRequest(message)) {
+      // Register (or drop) interest in notes; broadcasts are routed by noteId
+      if (!config.DYNAMODB_SUBSCRIPTIONS_TABLE) {
+        return createErrorResponse(500, 'Server configuration error');
+      }
+      const subscriptions = new SubscriptionStore(config.DYNAMODB_CONNECTIONS_TABLE, config.DYNAMODB_SUBSCRIPTIONS_TABLE);
+      let noteIds = message.noteIds;
+      if (message.action === 'subscribe') {
+        noteIds = await subscriptions.subscribe(connectionId, message.noteIds);
+      } else {
+        await subscriptions.unsubscribe(connectionId, message.noteIds);
+      }
+      response = {
+        type: message.action === 'subscribe' ? 'subscribed' : 'unsubscribed',
+        data: { noteIds },
+        timestamp: new Date().toISOString()
+      };
+    } else {
+      // Create response message
+      response = {
+        type: 'echo',
+        data: { 
+          message: 'Message received', 
+          original: message,
+          connectionId 
+        },
+        timestamp: new Date().toISOString()
+      };
+    }
 
     const command = new PostToConnectionCommand({
       ConnectionId: connectionId,
@@ -1,6 +1,8 @@
 import { APIGatewayProxyHandler, APIGatewayProxyEvent, APIGatewayProxyResult } from 'aws-lambda';
 import { DeleteCommand } from '@aws-sdk/lib-dynamodb';
 import { dynamoClient } from './shared/clients';
+import { SubscriptionStore } from './shared/subscription-store';
+import { ConnectionItem } from './shared/types';
 import { createResponse, createErrorResponse, validateEnvironment, logger } from './shared/utils';
 
 export const handler: APIGatewayProxyHandler = async (
@@ -19,9 +21,17 @@ export const handler: APIGatewayProxyHandler = async (
     const command = new DeleteCommand({
       TableName: config.DYNAMODB_CONNECTIONS_TABLE,
       Key: { connectionId },
+      ReturnValues: 'ALL_OLD',
     });
 
-    await dynamoClient.send(command);
+    const result = await dynamoClient.send(command);
+
+    // Drop the connection's note subscriptions so broadcasts stop finding it
+    const noteIds = (result.Attributes as ConnectionItem | undefined)?.noteIds;
+    if (config.DYNAMODB_SUBSCRIPTIONS_TABLE && noteIds?.size) {
+      const subscriptions = new SubscriptionStore(config.DYNAMODB_CONNECTIONS_TABLE, config.DYNAMODB_SUBSCRIPTIONS_TABLE);
+      await subscriptions.removeSubscriptionItems(connectionId, noteIds);
+    }
 
     logger.info(`Connection removed: ${connectionId}`);
     
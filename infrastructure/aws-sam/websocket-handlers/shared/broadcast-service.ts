@@ -3,15 +3,32 @@
 import { ScanCommand, DeleteCommand } from '@aws-sdk/lib-dynamodb';
 import { PostToConnectionCommand } from '@aws-sdk/client-apigatewaymanagementapi';
 import { dynamoClient, apiGatewayClient } from './clients';
+import { SubscriptionStore } from './subscription-store';
 import { ConnectionItem, WebSocketMessage } from './types';
 import { logger, encodeMessage } from './utils';
 
+// A message plus its routing key (noteId); no topic means every connection
+export interface RoutedMessage {
+  message: WebSocketMessage;
+  topic?: string;
+}
+
+export interface BroadcastResults {
+  sent: number;
+  failed: number;
+  stale: number;
+}
+
 export class BroadcastService {
   private readonly tableName: string;
   private readonly chunkSize: number = 50;
+  private readonly subscriptions?: SubscriptionStore;
 
-  constructor(tableName: string) {
+  constructor(tableName: string, subscriptionsTable?: string) {
     this.tableName = tableName;
+    if (subscriptionsTable) {
+      this.subscriptions = new SubscriptionStore(tableName, subscriptionsTable);
+    }
   }
 
   /**
@@ -65,16 +82,21 @@ export class BroadcastService {
   }
 
   /**
-   * Remove a stale connection from DynamoDB
+   * Remove a stale connection (and its note subscriptions) from DynamoDB
    */
   private async removeStaleConnection(connectionId: string): Promise<void> {
     try {
       const deleteCommand = new DeleteCommand({
         TableName: this.tableName,
         Key: { connectionId },
+        ReturnValues: 'ALL_OLD',
       });
 
-      await dynamoClient.send(deleteCommand);
+      const result = await dynamoClient.send(deleteCommand);
+      const noteIds = (result.Attributes as ConnectionItem | undefined)?.noteIds;
+      if (this.subscriptions && noteIds?.size) {
+        await this.subscriptions.removeSubscriptionItems(connectionId, noteIds);
+      }
       logger.info(`Removed stale connection: ${connectionId}`);
     } catch (error) {
       logger.error(`Failed to remove stale connection ${connectionId}:`, error);
@@ -84,19 +106,88 @@ export class BroadcastService {
   /**
    * Broadcast message to all connections with chunked processing
    */
-  async broadcastToAll(message: WebSocketMessage): Promise<{ sent: number; failed: number; stale: number }> {
-    const connections = await this.getAllConnections();
-    
+  async broadcastToAll(message: WebSocketMessage): Promise<BroadcastResults> {
+    return this.broadcastManyToAll([message]);
+  }
+
+  /**
+   * Broadcast several messages with a single connection scan.
+   * Messages are sent to each connection in order; a stale connection is
+   * skipped for the rest of the batch.
+   */
+  async broadcastManyToAll(messages: WebSocketMessage[]): Promise<BroadcastResults> {
+    return this.broadcastRouted(messages.map((message) => ({ message })));
+  }
+
+  /**
+   * Deliver each message only to the connections subscribed to its topic.
+   * Subscribers are looked up once per distinct topic; the connection table
+   * is scanned only if some message has no topic (or subscriptions are not
+   * configured). Each connection receives its messages in batch order.
+   */
+  async broadcastRouted(messages: RoutedMessage[]): Promise<BroadcastResults> {
+    const audiences = new Map<string, string[]>();
+    let everyone: string[] | undefined;
+
+    const audienceFor = async (topic?: string): Promise<string[]> => {
+      if (!topic || !this.subscriptions) {
+        everyone ??= (await this.getAllConnections()).map(({ connectionId }) => connectionId);
+        return everyone;
+      }
+      let subscribers = audiences.get(topic);
+      if (!subscribers) {
+        subscribers = await this.subscriptions.getSubscribers(topic);
+        audiences.set(topic, subscribers);
+        logger.debug(`Topic ${topic}: ${subscribers.length} subscriber(s)`);
+      }
+      return subscribers;
+    };
+
+    const plan = new Map<string, WebSocketMessage[]>();
+    for (const { message, topic } of messages) {
+      for (const connectionId of await audienceFor(topic)) {
+        const queued = plan.get(connectionId);
+        if (queued) {
+          queued.push(message);
+        } else {
+          plan.set(connectionId, [message]);
+        }
+      }
+    }
+
+    const results = await this.deliver(plan);
+    logger.info(
+      `Broadcast completed: ${messages.length} message(s), ${audiences.size} topic(s), ` +
+      `${results.sent} sent, ${results.failed} failed, ${results.stale} stale`
+    );
+    return results;
+  }
+
+  /**
+   * Send each connection its messages, in chunks of connections
+   */
+  private async deliver(plan: Map<string, WebSocketMessage[]>): Promise<BroadcastResults> {
+    const connections = [...plan.entries()];
+
     let sent = 0;
     let failed = 0;
     let stale = 0;
 
+    const sendAll = async (connectionId: string, messages: WebSocketMessage[]): Promise<boolean> => {
+      for (const message of messages) {
+        if (!(await this.sendToConnection(connectionId, message))) {
+          return false;
+        }
+      }
+      return true;
+    };
+
     // Process connections in chunks to avoid overwhelming the system
     for (let i = 0; i < connections.length; i += this.chunkSize) {
       const chunk = connections.slice(i, i + this.chunkSize);
       
       const results = await Promise.allSettled(
-        chunk.map(({ connectionId }) => this.sendToConnection(connectionId, message))
+        chunk.map(([connectionId, messages]) => sendAll(connectionId, messages))
       );
 
       // Count results
@@ -109,7 +200,7 @@ export class BroadcastService {
           }
         } else {
           failed++;
-          logger.error(`Failed to process connection ${chunk[index].connectionId}:`, result.reason);
+          logger.error(`Failed to process connection ${chunk[index][0]}:`, result.reason);
         }
       });
 
@@ -119,7 +210,6 @@ export class BroadcastService {
       }
     }
 
-    logger.info(`Broadcast completed: ${sent} sent, ${failed} failed, ${stale} stale`);
     return { sent, failed, stale };
   }
-}
\ No newline at end of file
+}
@@ -0,0 +1,131 @@
+// Note subscriptions for topic-routed broadcasts
+//
+// The subscriptions table is keyed by (noteId, connectionId), so the
+// broadcast handler finds a note's viewers with one Query instead of scanning
+// every connection. Each connection item keeps the set of its noteIds so that
+// disconnect and stale-connection cleanup can remove the subscription items
+// without a secondary index.
+
+import { DeleteCommand, PutCommand, QueryCommand, UpdateCommand } from '@aws-sdk/lib-dynamodb';
+import { dynamoClient } from './clients';
+import { SubscriptionItem } from './types';
+import { logger, createTtl } from './utils';
+
+// Upper bound on notes per subscribe request and per connection
+export const MAX_SUBSCRIPTIONS_PER_CONNECTION = 25;
+
+export class SubscriptionStore {
+  private readonly connectionsTable: string;
+  private readonly subscriptionsTable: string;
+
+  constructor(connectionsTable: string, subscriptionsTable: string) {
+    this.connectionsTable = connectionsTable;
+    this.subscriptionsTable = subscriptionsTable;
+  }
+
+  /**
+   * Subscribe a connection to notes; returns the noteIds actually added
+   */
+  async subscribe(connectionId: string, noteIds: string[]): Promise<string[]> {
+    const unique = [...new Set(noteIds.filter((id) => typeof id === 'string' && id))];
+    if (unique.length === 0) {
+      return [];
+    }
+
+    // Record the noteIds on the connection first; the condition keeps a
+    // connection from accumulating more than the allowed subscriptions
+    const accepted = unique.slice(0, MAX_SUBSCRIPTIONS_PER_CONNECTION);
+    const result = await dynamoClient.send(new UpdateCommand({
+      TableName: this.connectionsTable,
+      Key: { connectionId },
+      UpdateExpression: 'ADD noteIds :ids',
+      ConditionExpression: 'attribute_exists(connectionId)',
+      ExpressionAttributeValues: { ':ids': new Set(accepted) },
+      ReturnValues: 'ALL_NEW',
+    }));
+    const total = (result.Attributes?.noteIds as Set<string> | undefined)?.size ?? accepted.length;
+    if (total > MAX_SUBSCRIPTIONS_PER_CONNECTION) {
+      await this.forget(connectionId, accepted);
+      throw new Error(`Too many subscriptions (max ${MAX_SUBSCRIPTIONS_PER_CONNECTION})`);
+    }
+
+    const ttl = createTtl(24);
+    await Promise.all(accepted.map((noteId) => {
+      const item: SubscriptionItem = { noteId, connectionId, ttl };
+      return dynamoClient.send(new PutCommand({ TableName: this.subscriptionsTable, Item: item }));
+    }));
+    logger.debug(`Connection ${connectionId} subscribed to ${accepted.length} note(s)`);
+    return accepted;
+  }
+
+  /**
+   * Unsubscribe a connection from notes
+   */
+  async unsubscribe(connectionId: string, noteIds: string[]): Promise<void> {
+    const unique = [...new Set(noteIds.filter((id) => typeof id === 'string' && id))];
+    if (unique.length === 0) {
+      return;
+    }
+    await this.forget(connectionId, unique);
+    await this.removeSubscriptionItems(connectionId, unique);
+  }
+
+  /**
+   * Remove the subscription items of a connection that is gone
+   */
+  async removeSubscriptionItems(connectionId: string, noteIds: Iterable<string>): Promise<void> {
+    const results = await Promise.allSettled([...noteIds].map((noteId) =>
+      dynamoClient.send(new DeleteCommand({
+        TableName: this.subscriptionsTable,
+        Key: { noteId, connectionId },
+      }))
+    ));
+    results.forEach((result) => {
+      if (result.status === 'rejected') {
+        logger.error(`Failed to remove subscription of ${connectionId}:`, result.reason);
+      }
+    });
+  }
+
+  /**
+   * Connection IDs subscribed to a note
+   */
+  async getSubscribers(noteId: string): Promise<string[]> {
+    let lastEvaluatedKey: Record<string, any> | undefined = undefined;
+    const connectionIds: string[] = [];
+
+    do {
+      const queryCommand: QueryCommand = new QueryCommand({
+        TableName: this.subscriptionsTable,
+        KeyConditionExpression: 'noteId = :noteId',
+        ExpressionAttributeValues: { ':noteId': noteId },
+        ProjectionExpression: 'connectionId',
+        ExclusiveStartKey: lastEvaluatedKey,
+      });
+
+      const result = await dynamoClient.send(queryCommand);
+      for (const item of result.Items ?? []) {
+        connectionIds.push(item.connectionId as string);
+      }
+      lastEvaluatedKey = result.LastEvaluatedKey;
+    } while (lastEvaluatedKey);
+
+    return connectionIds;
+  }
+
+  private async forget(connectionId: string, noteIds: string[]): Promise<void> {
+    try {
+      await dynamoClient.send(new UpdateCommand({
+        TableName: this.connectionsTable,
+        Key: { connectionId },
+        UpdateExpression: 'DELETE noteIds :ids',
+        ConditionExpression: 'attribute_exists(connectionId)',
+        ExpressionAttributeValues: { ':ids': new Set(noteIds) },
+      }));
+    } catch (error: any) {
+      if (error?.name !== 'ConditionalCheckFailedException') {
+        throw error;
+      }
+    }
+  }
+}
@@ -2,6 +2,8 @@
 
 export interface WebSocketMessage {
   type: string;
+  // Dedupe id set by the backend outbox; repeats of an id are the same event
+  id?: string;
   data: any;
   timestamp: string;
 }
@@ -10,10 +12,29 @@ export interface ConnectionItem {
   connectionId: string;
   timestamp?: number;
   ttl?: number;
+  // Notes this connection is subscribed to (mirrors its subscription items)
+  noteIds?: Set<string>;
+}
+
+// One item per (note, connection) in the subscriptions table
+export interface SubscriptionItem {
+  noteId: string;
+  connectionId: string;
+  ttl?: number;
+}
+
+// Client -> server messages on the $default route
+export interface SubscriptionRequestBody {
+  action: 'subscribe' | 'unsubscribe';
+  noteIds: string[];
 }
 
 export interface BroadcastRequestBody {
   type: string;
+  id?: string;
+  // Routing key: only connections subscribed to this note receive the message.
+  // Messages without a topic go to every connection.
+  topic?: string;
   data: {
     post_id: string;
     comments: Array<{
@@ -27,6 +48,12 @@ export interface BroadcastRequestBody {
   };
 }
 
+// Several messages coalesced by the backend into one POST (one connection scan)
+export interface BatchBroadcastRequestBody {
+  type: 'batch';
+  messages: Array<{ type: string; data: any; topic?: string; id?: string }>;
+}
+
 export interface LambdaResponse {
   statusCode: number;
   headers?: Record<string, string>;
@@ -36,6 +63,7 @@ export interface LambdaResponse {
 export interface EnvironmentConfig {
   AWS_REGION: string;
   DYNAMODB_CONNECTIONS_TABLE: string;
+  DYNAMODB_SUBSCRIPTIONS_TABLE?: string;
   WEBSOCKET_API_ENDPOINT: string;
   DYNAMODB_ENDPOINT?: string;
   LOG_LEVEL?: string;
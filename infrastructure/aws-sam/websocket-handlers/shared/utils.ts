@@ -49,6 +49,7 @@ export const validateEnvironment = (): EnvironmentConfig => {
   const config: EnvironmentConfig = {
     AWS_REGION: process.env.AWS_REGION || 'ap-northeast-1',
     DYNAMODB_CONNECTIONS_TABLE: process.env.DYNAMODB_CONNECTIONS_TABLE || '',
+    DYNAMODB_SUBSCRIPTIONS_TABLE: process.env.DYNAMODB_SUBSCRIPTIONS_TABLE || undefined,
     WEBSOCKET_API_ENDPOINT: process.env.WEBSOCKET_API_ENDPOINT || '',
     DYNAMODB_ENDPOINT: process.env.DYNAMODB_ENDPOINT,
     LOG_LEVEL: process.env.LOG_LEVEL || 'INFO',
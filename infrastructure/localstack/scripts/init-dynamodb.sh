@@ -56,6 +56,54 @@ users_table='aws dynamodb create-table \
     --key-schema AttributeName=uid,KeyType=HASH \
     --billing-mode PAY_PER_REQUEST'
 
+# Comments Table
+comments_table='aws dynamodb create-table \
+    --endpoint-url "$LOCALSTACK_ENDPOINT" \
+    --region "$AWS_REGION" \
+    --table-name "comments" \
+    --attribute-definitions \
+        AttributeName=id,AttributeType=S \
+        AttributeName=note_id,AttributeType=S \
+        AttributeName=created_at,AttributeType=S \
+        AttributeName=author_uid,AttributeType=S \
+    --key-schema AttributeName=id,KeyType=HASH \
+    --global-secondary-indexes \
+        "IndexName=NoteIndex,KeySchema=[{AttributeName=note_id,KeyType=HASH},{AttributeName=created_at,KeyType=RANGE}],Projection={ProjectionType=ALL}" \
+        "IndexName=AuthorIndex,KeySchema=[{AttributeName=author_uid,KeyType=HASH}],Projection={ProjectionType=KEYS_ONLY}" \
+    --billing-mode PAY_PER_REQUEST'
+
+# Comment event outbox (written with each comment, drained in the background)
+comment_outbox_table='aws dynamodb create-table \
+    --endpoint-url "$LOCALSTACK_ENDPOINT" \
+    --region "$AWS_REGION" \
+    --table-name "comment-outbox" \
+    --attribute-definitions \
+        AttributeName=id,AttributeType=S \
+        AttributeName=pending,AttributeType=S \
+        AttributeName=visible_at,AttributeType=N \
+    --key-schema AttributeName=id,KeyType=HASH \
+    --global-secondary-indexes \
+        "IndexName=DeliverableIndex,KeySchema=[{AttributeName=pending,KeyType=HASH},{AttributeName=visible_at,KeyType=RANGE}],Projection={ProjectionType=KEYS_ONLY}" \
+    --billing-mode PAY_PER_REQUEST'
+
+# Comment page buckets: sealed pages of a note's comments plus its index item (bucket -1)
+comment_pages_table='aws dynamodb create-table \
+    --endpoint-url "$LOCALSTACK_ENDPOINT" \
+    --region "$AWS_REGION" \
+    --table-name "comment-pages" \
+    --attribute-definitions AttributeName=note_id,AttributeType=S AttributeName=bucket,AttributeType=N \
+    --key-schema AttributeName=note_id,KeyType=HASH AttributeName=bucket,KeyType=RANGE \
+    --billing-mode PAY_PER_REQUEST'
+
+# Ownership transfers (anonymous -> regular account), one per target uid
+ownership_transfers_table='aws dynamodb create-table \
+    --endpoint-url "$LOCALSTACK_ENDPOINT" \
+    --region "$AWS_REGION" \
+    --table-name "ownership-transfers" \
+    --attribute-definitions AttributeName=to_uid,AttributeType=S \
+    --key-schema AttributeName=to_uid,KeyType=HASH \
+    --billing-mode PAY_PER_REQUEST'
+
 # WebSocket Connections Table
 websocket_connections_table='aws dynamodb create-table \
     --endpoint-url "$LOCALSTACK_ENDPOINT" \
@@ -65,6 +113,15 @@ websocket_connections_table='aws dynamodb create-table \
     --key-schema AttributeName=connectionId,KeyType=HASH \
     --billing-mode PAY_PER_REQUEST'
 
+# WebSocket note subscriptions (topic-routed broadcasts)
+websocket_subscriptions_table='aws dynamodb create-table \
+    --endpoint-url "$LOCALSTACK_ENDPOINT" \
+    --region "$AWS_REGION" \
+    --table-name "noteapp-websocket-subscriptions-development" \
+    --attribute-definitions AttributeName=noteId,AttributeType=S AttributeName=connectionId,AttributeType=S \
+    --key-schema AttributeName=noteId,KeyType=HASH AttributeName=connectionId,KeyType=RANGE \
+    --billing-mode PAY_PER_REQUEST'
+
 
 # Function to create GSI if it doesn't exist
 create_gsi_if_not_exists() {
@@ -91,7 +148,12 @@ create_gsi_if_not_exists() {
 # Create all tables
 create_table_if_not_exists "notes" "$notes_table"
 create_table_if_not_exists "users" "$users_table"
+create_table_if_not_exists "comments" "$comments_table"
+create_table_if_not_exists "comment-outbox" "$comment_outbox_table"
+create_table_if_not_exists "comment-pages" "$comment_pages_table"
+create_table_if_not_exists "ownership-transfers" "$ownership_transfers_table"
 create_table_if_not_exists "noteapp-websocket-connections-development" "$websocket_connections_table"
+create_table_if_not_exists "noteapp-websocket-subscriptions-development" "$websocket_subscriptions_table"
 
 # Wait for notes table to be active before creating GSI
 echo "⏳ Waiting for notes table to be active..."
@@ -2,10 +2,14 @@ import { APIGatewayProxyHandler, APIGatewayProxyEvent, APIGatewayProxyResult } f
 import { randomUUID } from 'crypto';
 import { ScanCommand, DeleteCommand } from '@aws-sdk/lib-dynamodb'
 import { createApiGatewayManagementClient, createDynamoDbDocClient } from '../utils'
+import { getSubscribers, removeSubscriptionItems, subscribe, unsubscribe } from '../subscriptions'
 
 // Type definitions
 type BroadcastRequestBody = {
   type: string;
+  // Routing key (noteId): only subscribed connections receive the message.
+  // Messages without a topic go to every connection.
+  topic?: string;
   version?: string;
   id?: string;
   source?: string;
@@ -23,8 +27,15 @@ interface WebSocketMessage {
   meta?: Record<string, unknown>;
 }
 
+// Several messages coalesced by the backend into one POST (one connection scan)
+type BatchBroadcastRequestBody = {
+  type: 'batch';
+  messages: BroadcastRequestBody[];
+}
+
 interface ConnectionItem {
   connectionId: string;
+  noteIds?: Set<string>;
 }
 
 const dynamodb = createDynamoDbDocClient()
@@ -49,7 +60,7 @@ export const handler: APIGatewayProxyHandler = async (
     console.log(`Received message from ${connectionId}:`, message);
     
     // Echo back or handle specific message types
-    const response: WebSocketMessage = {
+    let response: WebSocketMessage = {
       type: 'echo',
       version: '1',
       id: randomUUID(),
@@ -58,6 +69,27 @@ export const handler: APIGatewayProxyHandler = async (
       data: { message: 'Message received' }
     };
 
+    // {"action": "subscribe" | "unsubscribe", "noteIds": [...]} registers interest in notes
+    const subscriptionsTable = process.env.DYNAMODB_SUBSCRIPTIONS_TABLE;
+    const connectionsTable = process.env.DYNAMODB_CONNECTIONS_TABLE;
+    if ((message.action === 'subscribe' || message.action === 'unsubscribe') && Array.isArray(message.noteIds)) {
+      if (!subscriptionsTable || !connectionsTable) {
+        return {
+          statusCode: 500,
+          body: JSON.stringify({ message: 'Server configuration error' })
+        };
+      }
+      const tables = { connections: connectionsTable, subscriptions: subscriptionsTable };
+      const noteIds = message.action === 'subscribe'
+        ? await subscribe(dynamodb, tables, connectionId, message.noteIds)
+        : await unsubscribe(dynamodb, tables, connectionId, message.noteIds);
+      response = {
+        ...response,
+        type: message.action === 'subscribe' ? 'subscribed' : 'unsubscribed',
+        data: { noteIds }
+      };
+    }
+
     await apiGatewayV3.send(new (await import('@aws-sdk/client-apigatewaymanagementapi')).PostToConnectionCommand({
       ConnectionId: connectionId,
       Data: Buffer.from(JSON.stringify(response))
@@ -84,6 +116,7 @@ export const broadcastToAll: APIGatewayProxyHandler = async (
   event: APIGatewayProxyEvent
 ): Promise<APIGatewayProxyResult> => {
   const tableName = process.env.DYNAMODB_CONNECTIONS_TABLE;
+  const subscriptionsTable = process.env.DYNAMODB_SUBSCRIPTIONS_TABLE;
   
   if (!tableName) {
     console.error('Missing DYNAMODB_CONNECTIONS_TABLE environment variable');
@@ -108,44 +141,84 @@ export const broadcastToAll: APIGatewayProxyHandler = async (
       };
     }
 
-    const requestBody: BroadcastRequestBody = JSON.parse(event.body);
-    const { type, data, version, id, source, meta } = requestBody;
+    const requestBody: BroadcastRequestBody | BatchBroadcastRequestBody = JSON.parse(event.body);
+    const items: BroadcastRequestBody[] = requestBody.type === 'batch' && Array.isArray((requestBody as BatchBroadcastRequestBody).messages)
+      ? (requestBody as BatchBroadcastRequestBody).messages
+      : [requestBody as BroadcastRequestBody];
     
-    // Get all active connections
-    const connections = await dynamodb.send(new ScanCommand({
-      TableName: tableName,
-      ProjectionExpression: 'connectionId'
-    }))
+    const timestamp = new Date().toISOString();
+    const routed = items.map(({ type, data, version, id, source, meta, topic }) => {
+      const message: WebSocketMessage = {
+        type,
+        version: version ?? '1',
+        id: id ?? randomUUID(),
+        timestamp,
+        source: source ?? 'backend',
+        data,
+        ...(meta ? { meta } : {})
+      };
+      return { topic: topic || undefined, data: JSON.stringify(message) };
+    });
 
-    const message: WebSocketMessage = {
-      type,
-      version: version ?? '1',
-      id: id ?? randomUUID(),
-      timestamp: new Date().toISOString(),
-      source: source ?? 'backend',
-      data,
-      ...(meta ? { meta } : {})
+    // Resolve each message's audience: a note's subscribers (one Query per
+    // distinct topic), or every connection (one Scan) for untopiced messages
+    const audiences = new Map<string, string[]>();
+    let everyone: string[] | undefined;
+    const audienceFor = async (topic?: string): Promise<string[]> => {
+      if (!topic || !subscriptionsTable) {
+        if (!everyone) {
+          const connections = await dynamodb.send(new ScanCommand({
+            TableName: tableName,
+            ProjectionExpression: 'connectionId'
+          }))
+          everyone = ((connections.Items as ConnectionItem[]) || []).map(({ connectionId }) => connectionId);
+        }
+        return everyone;
+      }
+      let subscribers = audiences.get(topic);
+      if (!subscribers) {
+        subscribers = await getSubscribers(dynamodb, subscriptionsTable, topic);
+        audiences.set(topic, subscribers);
+      }
+      return subscribers;
     };
 
-    const messageData = JSON.stringify(message);
+    const plan = new Map<string, string[]>();
+    for (const { topic, data } of routed) {
+      for (const connectionId of await audienceFor(topic)) {
+        const queued = plan.get(connectionId);
+        if (queued) {
+          queued.push(data);
+        } else {
+          plan.set(connectionId, [data]);
+        }
+      }
+    }
 
-    // Broadcast to all connections
-    const broadcastPromises = ((connections.Items as ConnectionItem[]) || []).map(async ({ connectionId }) => {
+    // Send each connection its messages in batch order
+    const broadcastPromises = [...plan.entries()].map(async ([connectionId, messagesData]) => {
       try {
-        await apiGatewayV3.send(new (await import('@aws-sdk/client-apigatewaymanagementapi')).PostToConnectionCommand({
-          ConnectionId: connectionId,
-          Data: Buffer.from(messageData)
-        }))
+        for (const messageData of messagesData) {
+          await apiGatewayV3.send(new (await import('@aws-sdk/client-apigatewaymanagementapi')).PostToConnectionCommand({
+            ConnectionId: connectionId,
+            Data: Buffer.from(messageData)
+          }))
+        }
         
         console.log(`Message sent to connection: ${connectionId}`);
       } catch (error: any) {
         const status = error?.$metadata?.httpStatusCode || error?.statusCode
         if (status === 410) {
-          // Connection is stale, remove it
-          await dynamodb.send(new DeleteCommand({
+          // Connection is stale, remove it along with its subscriptions
+          const removed = await dynamodb.send(new DeleteCommand({
             TableName: tableName,
-            Key: { connectionId }
+            Key: { connectionId },
+            ReturnValues: 'ALL_OLD'
           }))
+          const noteIds = (removed.Attributes as ConnectionItem | undefined)?.noteIds
+          if (subscriptionsTable && noteIds?.size) {
+            await removeSubscriptionItems(dynamodb, subscriptionsTable, connectionId, noteIds)
+          }
           
           console.log(`Removed stale connection: ${connectionId}`);
         } else {
@@ -165,7 +238,9 @@ export const broadcastToAll: APIGatewayProxyHandler = async (
       },
       body: JSON.stringify({
         message: 'Broadcast completed',
-        connectionCount: connections.Items?.length || 0
+        messageCount: routed.length,
+        topics: [...audiences.keys()],
+        connectionCount: plan.size
       })
     };
   } catch (error) {
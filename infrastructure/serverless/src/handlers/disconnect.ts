@@ -1,6 +1,7 @@
 import { APIGatewayProxyHandler, APIGatewayProxyEvent, APIGatewayProxyResult } from 'aws-lambda';
 import { DeleteCommand } from '@aws-sdk/lib-dynamodb'
 import { createDynamoDbDocClient } from '../utils'
+import { removeSubscriptionItems } from '../subscriptions'
 
 const dynamodb = createDynamoDbDocClient()
 
@@ -27,11 +28,19 @@ export const handler: APIGatewayProxyHandler = async (
   }
 
   try {
-    await dynamodb.send(new DeleteCommand({
+    const removed = await dynamodb.send(new DeleteCommand({
       TableName: tableName,
-      Key: { connectionId }
+      Key: { connectionId },
+      ReturnValues: 'ALL_OLD'
     }))
 
+    // Drop the connection's note subscriptions so broadcasts stop finding it
+    const subscriptionsTable = process.env.DYNAMODB_SUBSCRIPTIONS_TABLE
+    const noteIds = removed.Attributes?.noteIds as Set<string> | undefined
+    if (subscriptionsTable && noteIds?.size) {
+      await removeSubscriptionItems(dynamodb, subscriptionsTable, connectionId, noteIds)
+    }
+
     console.log(`Connection removed: ${connectionId}`);
     
     return {
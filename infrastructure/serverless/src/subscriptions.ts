@@ -0,0 +1,113 @@
+import { DeleteCommand, DynamoDBDocumentClient, PutCommand, QueryCommand, UpdateCommand } from '@aws-sdk/lib-dynamodb'
+
+// Note subscriptions for topic-routed broadcasts.
+// The subscriptions table is keyed by (noteId, connectionId); each connection
+// item keeps a `noteIds` set so cleanup does not need a secondary index.
+
+export const MAX_SUBSCRIPTIONS_PER_CONNECTION = 25
+
+const uniqueIds = (noteIds: unknown[]): string[] =>
+  [...new Set(noteIds.filter((id): id is string => typeof id === 'string' && id.length > 0))]
+
+export async function subscribe(
+  dynamodb: DynamoDBDocumentClient,
+  tables: { connections: string; subscriptions: string },
+  connectionId: string,
+  noteIds: unknown[]
+): Promise<string[]> {
+  const accepted = uniqueIds(noteIds).slice(0, MAX_SUBSCRIPTIONS_PER_CONNECTION)
+  if (accepted.length === 0) return []
+
+  const result = await dynamodb.send(new UpdateCommand({
+    TableName: tables.connections,
+    Key: { connectionId },
+    UpdateExpression: 'ADD noteIds :ids',
+    ConditionExpression: 'attribute_exists(connectionId)',
+    ExpressionAttributeValues: { ':ids': new Set(accepted) },
+    ReturnValues: 'ALL_NEW'
+  }))
+  const total = (result.Attributes?.noteIds as Set<string> | undefined)?.size ?? accepted.length
+  if (total > MAX_SUBSCRIPTIONS_PER_CONNECTION) {
+    await forget(dynamodb, tables.connections, connectionId, accepted)
+    throw new Error(`Too many subscriptions (max ${MAX_SUBSCRIPTIONS_PER_CONNECTION})`)
+  }
+
+  const ttl = Math.floor(Date.now() / 1000) + 86400 // 24 hours TTL, like the connection
+  await Promise.all(accepted.map((noteId) => dynamodb.send(new PutCommand({
+    TableName: tables.subscriptions,
+    Item: { noteId, connectionId, ttl }
+  }))))
+  return accepted
+}
+
+export async function unsubscribe(
+  dynamodb: DynamoDBDocumentClient,
+  tables: { connections: string; subscriptions: string },
+  connectionId: string,
+  noteIds: unknown[]
+): Promise<string[]> {
+  const ids = uniqueIds(noteIds)
+  if (ids.length === 0) return []
+  await forget(dynamodb, tables.connections, connectionId, ids)
+  await removeSubscriptionItems(dynamodb, tables.subscriptions, connectionId, ids)
+  return ids
+}
+
+export async function removeSubscriptionItems(
+  dynamodb: DynamoDBDocumentClient,
+  subscriptionsTable: string,
+  connectionId: string,
+  noteIds: Iterable<string>
+): Promise<void> {
+  const results = await Promise.allSettled([...noteIds].map((noteId) => dynamodb.send(new DeleteCommand({
+    TableName: subscriptionsTable,
+    Key: { noteId, connectionId }
+  }))))
+  results.forEach((result) => {
+    if (result.status === 'rejected') {
+      console.error(`Failed to remove subscription of ${connectionId}:`, result.reason)
+    }
+  })
+}
+
+export async function getSubscribers(
+  dynamodb: DynamoDBDocumentClient,
+  subscriptionsTable: string,
+  noteId: string
+): Promise<string[]> {
+  const connectionIds: string[] = []
+  let lastEvaluatedKey: Record<string, any> | undefined = undefined
+  do {
+    const result: any = await dynamodb.send(new QueryCommand({
+      TableName: subscriptionsTable,
+      KeyConditionExpression: 'noteId = :noteId',
+      ExpressionAttributeValues: { ':noteId': noteId },
+      ProjectionExpression: 'connectionId',
+      ExclusiveStartKey: lastEvaluatedKey
+    }))
+    for (const item of result.Items ?? []) {
+      connectionIds.push(item.connectionId as string)
+    }
+    lastEvaluatedKey = result.LastEvaluatedKey
+  } while (lastEvaluatedKey)
+  return connectionIds
+}
+
+async function forget(
+  dynamodb: DynamoDBDocumentClient,
+  connectionsTable: string,
+  connectionId: string,
+  noteIds: string[]
+): Promise<void> {
+  try {
+    await dynamodb.send(new UpdateCommand({
+      TableName: connectionsTable,
+      Key: { connectionId },
+      UpdateExpression: 'DELETE noteIds :ids',
+      ConditionExpression: 'attribute_exists(connectionId)',
+      ExpressionAttributeValues: { ':ids': new Set(noteIds) }
+    }))
+  } catch (error: any) {
+    if (error?.name !== 'ConditionalCheckFailedException') throw error
+  }
+}